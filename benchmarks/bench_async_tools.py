@@ -0,0 +1,156 @@
+"""
+Benchmark - run_pylint_async / run_pytest_async sur une boucle d'événements contre les appels bloquants
+
+Écrit --files couples module / fichier de test dans un dossier temporaire, puis
+mesure le temps total :
+  - séquentiel : run_pylint puis run_pytest, fichier par fichier
+  - async      : les mêmes appels en variantes async, tous lancés ensemble
+                 (asyncio.gather) sur une seule boucle
+Par défaut, pylint en mémoire (thread) et pytest préchauffé ; avec --cold, les
+deux outils passent par des sous-processus asyncio.
+Vérifie que les résultats sont les mêmes (score et messages pylint, verdict et
+tests pytest), qu'annuler une tâche pytest ou pylint tue ses processus (aucun
+processus lancé par un test ne survit), et qu'un délai dépassé est signalé.
+Caches désactivés : chaque appel lance vraiment l'outil.
+
+Usage:
+    python benchmarks/bench_async_tools.py --files 8
+    python benchmarks/bench_async_tools.py --files 8 --cold
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.tools import pylint_tool, pytest_tool
+from src.utils import config
+
+MARKER = "bench_async_marker"
+
+
+def _write_pair(work_dir: Path, index: int) -> tuple:
+    module = work_dir / f"module_{index}.py"
+    module.write_text(f'"""Module {index}."""\nimport os\n\n\ndef compute(value):\n    return value * {index}\n',
+                      encoding="utf-8")
+    expected = index + (1 if index % 3 == 0 else 0)  # un fichier sur trois a un test faux
+    test_path = work_dir / f"test_module_{index}.py"
+    test_path.write_text(f"import module_{index}\n\ndef test_compute():\n"
+                         f"    assert module_{index}.compute(1) == {expected}\n", encoding="utf-8")
+    return module, test_path
+
+
+def _normalized(lint: dict, test: dict) -> tuple:
+    tests = [(case.nodeid, case.outcome) for case in test["tests"]]
+    return lint["score"], pylint_tool.render_messages(lint["messages"]), test["passed"], tests
+
+
+def _survivors() -> int:
+    """Processus encore vivants lancés par les tests bloquants (repérés par MARKER dans leur commande)."""
+    count = 0
+    for pid in os.listdir("/proc"):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as cmdline:
+                count += MARKER.encode() in cmdline.read() and int(pid) != os.getpid()
+        except (OSError, ValueError):
+            pass
+    return count
+
+
+async def _cancelled(coroutine, delay: float) -> bool:
+    task = asyncio.ensure_future(coroutine)
+    await asyncio.sleep(delay)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        return True
+    return False
+
+
+async def _run_async(pairs: list) -> tuple:
+    t0 = time.perf_counter()
+    lints = asyncio.gather(*(pylint_tool.run_pylint_async(str(module)) for module, _ in pairs))
+    tests = asyncio.gather(*(pytest_tool.run_pytest_async(str(test)) for _, test in pairs))
+    lints, tests = await asyncio.gather(lints, tests)
+    return time.perf_counter() - t0, [_normalized(lint, test) for lint, test in zip(lints, tests)]
+
+
+async def _run_limits(work_dir: Path, timeout: float) -> tuple:
+    blocking = work_dir / "test_blocking.py"
+    blocking.write_text(f"import subprocess, time\n\ndef test_stuck():\n"
+                        f"    subprocess.Popen(['sh', '-c', 'sleep 1000 # {MARKER}'])\n"
+                        f"    time.sleep(1000)\n", encoding="utf-8")
+    cancelled = await _cancelled(pytest_tool.run_pytest_async(str(blocking), timeout=60), 1.5)
+    # Annulée bien avant sa fin (environ 0,3 s à chaud)
+    cancelled = cancelled and await _cancelled(pylint_tool.run_pylint_async(str(blocking)), 0.05)
+    await asyncio.sleep(0.2)
+    cancelled = cancelled and _survivors() == 0
+    t0 = time.perf_counter()
+    result = await pytest_tool.run_pytest_async(str(blocking), timeout=timeout)
+    duration = time.perf_counter() - t0
+    bounded = result["timed_out"] and result["timeout"]["run_killed"] and duration < timeout + 2
+    await asyncio.sleep(0.2)  # SIGKILL envoyé au groupe : le temps que les processus disparaissent
+    return cancelled, bounded and _survivors() == 0, duration
+
+
+def run(args) -> bool:
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_async_"))
+    config.PYLINT_CACHE = False
+    config.PYTEST_CACHE = False
+    config.PYTEST_WARM_POOL = not args.cold
+    config.PYLINT_IN_PROCESS = not args.cold
+    config.TEST_CASE_TIMEOUT = 1000  # seul le délai de l'exécution entière s'applique ici
+    try:
+        pairs = [_write_pair(work_dir, index) for index in range(args.files)]
+
+        print("=" * 60)
+        print(" BENCHMARK OUTILS ASYNC")
+        print("=" * 60)
+        print(f" {args.files} couples module / test, "
+              f"{'sous-processus asyncio' if args.cold else 'pylint en mémoire, pytest préchauffé'}")
+
+        # Premier appel de chaque outil hors mesure (processus modèles, import de pylint)
+        pytest_tool.run_pytest(str(pairs[0][1]))
+        pylint_tool.run_pylint(str(pairs[0][0]))
+        t0 = time.perf_counter()
+        expected = [_normalized(pylint_tool.run_pylint(str(module)), pytest_tool.run_pytest(str(test)))
+                    for module, test in pairs]
+        sequential = time.perf_counter() - t0
+
+        concurrent, results = asyncio.run(_run_async(pairs))
+        same = results == expected
+        cancelled, bounded, duration = asyncio.run(_run_limits(work_dir, args.timeout))
+
+        print(f" séquentiel: {sequential * 1000:8.1f} ms (run_pylint + run_pytest)")
+        print(f" async     : {concurrent * 1000:8.1f} ms (asyncio.gather, {os.cpu_count()} cœur(s))")
+        print(f" délai     : exécution bloquante arrêtée après {duration:5.2f} s (délai {args.timeout} s)")
+        print(f" résultats identiques: {'oui' if same else 'NON'}, annulation tue les processus: "
+              f"{'oui' if cancelled else 'NON'}, délai respecté: {'oui' if bounded else 'NON'}")
+        ok = same and cancelled and bounded
+        print(" RÉSULTAT: " + ("OK" if ok else "ÉCHEC"))
+        return ok
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des variantes async de run_pylint / run_pytest")
+    parser.add_argument("--files", type=int, default=8, help="nombre de couples module / test")
+    parser.add_argument("--timeout", type=float, default=3, help="délai du test bloquant (secondes)")
+    parser.add_argument("--cold", action="store_true",
+                        help="pylint et pytest en sous-processus (ni pylint en mémoire, ni processus modèles)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
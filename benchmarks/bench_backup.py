@@ -0,0 +1,129 @@
+"""
+Benchmark - sauvegardes incrémentales dédupliquées (backup_logs)
+
+Génère un journal JSON Lines synthétique, puis mesure :
+  - copie complète : l'ancienne sauvegarde (shutil.copy2 du fichier actif)
+  - 1re sauvegarde : découpage et compression de tout le journal
+  - sauvegardes suivantes après l'ajout de --delta-mb de nouvelles entrées
+    (et une rotation en cours de route) : durée et place ajoutée
+Vérifie enfin que chaque sauvegarde se restaure à l'identique.
+
+Usage:
+    python benchmarks/bench_backup.py --size-mb 512 --delta-mb 4
+    python benchmarks/bench_backup.py --size-mb 128 --steps 5 --rotate-at 2
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bench_log_streaming import _entry, generate_log
+from src.utils import backup_logs, config, log_store
+
+
+def _journal_digest() -> dict:
+    return {path.relative_to(log_store.LOGS_DIR).as_posix(): hashlib.sha256(path.read_bytes()).hexdigest()
+            for path in backup_logs._journal_files()}
+
+
+def _stored_bytes() -> int:
+    return sum(path.stat().st_size for path in (backup_logs.get_backup_dir() / "chunks").rglob("*.zz"))
+
+
+def _append(size_bytes: int, first_seq: int, prompt_size: int) -> int:
+    """Ajoute des entrées par lots via log_store (comme le logger). Retourne le nombre d'entrées."""
+    started = datetime(2025, 1, 1)
+    batch, written, seq = [], 0, first_seq
+    while written < size_bytes:
+        entry = _entry(seq, prompt_size, started)
+        batch.append(entry)
+        written += prompt_size
+        seq += 1
+        if len(batch) == 1000:
+            log_store.append_entries(batch)
+            batch = []
+    if batch:
+        log_store.append_entries(batch)
+    return seq - first_seq
+
+
+def _backup():
+    t0 = time.perf_counter()
+    before = _stored_bytes()
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = backup_logs.backup_experiment_data()
+    return path, time.perf_counter() - t0, _stored_bytes() - before
+
+
+def run(args) -> bool:
+    logs_dir = Path(tempfile.mkdtemp(prefix="bench_backup_"))
+    try:
+        log_store.set_logs_dir(logs_dir)
+        config.LOG_FORMAT = "jsonl"
+        config.LOG_INDEX = False
+        entries = generate_log(log_store.JSONL_LOG_FILE, int(args.size_mb * 1024 * 1024), "jsonl",
+                               args.prompt_size)
+        size_mb = log_store.log_size() / (1024 * 1024)
+
+        print("=" * 60)
+        print(" BENCHMARK SAUVEGARDES INCRÉMENTALES")
+        print("=" * 60)
+        print(f" Journal: {size_mb:.0f} Mo, {entries} entrées")
+
+        t0 = time.perf_counter()
+        shutil.copy2(log_store.JSONL_LOG_FILE, logs_dir / "full_copy.jsonl")
+        print(f" copie complète     : {time.perf_counter() - t0:6.2f} s, +{size_mb:8.2f} Mo")
+        (logs_dir / "full_copy.jsonl").unlink()
+
+        snapshots = []
+        path, duration, stored = _backup()
+        snapshots.append((path, _journal_digest()))
+        print(f" 1re sauvegarde     : {duration:6.2f} s, +{stored / 1024 / 1024:8.2f} Mo")
+
+        for step in range(1, args.steps + 1):
+            entries += _append(int(args.delta_mb * 1024 * 1024), entries, args.prompt_size)
+            if step == args.rotate_at:
+                log_store.rotate_log()
+            path, duration, stored = _backup()
+            snapshots.append((path, _journal_digest()))
+            rotated = " (après rotation)" if step == args.rotate_at else ""
+            print(f" incrémentale {step:2}   : {duration:6.2f} s, +{stored / 1024 / 1024:8.2f} Mo "
+                  f"pour +{args.delta_mb} Mo d'entrées{rotated}")
+
+        ok = True
+        for path, expected in snapshots:
+            with contextlib.redirect_stdout(io.StringIO()):
+                number = [backup.name for backup in backup_logs.list_backups()].index(path.name) + 1
+                restored = backup_logs.restore_backup(number)
+            ok = ok and restored and _journal_digest() == expected
+        print(f" restaurations identiques: {'oui' if ok else 'NON'} ({len(snapshots)} sauvegardes)")
+        print(" RÉSULTAT: " + ("OK" if ok else "ÉCHEC"))
+        return ok
+    finally:
+        shutil.rmtree(logs_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des sauvegardes incrémentales")
+    parser.add_argument("--size-mb", type=float, default=512, help="taille du journal synthétique")
+    parser.add_argument("--delta-mb", type=float, default=4, help="entrées ajoutées entre deux sauvegardes")
+    parser.add_argument("--steps", type=int, default=3, help="nombre de sauvegardes incrémentales")
+    parser.add_argument("--rotate-at", type=int, default=0, help="rotation du journal avant cette sauvegarde")
+    parser.add_argument("--prompt-size", type=int, default=4000, help="taille du prompt (caractères)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark - gouverneur des exécutions pylint / pytest contre des outils lancés sans limite
+
+1) Gouverneur seul (budget "test" de --slots places, tâches asyncio) :
+   vérifie qu'il n'y a jamais plus de --slots exécutions simultanées, que les
+   places sont accordées dans l'ordre des demandes (FIFO), et qu'avec peu de
+   mémoire disponible une seule exécution tourne à la fois.
+2) Outils réels : --files couples module / test lancés tous ensemble par des
+   threads (run_pylint + run_pytest en sous-processus, comme des fichiers
+   traités en parallèle), sans puis avec le gouverneur. Compare le temps
+   total, le pic d'exécutions pytest simultanées et les résultats ; affiche la
+   file et les temps d'attente du gouverneur (governor_stats).
+
+Usage:
+    python benchmarks/bench_governor.py --files 12
+    python benchmarks/bench_governor.py --files 24 --slots 4
+"""
+
+import argparse
+import asyncio
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.tools import governor, pylint_tool, pytest_tool
+from src.utils import config
+
+
+async def _fifo_run(gov: governor.Governor, jobs: int) -> tuple:
+    order, running, peak = [], 0, 0
+
+    async def job(index):
+        nonlocal running, peak
+        async with gov.slot_async("test"):
+            order.append(index)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(job(index) for index in range(jobs)))
+    return order, peak
+
+
+def _check_governor(slots: int) -> bool:
+    gov = governor.Governor({"test": slots}, {"test": 100})
+    order, peak = asyncio.run(_fifo_run(gov, 10 * slots))
+    stats = gov.stats()["test"]
+    fifo = order == sorted(order) and peak == slots and stats["max_queued"] == 10 * slots - slots
+    # 50 Mo libres pour des exécutions de 100 Mo : une seule à la fois
+    low_memory = governor.Governor({"test": slots}, {"test": 100}, memory=lambda: 50)
+    _, memory_peak = asyncio.run(_fifo_run(low_memory, 3 * slots))
+    print(f" gouverneur: {10 * slots} demandes, pic {peak}/{slots}, ordre FIFO: {'oui' if order == sorted(order) else 'NON'}, "
+          f"file max {stats['max_queued']}, attente moyenne {stats['mean_wait'] * 1000:.1f} ms ; "
+          f"mémoire basse: pic {memory_peak}")
+    return fifo and memory_peak == 1
+
+
+def _write_pair(work_dir: Path, index: int) -> tuple:
+    module = work_dir / f"module_{index}.py"
+    module.write_text(f'"""Module {index}."""\n\n\ndef compute(value):\n    return value * {index}\n', encoding="utf-8")
+    test_path = work_dir / f"test_module_{index}.py"
+    # Chaque test signale sa présence (fichier running_*) pendant un peu de calcul
+    test_path.write_text(
+        f"import os, time\nfrom pathlib import Path\nimport module_{index}\n\n"
+        f"def test_compute():\n"
+        f"    marker = Path({str(work_dir)!r}) / f'running_{{os.getpid()}}'\n"
+        f"    marker.touch()\n"
+        f"    try:\n"
+        f"        end = time.perf_counter() + 0.2\n"
+        f"        while time.perf_counter() < end:\n"
+        f"            pass\n"
+        f"        assert module_{index}.compute(1) == {index}\n"
+        f"    finally:\n"
+        f"        marker.unlink()\n",
+        encoding="utf-8")
+    return module, test_path
+
+
+def _process_all(pairs: list, work_dir: Path) -> tuple:
+    """Tous les couples en même temps (un thread par fichier) ; (durée, pic de tests simultanés, résultats)."""
+    peak, done = 0, threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, len(list(work_dir.glob("running_*"))))
+            time.sleep(0.005)
+
+    def process(pair):
+        module, test = pair
+        lint, result = pylint_tool.run_pylint(str(module)), pytest_tool.run_pytest(str(test))
+        return lint["score"], result["passed"]
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(pairs)) as pool:
+        results = list(pool.map(process, pairs))
+    duration = time.perf_counter() - t0
+    done.set()
+    sampler.join()
+    return duration, peak, results
+
+
+def run(args) -> bool:
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_governor_"))
+    # Outils en sous-processus, sans cache : un processus par exécution, comme sur une machine de production
+    config.PYLINT_IN_PROCESS = False
+    config.PYTEST_WARM_POOL = False
+    config.PYLINT_CACHE = False
+    config.PYTEST_CACHE = False
+    if args.slots:
+        config.GOVERNOR_LINT_SLOTS = config.GOVERNOR_TEST_SLOTS = args.slots
+    try:
+        print("=" * 60)
+        print(" BENCHMARK GOUVERNEUR")
+        print("=" * 60)
+        governed = _check_governor(args.slots or 3)
+
+        pairs = [_write_pair(work_dir, index) for index in range(args.files)]
+        config.GOVERNOR_ENABLED = False
+        free_time, free_peak, expected = _process_all(pairs, work_dir)
+        config.GOVERNOR_ENABLED = True
+        limits = {kind: stats["limit"] for kind, stats in governor.governor_stats().items()}
+        time_on, peak_on, results = _process_all(pairs, work_dir)
+        stats = governor.governor_stats()
+
+        print(f" {args.files} fichiers, {governor.available_cores()} cœur(s), "
+              f"{governor.available_memory_mb() or 0:.0f} Mo libres, limites {limits}")
+        print(f" sans gouverneur : {free_time * 1000:8.1f} ms, pic {free_peak} tests simultanés")
+        print(f" avec gouverneur : {time_on * 1000:8.1f} ms, pic {peak_on} tests simultanés "
+              f"(x{free_time / time_on:.2f} sur le temps total)")
+        for kind, values in stats.items():
+            print(f"   {kind:4s}: {values['acquired']} exécutions, file max {values['max_queued']}, "
+                  f"{values['waited']} attentes, moyenne {values['mean_wait'] * 1000:.0f} ms, "
+                  f"max {values['max_wait'] * 1000:.0f} ms")
+        same = results == expected
+        bounded = peak_on <= limits["test"]
+        # Débit proche de l'optimum : pas plus lent qu'en lançant tout d'un coup (marge de mesure)
+        throughput = time_on <= free_time * 1.25
+        print(f" gouverneur correct: {'oui' if governed else 'NON'}, résultats identiques: {'oui' if same else 'NON'}, "
+              f"pic dans la limite: {'oui' if bounded else 'NON'}, débit conservé: {'oui' if throughput else 'NON'}")
+        ok = governed and same and bounded and throughput
+        print(" RÉSULTAT: " + ("OK" if ok else "ÉCHEC"))
+        return ok
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du gouverneur des outils")
+    parser.add_argument("--files", type=int, default=12, help="nombre de couples module / test traités ensemble")
+    parser.add_argument("--slots", type=int, default=None, help="places par type (défaut: selon les cœurs)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
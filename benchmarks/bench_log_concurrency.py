@@ -0,0 +1,148 @@
+"""
+Benchmark - écritures concurrentes dans le journal d'expériences
+
+Lance N processus qui appellent log_experiment() en parallèle sur le même
+journal (dossier temporaire), puis vérifie qu'aucune entrée n'est perdue,
+dupliquée ou coupée.
+
+Usage:
+    python benchmarks/bench_log_concurrency.py --writers 8 --entries 500
+    python benchmarks/bench_log_concurrency.py --writers 4 --rate 200 --format json
+    python benchmarks/bench_log_concurrency.py --max-size-mb 1 --prompt-store
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import config, log_store
+
+
+def _configure(logs_dir, args):
+    log_store.set_logs_dir(logs_dir)
+    config.LOG_FORMAT = args.format
+    config.LOG_ASYNC = args.use_async
+    config.LOG_PROMPT_STORE = args.prompt_store
+    config.MAX_LOG_SIZE_MB = args.max_size_mb
+
+
+def _writer(worker_id, logs_dir, args, start_event, results):
+    _configure(logs_dir, args)
+    from src.utils.log_writer import flush_logs
+    from src.utils.logger import ActionType, log_experiment
+
+    prompt = "ROLE: Benchmark\nTASK: concurrence\n\n" + ("x" * 80 + "\n\n") * (args.prompt_size // 82)
+    interval = 1.0 / args.rate if args.rate else 0.0
+    latencies = []
+
+    start_event.wait()
+    started = time.perf_counter()
+    for seq in range(args.entries):
+        if interval:
+            # Débit cible par writer : on attend le créneau de l'entrée suivante
+            delay = started + seq * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        t0 = time.perf_counter()
+        log_experiment(
+            agent_name=f"BenchWriter{worker_id}",
+            model_used="bench",
+            action=ActionType.ANALYSIS,
+            details={
+                "input_prompt": prompt,
+                "output_response": f"worker={worker_id} seq={seq}",
+                "worker": worker_id,
+                "seq": seq,
+            },
+            status="SUCCESS",
+        )
+        latencies.append(time.perf_counter() - t0)
+    flush_logs()
+    results.put((worker_id, latencies, time.perf_counter() - started))
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(args) -> bool:
+    logs_dir = Path(tempfile.mkdtemp(prefix="bench_logs_"))
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        start_event = ctx.Event()
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(target=_writer, args=(i, str(logs_dir), args, start_event, results))
+            for i in range(args.writers)
+        ]
+        for worker in workers:
+            worker.start()
+        time.sleep(0.5)  # laisse les imports se terminer avant le départ
+
+        t0 = time.perf_counter()
+        start_event.set()
+        collected = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        wall = time.perf_counter() - t0
+
+        # Vérification : chaque (worker, seq) exactement une fois, toutes les lignes lisibles
+        _configure(logs_dir, args)
+        seen = {}
+        for entry in log_store.iter_log_entries():
+            key = (entry["details"]["worker"], entry["details"]["seq"])
+            seen[key] = seen.get(key, 0) + 1
+        expected = args.writers * args.entries
+        missing = expected - sum(1 for count in seen.values() if count >= 1)
+        duplicates = sum(count - 1 for count in seen.values() if count > 1)
+
+        latencies = [lat for _, worker_lat, _ in collected for lat in worker_lat]
+        print("=" * 60)
+        print(" BENCHMARK ÉCRITURES CONCURRENTES")
+        print("=" * 60)
+        print(f" Writers: {args.writers} x {args.entries} entrées (format={args.format}, "
+              f"async={args.use_async}, prompt_store={args.prompt_store})")
+        print(f" Débit cible par writer: {args.rate or 'max'} entrées/s")
+        print(f" Durée totale: {wall:.2f} s")
+        print(f" Débit global: {expected / wall:.0f} entrées/s")
+        print(f" Latence log_experiment: p50={_percentile(latencies, 50) * 1000:.2f} ms "
+              f"p99={_percentile(latencies, 99) * 1000:.2f} ms")
+        print(f" Segments scellés: {len(log_store.read_manifest()['segments'])}")
+        print(f" Entrées retrouvées: {sum(seen.values())}/{expected} "
+              f"(manquantes={missing}, doublons={duplicates})")
+        ok = missing == 0 and duplicates == 0
+        print(" RÉSULTAT: " + ("OK - aucune entrée perdue ni dupliquée" if ok else "ÉCHEC"))
+        return ok
+    finally:
+        if not args.keep:
+            shutil.rmtree(logs_dir, ignore_errors=True)
+        else:
+            print(f" Logs conservés dans {logs_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des écritures concurrentes du logger")
+    parser.add_argument("--writers", type=int, default=4, help="nombre de processus écrivains")
+    parser.add_argument("--entries", type=int, default=250, help="entrées par écrivain")
+    parser.add_argument("--rate", type=float, default=0, help="entrées/s par écrivain (0 = max)")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="jsonl")
+    parser.add_argument("--prompt-size", type=int, default=2000, help="taille du prompt (caractères)")
+    parser.add_argument("--max-size-mb", type=float, default=config.MAX_LOG_SIZE_MB)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="écriture asynchrone par lots")
+    parser.add_argument("--prompt-store", action="store_true", help="active LOG_PROMPT_STORE")
+    parser.add_argument("--keep", action="store_true", help="conserve le dossier de logs temporaire")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
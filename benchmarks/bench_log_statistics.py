@@ -0,0 +1,182 @@
+"""
+Benchmark - statistiques vectorisées (log_statistics) contre boucle Python
+
+Génère un journal JSON Lines synthétique (1M entrées par défaut) dans un
+dossier temporaire, l'exporte en Parquet (export_analytics), puis mesure :
+  - boucle     : les mêmes statistiques calculées entrée par entrée en Python
+                 (dict, listes triées pour les percentiles) sur la table chargée
+  - vectorisé  : compute_log_statistics() sur la même table
+  - parcours   : pour référence, le parcours du journal par les checkers
+                 actuels (ValidateLogChecker + AllAgentsLogChecker, JSON inclus)
+Les résultats de la boucle et de la version vectorisée doivent être identiques.
+
+Usage:
+    python benchmarks/bench_log_statistics.py --entries 1000000
+    python benchmarks/bench_log_statistics.py --entries 200000 --skip-scan
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np
+
+from src.utils import config, log_store
+from src.data_quality.export_analytics import export_analytics, load_analytics
+from src.data_quality.log_statistics import (COLUMNS, FAILURE_STATUSES, PERCENTILES, SHORT_TEXT,
+                                             compute_log_statistics)
+
+AGENTS = [("Auditor_Agent", "CODE_ANALYSIS", "file_analyzed"), ("Fixer_Agent", "FIX", "file_fixed"),
+          ("JudgeAgent", "DEBUG", "file_evaluated")]
+
+
+def generate_log(path: Path, entries: int, seed: int) -> None:
+    rng = random.Random(seed)
+    started = datetime(2025, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        for seq in range(entries):
+            agent, action, file_field = rng.choice(AGENTS)
+            details = {file_field: f"sandbox/module_{rng.randrange(2000)}.py"}
+            if rng.random() > 0.01:
+                details["input_prompt"] = "p" * rng.randint(5, 400)
+            if rng.random() > 0.01:
+                details["output_response"] = "r" * rng.randint(5, 200)
+            entry = {
+                "id": f"bench-{seq:012d}",
+                "timestamp": (started + timedelta(seconds=seq)).isoformat(),
+                "agent": agent,
+                "model": "bench",
+                "action": action,
+                "details": details,
+                "status": "FAILURE" if rng.random() < 0.1 else "SUCCESS",
+            }
+            f.write(json.dumps(entry) + "\n")
+
+
+def loop_statistics(rows: list) -> dict:
+    """Référence en boucle Python : une itération par entrée, comme les checkers."""
+    agents, actions, statuses = {}, {}, {}
+    prompt_lengths, response_lengths = [], []
+    failures, files = {}, {}
+    for agent, action, status, file_path, prompt_length, response_length in rows:
+        agent = agent or "UNKNOWN"
+        action = action or "UNKNOWN"
+        agents[agent] = agents.get(agent, 0) + 1
+        actions[action] = actions.get(action, 0) + 1
+        statuses[status or "UNKNOWN"] = statuses.get(status or "UNKNOWN", 0) + 1
+        if prompt_length is not None:
+            prompt_lengths.append(prompt_length)
+        if response_length is not None:
+            response_lengths.append(response_length)
+        failed = status in FAILURE_STATUSES
+        counts = failures.setdefault(agent, [0, 0])
+        counts[0] += 1
+        counts[1] += failed
+        if file_path is not None:
+            file_path = file_path.replace("\\", "/").removeprefix("./")
+            item = files.setdefault(file_path, [0, 0, 0, None])
+            item[0] += 1
+            item[1] += action == "FIX"
+            item[2] += failed
+            item[3] = status or "UNKNOWN"
+    return {
+        "agents": agents,
+        "actions": actions,
+        "statuses": statuses,
+        "missing_prompts": len(rows) - len(prompt_lengths),
+        "short_prompts": sum(1 for length in prompt_lengths if length < SHORT_TEXT),
+        "prompt_percentiles": np.percentile(prompt_lengths, PERCENTILES).tolist() if prompt_lengths else None,
+        "response_percentiles": np.percentile(response_lengths, PERCENTILES).tolist() if response_lengths else None,
+        "failures_by_agent": {agent: tuple(counts) for agent, counts in failures.items()},
+        "iterations_by_file": {path: tuple(item) for path, item in files.items()},
+    }
+
+
+def _comparable(stats: dict) -> dict:
+    return {
+        "agents": stats["agents"].to_dict(),
+        "actions": stats["actions"].to_dict(),
+        "statuses": stats["statuses"].to_dict(),
+        "missing_prompts": stats["missing_prompts"],
+        "short_prompts": stats["short_prompts"],
+        "prompt_percentiles": stats["prompt_percentiles"].tolist(),
+        "response_percentiles": stats["response_percentiles"].tolist(),
+        "failures_by_agent": {agent: (int(entries), int(failures)) for agent, entries, failures, _
+                              in stats["failures_by_agent"].itertuples()},
+        "iterations_by_file": {path: (int(entries), int(fixes), int(failed), status) for path, entries, fixes, failed, status
+                               in stats["iterations_by_file"].itertuples()},
+    }
+
+
+def _scan_checkers():
+    from src.data_quality.check_all_agents import AllAgentsLogChecker
+    from src.utils.log_scan import scan_log
+    from src.utils.validate_log import ValidateLogChecker
+
+    scan_log([ValidateLogChecker(), AllAgentsLogChecker()], resume=False)
+
+
+def run(args) -> bool:
+    logs_dir = Path(tempfile.mkdtemp(prefix="bench_stats_"))
+    try:
+        log_store.set_logs_dir(logs_dir)
+        config.LOG_FORMAT = "jsonl"
+        t0 = time.perf_counter()
+        generate_log(log_store.JSONL_LOG_FILE, args.entries, args.seed)
+        export_analytics()
+        print("=" * 60)
+        print(" BENCHMARK STATISTIQUES VECTORISÉES")
+        print("=" * 60)
+        print(f" Journal: {args.entries} entrées, généré et exporté en {time.perf_counter() - t0:.1f} s")
+
+        t0 = time.perf_counter()
+        frame = load_analytics("entries", columns=COLUMNS, dtype_backend="pyarrow")
+        load_time = time.perf_counter() - t0
+
+        # Lignes Python (None pour les valeurs manquantes), hors mesure
+        rows = list(frame[COLUMNS].astype(object).where(frame[COLUMNS].notna(), None).itertuples(index=False))
+
+        t0 = time.perf_counter()
+        expected = loop_statistics(rows)
+        loop_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        stats = compute_log_statistics(frame)
+        vector_time = time.perf_counter() - t0
+
+        same = _comparable(stats) == expected
+        print(f" chargement Parquet : {load_time:7.2f} s")
+        print(f" boucle Python      : {loop_time:7.2f} s")
+        print(f" vectorisé          : {vector_time:7.2f} s  (x{loop_time / vector_time:.1f})")
+        if not args.skip_scan:
+            t0 = time.perf_counter()
+            _scan_checkers()
+            print(f" parcours checkers  : {time.perf_counter() - t0:7.2f} s  (journal JSON, statistiques actuelles)")
+        print(f" résultats identiques: {'oui' if same else 'NON'}")
+        print(" RÉSULTAT: " + ("OK" if same else "ÉCHEC"))
+        return same
+    finally:
+        shutil.rmtree(logs_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des statistiques vectorisées")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-scan", action="store_true", help="ne mesure pas le parcours des checkers")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Benchmark - validation en flux d'un très gros journal
+
+Génère un journal synthétique de plusieurs Go (tableau JSON ou JSON Lines) dans
+un dossier temporaire, puis lance dans un processus séparé la validation
+complète (tous les checkers de run_all_checks, un seul parcours) et mesure la
+durée et le pic de mémoire (RSS). Avec --legacy, mesure aussi l'ancien
+chargement json.load() du fichier complet pour comparaison.
+
+Avec --workload realistic, le journal vient de generate_test_logs (mélange des
+agents réels ou appris d'un journal avec --learn, tailles variables, --seed).
+
+Usage:
+    python benchmarks/bench_log_streaming.py --size-mb 2048
+    python benchmarks/bench_log_streaming.py --size-mb 4096 --format jsonl
+    python benchmarks/bench_log_streaming.py --size-mb 512 --legacy
+    python benchmarks/bench_log_streaming.py --size-mb 1024 --workload realistic --seed 1
+"""
+
+import argparse
+import json
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import config, log_store
+from src.utils.generate_test_logs import EntryGenerator, learn_profile, write_log
+
+AGENTS = [("Auditor_Agent", "ANALYSIS"), ("Fixer_Agent", "FIX"), ("JudgeAgent", "DEBUG")]
+
+
+def _entry(seq: int, prompt_size: int, started: datetime) -> dict:
+    agent, action = AGENTS[seq % len(AGENTS)]
+    body = f"def function_{seq}(x):\n    return x * {seq}\n\n"
+    return {
+        "id": f"bench-{seq:012d}",
+        "timestamp": (started + timedelta(seconds=seq)).isoformat(),
+        "agent": agent,
+        "model": "bench",
+        "action": action,
+        "details": {
+            "file_analyzed": f"sandbox/module_{seq % 500}.py",
+            "input_prompt": "ROLE: Benchmark\nTASK: validation — données très volumineuses\n\n"
+                            + body * max(1, prompt_size // len(body)),
+            "output_response": f"Réponse {seq} : aucune erreur détectée.",
+        },
+        "status": "SUCCESS",
+    }
+
+
+def generate_log(path: Path, size_bytes: int, fmt: str, prompt_size: int, first_seq: int = 0) -> int:
+    """Écrit le journal entrée par entrée (jamais entièrement en mémoire). Retourne le nombre d'entrées."""
+    started = datetime(2025, 1, 1)
+    written = 0
+    seq = first_seq
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "json":
+            f.write("[")
+        while written < size_bytes:
+            entry = _entry(seq, prompt_size, started)
+            if fmt == "json":
+                text = ("," if seq > first_seq else "") + "\n" + "\n".join(
+                    "    " + line for line in json.dumps(entry, indent=4, ensure_ascii=False).split("\n"))
+            else:
+                text = json.dumps(entry, ensure_ascii=False) + "\n"
+            f.write(text)
+            written += len(text.encode("utf-8"))
+            seq += 1
+        if fmt == "json":
+            f.write("\n]")
+    return seq - first_seq
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ko sous Linux, octets sous macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_checks(logs_dir: str, fmt: str, results):
+    import contextlib
+    import io
+
+    log_store.set_logs_dir(logs_dir)
+    config.LOG_FORMAT = fmt
+    from src.data_quality.run_all_checks import _load_checkers
+    from src.utils.log_scan import scan_log
+
+    loaded = _load_checkers(PROJECT_ROOT)
+    checkers = [item[1] for item in loaded.values() if not isinstance(item, Exception)]
+    t0 = time.perf_counter()
+    scan = scan_log(checkers)
+    with contextlib.redirect_stdout(io.StringIO()):
+        passed = [checker.report(scan) for checker in checkers]
+    results.put(("streaming", time.perf_counter() - t0, _peak_rss_mb(), scan.entries,
+                 str(scan.error) if scan.error else None, sum(passed)))
+
+
+def _run_legacy(log_file: str, fmt: str, results):
+    t0 = time.perf_counter()
+    with open(log_file, "r", encoding="utf-8") as f:
+        if fmt == "json":
+            entries = json.load(f)
+        else:
+            entries = [json.loads(line) for line in f if line.strip()]
+    results.put(("json.load", time.perf_counter() - t0, _peak_rss_mb(), len(entries), None, None))
+
+
+def _measure(target, args):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=target, args=(*args, results))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        return None, process.exitcode
+    return results.get(), 0
+
+
+def run(args) -> bool:
+    logs_dir = Path(tempfile.mkdtemp(prefix="bench_stream_"))
+    try:
+        log_store.set_logs_dir(logs_dir)
+        log_file = log_store.JSON_LOG_FILE if args.format == "json" else log_store.JSONL_LOG_FILE
+
+        t0 = time.perf_counter()
+        if args.workload == "realistic":
+            profile = learn_profile(args.learn) if args.learn else None
+            entries = write_log(log_file, EntryGenerator(profile, args.seed), args.format,
+                                int(args.size_mb * 1024 * 1024))
+        else:
+            entries = generate_log(log_file, int(args.size_mb * 1024 * 1024), args.format, args.prompt_size)
+        size_mb = log_file.stat().st_size / (1024 * 1024)
+
+        print("=" * 60)
+        print(" BENCHMARK VALIDATION EN FLUX")
+        print("=" * 60)
+        print(f" Journal: {size_mb:.0f} Mo, {entries} entrées (format={args.format}), "
+              f"généré en {time.perf_counter() - t0:.1f} s")
+
+        ok = True
+        runs = [(_run_checks, (str(logs_dir), args.format))]
+        if args.legacy:
+            runs.append((_run_legacy, (str(log_file), args.format)))
+        for target, target_args in runs:
+            result, exitcode = _measure(target, target_args)
+            if result is None:
+                print(f" {target.__name__}: processus terminé avec le code {exitcode} (mémoire insuffisante ?)")
+                ok = ok and target is not _run_checks
+                continue
+            mode, duration, peak, count, error, passed = result
+            peak_text = f"{peak:.0f} Mo" if peak is not None else "n/a"
+            print(f" {mode:10}: {duration:.1f} s, {size_mb / duration:.0f} Mo/s, "
+                  f"pic RSS {peak_text}, {count} entrées")
+            if mode == "streaming":
+                print(f"             checkers validés: {passed}, erreur de lecture: {error or 'aucune'}")
+                ok = ok and count == entries and error is None
+        print(" RÉSULTAT: " + ("OK" if ok else "ÉCHEC"))
+        return ok
+    finally:
+        if not args.keep:
+            shutil.rmtree(logs_dir, ignore_errors=True)
+        else:
+            print(f" Journal conservé dans {logs_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la validation en flux d'un gros journal")
+    parser.add_argument("--size-mb", type=float, default=2048, help="taille du journal synthétique")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json")
+    parser.add_argument("--prompt-size", type=int, default=4000, help="taille du prompt (caractères)")
+    parser.add_argument("--workload", choices=["synthetic", "realistic"], default="synthetic",
+                        help="entrées identiques (synthetic) ou generate_test_logs (realistic)")
+    parser.add_argument("--seed", type=int, default=0, help="graine du journal realistic")
+    parser.add_argument("--learn", help="journal dont le profil est appris (realistic)")
+    parser.add_argument("--legacy", action="store_true", help="mesure aussi json.load() du fichier complet")
+    parser.add_argument("--keep", action="store_true", help="conserve le dossier temporaire")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
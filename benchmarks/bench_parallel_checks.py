@@ -0,0 +1,109 @@
+"""
+Benchmark - vérifications parallèles (run_all_checks --jobs)
+
+Génère un journal JSON Lines synthétique (avec des segments scellés si
+--segments > 0), puis mesure la relecture complète de tous les checkers de
+run_all_checks avec 1, 2, 4... processus. Vérifie au passage que les rapports
+sont identiques à ceux du parcours séquentiel, et que le fichier actif est
+bien découpé en plusieurs plages (log_scan.plan_ranges).
+
+Par défaut, le journal a la forme qu'il prend en production : un fichier actif
+juste sous la taille de rotation (config.MAX_LOG_SIZE_MB), seul ou après des
+segments scellés.
+
+Usage:
+    python benchmarks/bench_parallel_checks.py
+    python benchmarks/bench_parallel_checks.py --size-mb 109 --segments 10 --jobs 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bench_log_streaming import generate_log
+from src.utils import config, log_store
+from src.data_quality.run_all_checks import _load_checkers
+from src.utils.log_scan import MIN_RANGE_BYTES, plan_ranges, scan_log
+
+
+def _run_checks(jobs: int):
+    loaded = _load_checkers(PROJECT_ROOT)
+    checkers = [item[1] for item in loaded.values() if not isinstance(item, Exception)]
+    t0 = time.perf_counter()
+    scan = scan_log(checkers, resume=False, jobs=jobs)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        passed = [checker.report(scan) for checker in checkers]
+    return time.perf_counter() - t0, scan, output.getvalue(), passed
+
+
+def run(args) -> bool:
+    logs_dir = Path(tempfile.mkdtemp(prefix="bench_parallel_"))
+    try:
+        log_store.set_logs_dir(logs_dir)
+        config.LOG_FORMAT = "jsonl"
+        # Segments scellés de taille égale puis fichier actif
+        part_bytes = int(args.size_mb * 1024 * 1024) // (args.segments + 1)
+        t0 = time.perf_counter()
+        entries = 0
+        for index in range(args.segments + 1):
+            # Identifiants distincts d'un segment à l'autre (le scellement les utilise)
+            entries += generate_log(log_store.JSONL_LOG_FILE, part_bytes, "jsonl", args.prompt_size, entries)
+            if index < args.segments:
+                log_store.rotate_log()
+        size_mb = log_store.log_size() / (1024 * 1024)
+
+        print("=" * 60)
+        print(" BENCHMARK VÉRIFICATIONS PARALLÈLES")
+        print("=" * 60)
+        print(f" Journal: {size_mb:.0f} Mo sur disque, {entries} entrées, {args.segments} segments "
+              f"(généré en {time.perf_counter() - t0:.1f} s), {os.cpu_count()} cœurs")
+
+        active_size = log_store.JSONL_LOG_FILE.stat().st_size
+        print(f" Fichier actif: {active_size / (1024 * 1024):.1f} Mo (rotation à {config.MAX_LOG_SIZE_MB} Mo, "
+              f"plage minimale {MIN_RANGE_BYTES / (1024 * 1024):.0f} Mo)")
+
+        ok = True
+        reference = None
+        baseline = None
+        for jobs in args.jobs:
+            active_ranges = sum(path == log_store.JSONL_LOG_FILE for path, _, _, _ in plan_ranges(jobs))
+            # Découpage attendu : une plage par processus, dans la limite de la plage minimale
+            split = active_ranges == max(1, min(jobs, active_size // MIN_RANGE_BYTES))
+            duration, scan, output, passed = _run_checks(jobs)
+            if reference is None:
+                reference, baseline = (output, passed), duration
+            same = (output, passed) == reference
+            ok = ok and same and split and scan.error is None and scan.entries == entries
+            print(f" jobs={jobs:2}: {duration:6.2f} s, accélération x{baseline / duration:.2f}, "
+                  f"{scan.entries} entrées, fichier actif en {active_ranges} plage(s), "
+                  f"rapports identiques: {'oui' if same else 'NON'}")
+        print(" RÉSULTAT: " + ("OK" if ok else "ÉCHEC"))
+        return ok
+    finally:
+        shutil.rmtree(logs_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des vérifications parallèles")
+    parser.add_argument("--size-mb", type=float, default=config.MAX_LOG_SIZE_MB * 0.9,
+                        help="taille du journal synthétique (segments compris)")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4], help="nombres de processus à mesurer")
+    parser.add_argument("--segments", type=int, default=0, help="nombre de segments scellés")
+    parser.add_argument("--prompt-size", type=int, default=4000, help="taille du prompt (caractères)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
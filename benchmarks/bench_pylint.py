@@ -0,0 +1,166 @@
+"""
+Benchmark - pylint gardé chargé dans le processus (run_pylint) contre un processus par appel
+
+Écrit --files petits modules Python (avec des défauts connus) dans un dossier
+temporaire, puis mesure la latence de run_pylint() par fichier :
+  - processus : l'ancien chemin (`pylint fichier.py` à chaque appel)
+  - 1er appel : pylint en mémoire, import et initialisation d'astroid compris
+  - à chaud   : appels suivants dans le même processus
+  - cache     : le même contenu relinté depuis une copie temporaire (comme le
+                JudgeAgent) avec le cache de rapports (PYLINT_CACHE)
+  - lot       : tous les fichiers en une session (run_pylint_batch, --jobs)
+Vérifie que les deux chemins donnent les mêmes messages et le même score, y
+compris après modification d'un fichier déjà analysé (isolation entre appels),
+et que le rapport servi par le cache est celui de pylint au nom de fichier près.
+
+Usage:
+    python benchmarks/bench_pylint.py --files 20
+    python benchmarks/bench_pylint.py --files 50 --rounds 3
+    python benchmarks/bench_pylint.py --files 50 --jobs 4
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.tools import pylint_tool
+from src.utils import config
+
+
+def _module_source(index: int, variant: int = 0) -> str:
+    lines = [f'"""Module de test {index}."""', "import os", "import sys", ""]
+    for function in range(5 + index % 10):
+        lines += [
+            f"def function_{function}(value, unused_{variant}=None):",
+            f"    result = value * {function}",
+            f"    if result > {index}:",
+            "        return undefined_name" if (function + variant) % 4 == 0 else "        return result",
+            "    return sys.maxsize",
+            "",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def _messages(result: dict) -> tuple:
+    # Messages seulement : la ligne du score mentionne aussi le run précédent
+    lines = [line for line in result["output"].splitlines() if line and "rated at" not in line and not line.startswith("---")]
+    # Messages structurés (sortie JSON de pylint), sans le chemin du fichier
+    return lines, pylint_tool.render_messages(result["messages"])
+
+
+def _lint(path: Path, in_process: bool, cache: bool = False):
+    config.PYLINT_IN_PROCESS = in_process
+    config.PYLINT_CACHE = cache
+    t0 = time.perf_counter()
+    result = pylint_tool.run_pylint(str(path))
+    return time.perf_counter() - t0, result
+
+
+def _summary(durations: list) -> str:
+    durations = sorted(durations)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    return (f"moyenne {statistics.mean(durations) * 1000:7.1f} ms, p50 {statistics.median(durations) * 1000:7.1f} ms, "
+            f"p95 {p95 * 1000:7.1f} ms")
+
+
+def run(args) -> bool:
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_pylint_"))
+    try:
+        files = []
+        for index in range(args.files):
+            path = work_dir / f"module_{index}.py"
+            path.write_text(_module_source(index), encoding="utf-8")
+            files.append(path)
+
+        print("=" * 60)
+        print(" BENCHMARK PYLINT EN MÉMOIRE")
+        print("=" * 60)
+        print(f" {args.files} fichiers, {args.rounds} passe(s)")
+
+        subprocess_times, expected = [], {}
+        for path in files:
+            duration, result = _lint(path, in_process=False)
+            subprocess_times.append(duration)
+            expected[path] = (_messages(result), result["score"])
+
+        first, result = _lint(files[0], in_process=True)
+        ok = (_messages(result), result["score"]) == expected[files[0]]
+        warm_times = []
+        for _ in range(args.rounds):
+            for path in files:
+                duration, result = _lint(path, in_process=True)
+                warm_times.append(duration)
+                ok = ok and (_messages(result), result["score"]) == expected[path]
+
+        # Isolation : un fichier modifié doit être relu, pas repris du cache d'astroid
+        isolated = True
+        for path in files[:3]:
+            path.write_text(_module_source(files.index(path), variant=1), encoding="utf-8")
+            _, cold = _lint(path, in_process=False)
+            _, warm = _lint(path, in_process=True)
+            isolated = isolated and _messages(cold) == _messages(warm) \
+                and cold["score"] == warm["score"]
+
+        # Cache : chaque fichier est linté une fois, puis une copie temporaire du même contenu
+        cache_times, cached = [], True
+        for path in files:
+            _lint(path, in_process=True, cache=True)
+            copy = work_dir / f"tmp_copy_{path.stem}.py"
+            shutil.copyfile(path, copy)
+            duration, result = _lint(copy, in_process=True, cache=True)
+            cache_times.append(duration)
+            fresh = work_dir / f"tmp_fresh_{path.stem}.py"
+            shutil.copyfile(path, fresh)
+            _, reference = _lint(fresh, in_process=True)
+            cached = cached and result["output"] == reference["output"].replace(fresh.stem, copy.stem) \
+                and result["messages"] == [pylint_tool.PylintMessage(**{**message.to_dict(), "path": str(copy)})
+                                           for message in reference["messages"]]
+        stats = pylint_tool.pylint_cache_stats()
+
+        print(f" processus : {_summary(subprocess_times)}")
+        print(f" 1er appel : {first * 1000:7.1f} ms (import de pylint et d'astroid)")
+        print(f" à chaud   : {_summary(warm_times)}  "
+              f"(x{statistics.median(subprocess_times) / statistics.median(warm_times):.1f} sur la médiane)")
+        print(f" cache     : {_summary(cache_times)}  ({stats['hits']} hits, {stats['misses']} misses)")
+        print(f" résultats identiques: {'oui' if ok else 'NON'}, fichiers modifiés relus: {'oui' if isolated else 'NON'}, "
+              f"rapports du cache identiques: {'oui' if cached else 'NON'}")
+
+        # Lot : tous les fichiers en une session pylint, comparés aux rapports fichier par fichier
+        config.PYLINT_CACHE = False
+        t0 = time.perf_counter()
+        batch = pylint_tool.run_pylint_batch(files, jobs=args.jobs)
+        batch_time = time.perf_counter() - t0
+        per_file_time, batched = 0.0, True
+        for path in files:
+            duration, result = _lint(path, in_process=True)
+            per_file_time += duration
+            batched = batched and _messages(batch[str(path)]) == _messages(result) \
+                and batch[str(path)]["score"] == result["score"]
+        print(f" lot       : {batch_time * 1000:7.1f} ms pour {len(files)} fichiers "
+              f"(un par un à chaud : {per_file_time * 1000:7.1f} ms), rapports identiques: {'oui' if batched else 'NON'}")
+        ok = ok and isolated and cached and batched
+        print(" RÉSULTAT: " + ("OK" if ok else "ÉCHEC"))
+        return ok
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de pylint en mémoire")
+    parser.add_argument("--files", type=int, default=20, help="nombre de fichiers analysés")
+    parser.add_argument("--rounds", type=int, default=2, help="passes à chaud sur tous les fichiers")
+    parser.add_argument("--jobs", type=int, default=None, help="processus du lot (défaut: tous les cœurs)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
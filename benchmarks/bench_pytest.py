@@ -0,0 +1,225 @@
+"""
+Benchmark - processus pytest préchauffés (run_pytest) contre un processus par appel
+
+Écrit --files couples module / fichier de test (comme le JudgeAgent, certains
+tests échouent) dans un dossier temporaire, puis mesure la latence de
+run_pytest() :
+  - processus : l'ancien chemin (`pytest fichier_test.py` à chaque appel)
+  - 1er appel : démarrage des processus modèles compris
+  - à chaud   : appels suivants (un fork du modèle par exécution)
+  - cache     : les mêmes tests sur le même code, copiés sous d'autres noms de
+                fichiers (comme le JudgeAgent), avec le cache (PYTEST_CACHE)
+Vérifie que les deux chemins donnent le même résultat, la même sortie et les
+mêmes résultats par test (durées et adresses mémoire mises à part), qu'un module modifié entre deux appels
+est bien réimporté (isolation entre exécutions), et qu'un fichier de test
+bloquant (boucle infinie, sous-processus sans fin) est arrêté à son délai.
+Mode retour rapide : sur une grande suite qui échoue (--suite-tests tests
+bavards), compare l'exécution complète à run_pytest(max_failures,
+output_limit) : latence, taille de la sortie et pic mémoire de la lecture.
+
+Usage:
+    python benchmarks/bench_pytest.py --files 20
+    python benchmarks/bench_pytest.py --files 30 --rounds 3
+    python benchmarks/bench_pytest.py --files 10 --timeout 5
+    python benchmarks/bench_pytest.py --files 10 --suite-tests 1000
+"""
+
+import argparse
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.tools import pytest_tool
+from src.utils import config
+
+VOLATILE = re.compile(r" in \d+\.\d+s| at 0x[0-9a-f]+")
+
+
+def _write_pair(work_dir: Path, index: int, offset: int = 0) -> Path:
+    (work_dir / f"module_{index}.py").write_text(
+        f"def compute(value):\n    return value * {index} + {offset}\n", encoding="utf-8")
+    expected = index + (1 if index % 3 == 0 else 0)  # un fichier sur trois a un test faux
+    test_path = work_dir / f"test_module_{index}.py"
+    test_path.write_text(
+        f"import module_{index}\n\n"
+        f"def test_compute():\n    assert module_{index}.compute(1) == {expected}\n\n"
+        f"def test_zero():\n    print('zéro')\n    assert module_{index}.compute(0) == 0\n",
+        encoding="utf-8")
+    return test_path
+
+
+def _normalized(result: dict) -> tuple:
+    # Résultats par test (JUnit XML) sans les durées
+    tests = [(test.nodeid, test.outcome, VOLATILE.sub("", test.message), test.location) for test in result["tests"]]
+    return result["passed"], VOLATILE.sub("", result["output"]), tests
+
+
+def _run(path: Path, warm: bool, cache: bool = False):
+    config.PYTEST_WARM_POOL = warm
+    config.PYTEST_CACHE = cache
+    t0 = time.perf_counter()
+    result = pytest_tool.run_pytest(str(path))
+    return time.perf_counter() - t0, result
+
+
+def _write_suite(work_dir: Path, count: int) -> Path:
+    # Une grande suite bavarde : deux tests sur trois échouent après avoir affiché 8 Ko
+    test_path = work_dir / "test_suite.py"
+    test_path.write_text(
+        "import pytest\n\n"
+        f"@pytest.mark.parametrize('index', range({count}))\n"
+        "def test_case(index):\n    print('x' * 8192)\n    assert index % 3 == 0, 'échec ' + 'y' * 500\n",
+        encoding="utf-8")
+    return test_path
+
+
+def _feedback_run(path: Path, warm: bool, feedback: bool):
+    config.PYTEST_WARM_POOL = warm
+    config.PYTEST_CACHE = False
+    options = {"max_failures": config.PYTEST_FEEDBACK_MAX_FAILURES,
+               "output_limit": config.PYTEST_FEEDBACK_OUTPUT_CHARS} if feedback else {}
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = pytest_tool.run_pytest(str(path), **options)
+    duration = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak, result
+
+
+def _summary(durations: list) -> str:
+    durations = sorted(durations)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    return (f"moyenne {statistics.mean(durations) * 1000:7.1f} ms, p50 {statistics.median(durations) * 1000:7.1f} ms, "
+            f"p95 {p95 * 1000:7.1f} ms")
+
+
+def run(args) -> bool:
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_pytest_"))
+    config.PYTEST_CACHE_DIR = str(work_dir / "cache")
+    try:
+        files = [_write_pair(work_dir, index) for index in range(args.files)]
+
+        print("=" * 60)
+        print(" BENCHMARK PYTEST PRÉCHAUFFÉ")
+        print("=" * 60)
+        print(f" {args.files} fichiers de test, {args.rounds} passe(s), jusqu'à {pytest_tool._pool_size()} processus modèle(s)")
+
+        subprocess_times, expected = [], {}
+        for path in files:
+            duration, result = _run(path, warm=False)
+            subprocess_times.append(duration)
+            expected[path] = _normalized(result)
+
+        first, result = _run(files[0], warm=True)
+        ok = _normalized(result) == expected[files[0]]
+        warm_times = []
+        for _ in range(args.rounds):
+            for path in files:
+                duration, result = _run(path, warm=True)
+                warm_times.append(duration)
+                ok = ok and _normalized(result) == expected[path]
+
+        # Isolation : le module modifié doit être réimporté (le test passe / échoue selon la version)
+        isolated = True
+        for index, path in enumerate(files[:3]):
+            _write_pair(work_dir, index, offset=1)
+            _, cold = _run(path, warm=False)
+            _, warm = _run(path, warm=True)
+            isolated = isolated and _normalized(cold) == _normalized(warm) and not warm["passed"]
+
+        # Cache : chaque couple est exécuté une fois, puis copié sous d'autres noms de même longueur
+        # (comme les fichiers temporaires du JudgeAgent)
+        cache_times, cached = [], True
+        for index, path in enumerate(files):
+            _run(path, warm=True, cache=True)
+            source = (work_dir / f"module_{index}.py").read_text(encoding="utf-8")
+            (work_dir / f"copies_{index}.py").write_text(source, encoding="utf-8")
+            copy = work_dir / f"test_copies_{index}.py"
+            copy.write_text(path.read_text(encoding="utf-8").replace(f"module_{index}", f"copies_{index}"),
+                            encoding="utf-8")
+            duration, result = _run(copy, warm=True, cache=True)
+            cache_times.append(duration)
+            _, reference = _run(copy, warm=True)
+            cached = cached and _normalized(result) == _normalized(reference)
+        stats = pytest_tool.pytest_cache_stats()
+
+        # Délais : une boucle infinie (délai par test) et un test qui ignore SIGALRM (délai global)
+        blocking = work_dir / "test_blocking.py"
+        blocking.write_text(
+            "import signal, subprocess, time\n\n"
+            "def test_loop():\n    while True:\n        pass\n\n"
+            "def test_stuck():\n    subprocess.Popen(['sleep', '1000'])\n"
+            "    signal.signal(signal.SIGALRM, signal.SIG_IGN)\n    signal.setitimer = lambda *args: None\n"
+            "    while True:\n        time.sleep(0.1)\n",
+            encoding="utf-8")
+        config.TEST_CASE_TIMEOUT = 1
+        config.PYTEST_CACHE = False
+        bounded = True
+        for warm in (False, True):
+            config.PYTEST_WARM_POOL = warm
+            t0 = time.perf_counter()
+            result = pytest_tool.run_pytest(str(blocking), timeout=args.timeout)
+            duration = time.perf_counter() - t0
+            bounded = bounded and result["timed_out"] and not result["passed"] \
+                and result["timeout"]["run_killed"] and duration < args.timeout + 2
+            print(f" bloquant  : {'modèle' if warm else 'processus'} arrêté après {duration:5.2f} s "
+                  f"(délai {args.timeout} s, tests arrêtés: {result['timeout']['tests'] if result['timeout'] else '-'})")
+
+        # Retour rapide : arrêt après N échecs et sortie bornée, contre l'exécution complète
+        suite = _write_suite(work_dir, args.suite_tests)
+        fast = True
+        for warm in (False, True):
+            full_time, full_peak, full = _feedback_run(suite, warm, feedback=False)
+            fast_time, fast_peak, quick = _feedback_run(suite, warm, feedback=True)
+            fast = fast and not full["passed"] and not quick["passed"] \
+                and len(pytest_tool.failed_tests(quick["tests"])) == config.PYTEST_FEEDBACK_MAX_FAILURES \
+                and len(quick["output"]) <= 2 * config.PYTEST_FEEDBACK_OUTPUT_CHARS + 200 \
+                and "caractères omis" in quick["output"] and "short test summary info" in quick["output"]
+            print(f" retour    : {'modèle' if warm else 'processus'} complet {full_time * 1000:7.1f} ms, "
+                  f"{len(full['output']) / 1024:6.0f} Ko de sortie, pic {full_peak / 1024:6.0f} Ko ; "
+                  f"rapide {fast_time * 1000:7.1f} ms, {len(quick['output']) / 1024:4.0f} Ko, pic {fast_peak / 1024:5.0f} Ko")
+        # Une suite qui passe (couple remis à sa version d'origine) : même verdict et mêmes tests dans les deux modes
+        passing = _write_pair(work_dir, 1)
+        _, _, full = _feedback_run(passing, True, feedback=False)
+        _, _, quick = _feedback_run(passing, True, feedback=True)
+        fast = fast and quick["passed"] and _normalized(quick) == _normalized(full)
+
+        print(f" processus : {_summary(subprocess_times)}")
+        print(f" 1er appel : {first * 1000:7.1f} ms (démarrage des processus modèles)")
+        print(f" à chaud   : {_summary(warm_times)}  "
+              f"(x{statistics.median(subprocess_times) / statistics.median(warm_times):.1f} sur la médiane)")
+        print(f" cache     : {_summary(cache_times)}  ({stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['disk_bytes'] / 1024:.0f} Ko sur disque)")
+        print(f" résultats identiques: {'oui' if ok else 'NON'}, modules modifiés réimportés: "
+              f"{'oui' if isolated else 'NON'}, fichiers bloquants arrêtés: {'oui' if bounded else 'NON'}, "
+              f"résultats du cache identiques: {'oui' if cached else 'NON'}, "
+              f"retour rapide borné: {'oui' if fast else 'NON'}")
+        ok = ok and isolated and bounded and cached and fast
+        print(" RÉSULTAT: " + ("OK" if ok else "ÉCHEC"))
+        return ok
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de pytest préchauffé")
+    parser.add_argument("--files", type=int, default=20, help="nombre de fichiers de test")
+    parser.add_argument("--rounds", type=int, default=2, help="passes à chaud sur tous les fichiers")
+    parser.add_argument("--timeout", type=float, default=3, help="délai du fichier de test bloquant (secondes)")
+    parser.add_argument("--suite-tests", type=int, default=600, help="tests de la grande suite (mode retour rapide)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
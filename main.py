@@ -5,6 +5,9 @@ from pathlib import Path
 from src.agents.auditor_agent import AuditorAgent
 from src.agents.fixer_agent import FixerAgent
 from src.agents.judge_agent import JudgeAgent
+from src.tools.pylint_tool import run_pylint_batch
+from src.utils import config
+from src.utils.log_writer import flush_logs
 from dotenv import load_dotenv
 
 
@@ -40,6 +43,12 @@ def main():
         print("Aucun fichier Python trouvé (dans le dossier 'sandbox'.")
         return
 
+    # Pré-analyse pylint de tout le sandbox en une session (tous les cœurs) :
+    # les rapports sont mis en cache, l'auditeur ne relance pas pylint sur ces fichiers
+    if config.PYLINT_CACHE:
+        print(f" Pré-analyse pylint de {len(python_files_list)} fichier(s)...")
+        run_pylint_batch(python_files_list)
+
     for py_file in python_files_list:
         print(f"\n{'='*60}")
         print(f"1 ere etape - Analyse de {py_file} : ")
@@ -104,15 +113,29 @@ def main():
                 print(f"\nCode corrigé pour {py_file}:\n")
                 print(fixed_code)
 
-            # Réévaluation
-         judge_result = judge.quick_evaluate(fixed_code, py_file)
+            # Réévaluation en mode retour rapide (quelques échecs, sortie bornée) ; la validation
+            # finale, après la boucle, reste une exécution complète
+         judge_result = judge.quick_evaluate(fixed_code, py_file, feedback=True)
 
          if judge_result.get("passed", False):
-                print("Tests réussis — Mission terminée avec succès !")
+                print("Tests réussis — validation finale...")
                 break
          else:
                 print("Tests échoués — Retour au Fixer (Self-Healing Loop) ...")
 
+        # Validation finale : exécution complète des tests (sortie entière) sur le code retenu
+        if iteration > 0:
+            with open(py_file, 'r', encoding='utf-8') as f:
+                code_content = f.read()
+            judge_result = judge.quick_evaluate(code_content, py_file)
+            if judge_result["passed"]:
+                print("Tests réussis — Mission terminée avec succès !")
+            else:
+                print("Validation finale : tests échoués.")
+
+        # Les logs du fichier sont écrits en arrière-plan : on les persiste avant de passer au suivant
+        flush_logs()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,7 +3,7 @@ import re
 from pathlib import Path
 from langchain_groq import ChatGroq
 from src.tools.file_tools import read_file
-from src.tools.pylint_tool import run_pylint
+from src.tools.pylint_tool import dedupe_messages, render_messages, run_pylint
 from src.utils.logger import log_experiment, ActionType  
 import os
 
@@ -26,7 +26,9 @@ class AuditorAgent:
         code = read_file(str(file_path))
         pylint_result = run_pylint(file_path)
         print("voici le resultat de pylint" ,pylint_result)
-        pylint_output = pylint_result['output']
+        # Messages pylint compacts (sans chemin ni doublons) plutôt que le rapport texte complet
+        pylint_output = render_messages(dedupe_messages(pylint_result['messages']))
+        pylint_output += f"\nScore: {pylint_result['score']}/10"
 
         prompt = f"""
 {self.prompt_template}
@@ -7,8 +7,9 @@ import tempfile
 from pathlib import Path
 
 from langchain_groq import ChatGroq
-from src.tools.pytest_tool import run_pytest
-from src.tools.pylint_tool import run_pylint  #Utilisation directe
+from src.tools.pytest_tool import failed_tests, render_tests, run_pytest, slowest_tests, warm_pytest_pool
+from src.tools.pylint_tool import dedupe_messages, render_messages, run_pylint  #Utilisation directe
+from src.utils import config
 from src.utils.logger import log_experiment, ActionType
 
 
@@ -38,14 +39,22 @@ class JudgeAgent:
                 self.prompt_text = f.read()
         else:
             self.prompt_text = "Tu es un juge de qualité de code Python."
+
+        # Processus pytest préchauffés dès maintenant : l'import de pytest se fait pendant l'audit
+        warm_pytest_pool()
         
         if self.verbose:
             print("JudgeAgent initialisé")
     
-    def quick_evaluate(self, code: str, file_path: Path = None) -> dict:
+    def quick_evaluate(self, code: str, file_path: Path = None, feedback: bool = False) -> dict:
         """
         Évalue rapidement la qualité du code avec pytest + Pylint.
         Génère automatiquement des tests de base si aucun n'existe.
+
+        Avec feedback=True (boucle de self-healing), pytest s'arrête après
+        config.PYTEST_FEEDBACK_MAX_FAILURES échecs et sa sortie est bornée à
+        config.PYTEST_FEEDBACK_OUTPUT_CHARS caractères : quelques échecs suffisent
+        au Fixer. 'passed' reste exact (un succès a exécuté tous les tests).
         """
         result_final = {
             "passed": False,
@@ -55,6 +64,8 @@ class JudgeAgent:
             "tests_generated": False,
             "pytest_passed":False,
             "errors": [],
+            "pytest_timeout": None,
+            "pytest_tests": [],
             "refactoring_test_failure": None
         }
         
@@ -88,9 +99,15 @@ class JudgeAgent:
         
         try:
             # 4. Exécuter pytest sur le fichier de test
-            test_result = run_pytest(tmp_test_path)
+            if feedback:
+                test_result = run_pytest(tmp_test_path, max_failures=config.PYTEST_FEEDBACK_MAX_FAILURES,
+                                         output_limit=config.PYTEST_FEEDBACK_OUTPUT_CHARS)
+            else:
+                test_result = run_pytest(tmp_test_path)
             result_final["pytest_passed"] = test_result["passed"]
             result_final["pytest_output"] = test_result.get("output", "")
+            result_final["pytest_timeout"] = test_result.get("timeout")  # None si aucun délai dépassé
+            result_final["pytest_tests"] = test_result.get("tests", [])  # TestCaseResult par test
             result_final["tests_generated"] = True
             
             # Affichage du résultat complet de pytest - Display full pytest result
@@ -120,12 +137,15 @@ class JudgeAgent:
             # Vérifier si les tests unitaires ont échoué - Check if unit tests failed 
             if not result_final["pytest_passed"]:
                needs_analysis = True
-               pytest_output_to_analyze = result_final["pytest_output"]
+               # Seulement l'essentiel des tests en échec ; la sortie complète si pytest n'a rien rapporté par test
+               failures = failed_tests(result_final["pytest_tests"])
+               pytest_output_to_analyze = render_tests(failures) if failures else result_final["pytest_output"]
 
             # Vérifier si le score Pylint est insuffisant - Check if Pylint score is insufficient
             if result_final.get("pylint_score") is not None and result_final["pylint_score"] < 7.0:
               needs_analysis = True
-              pylint_output_to_analyze = result_final.get("pylint_output")
+              # Messages compacts pour le prompt (le rapport complet reste dans result_final)
+              pylint_output_to_analyze = render_messages(dedupe_messages(pylint_result_dictionary["messages"]))
 
             if needs_analysis:
                    if self.verbose:
@@ -136,7 +156,8 @@ class JudgeAgent:
                     code,
                     pytest_output=pytest_output_to_analyze,
                     pylint_output=pylint_output_to_analyze,
-                    pylint_score=result_final.get("pylint_score")
+                    pylint_score=result_final.get("pylint_score"),
+                    timeout=result_final["pytest_timeout"]
                    )
     
                    result_final["refactoring_test_failure"] = analysis
@@ -156,6 +177,8 @@ class JudgeAgent:
             # 7. Vérifier les critères d'acceptation finale - Check final acceptance criteria
             if not result_final["pytest_passed"]:
                 result_final["errors"].append("Generated tests failed")
+            if result_final["pytest_timeout"]:
+                result_final["errors"].append("Generated tests timed out")
             
             # Déterminer le status final pour le log 
             if not result_final.get("pytest_passed", False) or result_final["pylint_score"] is None or result_final["pylint_score"] < 7.0:
@@ -457,18 +480,33 @@ GENERATED SEMANTIC TEST CODE (Python only, no markdown):
                 "pylint_score": result.get("pylint_score"),
                 "tests_generated": result.get("tests_generated", False),
                 "errors": result.get("errors", []),
-                "pytest_output_preview": result.get("pytest_output", "")[:500]
+                "pytest_output_preview": result.get("pytest_output", "")[:500],
+                "pytest_failures": [test.to_dict() for test in failed_tests(result.get("pytest_tests", []))],
+                "slowest_tests": [{"nodeid": test.nodeid, "duration": test.duration}
+                                  for test in slowest_tests(result.get("pytest_tests", []), 3)]
             },
             status=status
         )
 
-    def _analyze_failures(self, code: str, pytest_output: str = None, pylint_output: str = None, pylint_score: float = None) -> dict:
+    def _analyze_failures(self, code: str, pytest_output: str = None, pylint_output: str = None, pylint_score: float = None,
+                          timeout: dict = None) -> dict:
         """
         Analyse les échecs de tests et les problèmes de Pylint.
         Retourne un JSON compatible avec le FixerAgent.
+        `timeout` : détail des délais dépassés renvoyé par run_pytest (None si aucun).
         """
         # Construire le prompt pour l'agent LLM d'analyse combinée - Build prompt for combined analysis LLM agent
         prompt_parts = []
+        if timeout:
+            # Code bloquant (input(), boucle infinie, attente) : à corriger avant tout le reste
+            lines = []
+            if timeout["run_killed"]:
+                lines.append(f"The whole pytest run was killed after {timeout['limit']}s.")
+            for test in timeout["tests"]:
+                lines.append(f"Test {test} was stopped after {timeout['test_limit']}s.")
+            lines.append("The code under test blocks (input(), infinite loop, endless wait): "
+                         "report it as an INPUT_BLOCKING issue with CRITICAL priority.")
+            prompt_parts.append("## PYTEST TIMEOUT:\n" + "\n".join(lines))
         if pytest_output:
             prompt_parts.append(f"## PYTEST OUTPUT:\n{pytest_output}")
         if pylint_output:
@@ -545,8 +583,8 @@ OUTPUT: STRICT JSON only.
                 "refactoring_plan": [
                     {
                         "priority": "CRITICAL",
-                        "category": "ASSERTION_FAILURE" if pytest_output else "REFACTORING",
-                        "issue": "Judge analysis failed",
+                        "category": "INPUT_BLOCKING" if timeout else "ASSERTION_FAILURE" if pytest_output else "REFACTORING",
+                        "issue": "Test run timed out" if timeout else "Judge analysis failed",
                         "line": 0,
                         "code_snippet": fallback_code_snippet,
                         "suggestion": "Inspect outputs manually"
@@ -1,57 +1,113 @@
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 
-def check_all_agents_logs():
-    """Vérifie que TOUS les agents loggent correctement"""
-    
-    current_file = Path(__file__)
-    project_root = current_file.parent.parent.parent
-    LOG_FILE = project_root / "logs" / "experiment_data.json"
-    
-    print("\n" + "="*70)
-    print("VÉRIFICATION COMPLÈTE - Data Officer")
-    print("(Compatible avec vos logs qui utilisent 'agent_name' et 'model_used')")
-    print("="*70)
-    
-    # 1. Vérifications basiques du fichier log - Basic file checks 
-    if not LOG_FILE.exists():
-        print("ERREUR CRITIQUE: Fichier experiment_data.json introuvable")
-        print("   NOTE: Qualité des données = 0/30")
-        return False
-    
-    try:
-        file_size = LOG_FILE.stat().st_size
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.log_scan import LogChecker, merge_counts, run_checker
+
+class AllAgentsLogChecker(LogChecker):
+    """Statistiques globales par agent et par action, accumulées pendant le parcours unique (cf. log_scan)"""
+
+    def __init__(self):
+        super().__init__()
+        self.total = 0
+        self.first_log = None
+        self.agents = {}
+        self.actions = {}
+        self.missing_input = 0
+        self.missing_output = 0
+        self.short_responses = 0
+        # Numéros des premières entrées sans input_prompt / output_response (2 exemples de chaque)
+        self.missing_input_at = []
+        self.missing_output_at = []
+
+    def visit(self, log):
+        i = self.total
+        self.total += 1
+        if self.first_log is None:
+            self.first_log = log
+
+        # CORRIGÉ: Vos logs utilisent 'agent_name', pas 'agent' - Corrected: Your logs use 'agent_name', not 'agent'
+        agent = log.get('agent', 'UNKNOWN')  
+        self.agents[agent] = self.agents.get(agent, 0) + 1
+
+        details = log.get('details', {})
+
+        # Champs obligatoires
+        if 'input_prompt' not in details:
+            self.missing_input += 1
+            if self.missing_input <= 2:  # Afficher seulement 2 exemples
+                self.missing_input_at.append(i)
+
+        if 'output_response' not in details:
+            self.missing_output += 1
+            if self.missing_output <= 2:
+                self.missing_output_at.append(i)
+
+        # Qualité des réponses - Quality of responses
+        if 'output_response' in details:
+            response = str(details['output_response'])
+            if len(response) < 10:
+                self.short_responses += 1
+
+        action = log.get('action', 'UNKNOWN')
+        self.actions[action] = self.actions.get(action, 0) + 1
+
+    def merge(self, other):
+        self.missing_input_at = (self.missing_input_at + [i + self.total for i in other.missing_input_at])[:2]
+        self.missing_output_at = (self.missing_output_at + [i + self.total for i in other.missing_output_at])[:2]
+        self.total += other.total
+        if self.first_log is None:
+            self.first_log = other.first_log
+        merge_counts(self.agents, other.agents)
+        merge_counts(self.actions, other.actions)
+        self.missing_input += other.missing_input
+        self.missing_output += other.missing_output
+        self.short_responses += other.short_responses
+
+    def report(self, scan):
+        print("\n" + "="*70)
+        print("VÉRIFICATION COMPLÈTE - Data Officer")
+        print("(Compatible avec vos logs qui utilisent 'agent_name' et 'model_used')")
+        print("="*70)
+        
+        # 1. Vérifications basiques du fichier log - Basic file checks 
+        if not scan.exists:
+            print("ERREUR CRITIQUE: Fichier experiment_data.json introuvable")
+            print("   NOTE: Qualité des données = 0/30")
+            return False
+        
+        file_size = scan.total_size  # tous les segments (voir log_store.rotate_log)
         if file_size == 0:
             print(" ERREUR: Fichier vide")
             return False
         
         print(f" Fichier trouvé: {file_size} octets")
         
-        # 2. Chargement et validation JSON - Load and validate JSON
-        with open(LOG_FILE, 'r', encoding='utf-8') as f:
-            logs = json.load(f)
-        
-        if not isinstance(logs, list):
-            print(" ERREUR: Le fichier doit contenir un tableau JSON")
+        # 2. Validation JSON (le chargement est fait par le parcours) - Validate JSON
+        if isinstance(scan.error, json.JSONDecodeError):
+            print(" ERREUR: Fichier JSON invalide ou corrompu")
+            return False
+        if scan.error is not None or self.failure is not None:
+            print(f" ERREUR: {scan.error or self.failure}")
             return False
         
-        print(f" Format JSON valide: {len(logs)} entrées")
+        print(f" Format JSON valide: {self.total} entrées")
         
-        if len(logs) < 5:
-            print(f"  AVERTISSEMENT: Peu d'entrées ({len(logs)})")
+        if self.total < 5:
+            print(f"  AVERTISSEMENT: Peu d'entrées ({self.total})")
             print("   Recommandé: au moins 20 entrées pour la validation")
-        
+
         # 3. Analyse par agent - CORRIGÉ: VOS LOGS utilisent 'agent_name' - Analysis by agent - CORRECTED: YOUR LOGS use 'agent_name'
         print("\n" + "="*70)
         print(" RÉPARTITION PAR AGENT (champ 'agent_name'):")
         print("="*70)
         
-        agents = {}
-        for log in logs:
-            # CORRIGÉ: Vos logs utilisent 'agent_name', pas 'agent' - Corrected: Your logs use 'agent_name', not 'agent'
-            agent = log.get('agent', 'UNKNOWN')  
-            agents[agent] = agents.get(agent, 0) + 1
+        agents = self.agents
         
         if not agents:
             print("    Aucun agent trouvé dans les logs")
@@ -67,31 +123,15 @@ def check_all_agents_logs():
         print("(Dans 'details': input_prompt et output_response)")
         print("="*70)
         
-        missing_input = 0
-        missing_output = 0
-        short_responses = 0
+        missing = sorted([(i, 0, 'input_prompt') for i in self.missing_input_at]
+                         + [(i, 1, 'output_response') for i in self.missing_output_at])
+        for i, _, field in missing:
+            print(f"    Entrée #{i}: '{field}' manquant")
         
-        for i, log in enumerate(logs):
-            details = log.get('details', {})
-            
-            # Champs obligatoires
-            if 'input_prompt' not in details:
-                missing_input += 1
-                if missing_input <= 2:  # Afficher seulement 2 exemples
-                    print(f"    Entrée #{i}: 'input_prompt' manquant")
-            
-            if 'output_response' not in details:
-                missing_output += 1
-                if missing_output <= 2:
-                    print(f"    Entrée #{i}: 'output_response' manquant")
-            
-            # Qualité des réponses - Quality of responses
-            if 'output_response' in details:
-                response = str(details['output_response'])
-                if len(response) < 10:
-                    short_responses += 1
-        
-        total_logs = len(logs)
+        missing_input = self.missing_input
+        missing_output = self.missing_output
+        short_responses = self.short_responses
+        total_logs = self.total
         
         print(f"\n   input_prompt manquant     : {missing_input}/{total_logs}")
         print(f"   output_response manquant : {missing_output}/{total_logs}")
@@ -102,10 +142,7 @@ def check_all_agents_logs():
         print(" RÉPARTITION PAR TYPE D'ACTION:")
         print("="*70)
         
-        actions = {}
-        for log in logs:
-            action = log.get('action', 'UNKNOWN')
-            actions[action] = actions.get(action, 0) + 1
+        actions = self.actions
         
         for action, count in actions.items():
             print(f"   {action:15} : {count:3}")
@@ -169,8 +206,8 @@ def check_all_agents_logs():
         
         # Vérification de la structure réelle de vos logs
         print("\n VÉRIFICATION STRUCTURE DE VOS LOGS:")
-        if logs:
-            sample_log = logs[0]
+        if self.first_log is not None:
+            sample_log = self.first_log
             print(f"   Structure du premier log:")
             print(f"   - Utilise 'agent_name': {'✅' if 'agent_name' in sample_log else '❌'}")
             print(f"   - Utilise 'model_used': {'✅' if 'model_used' in sample_log else '❌'}")
@@ -198,14 +235,15 @@ def check_all_agents_logs():
             print(" QUALITÉ DES DONNÉES INSUFFISANTE")
             print("   Corrections nécessaires avant soumission")
             return False
-            
-    except json.JSONDecodeError:
-        print(" ERREUR: Fichier JSON invalide ou corrompu")
-        return False
-    except Exception as e:
-        print(f" ERREUR: {e}")
-        return False
+
+def check_all_agents_logs():
+    """Vérifie que TOUS les agents loggent correctement"""
+    return run_checker(AllAgentsLogChecker())
 
 if __name__ == "__main__":
     success = check_all_agents_logs()
+    if "--stats" in sys.argv:
+        # Percentiles, taux d'échec par agent, itérations par fichier (pandas)
+        from src.data_quality.log_statistics import compute_log_statistics, print_log_statistics
+        print_log_statistics(compute_log_statistics())
     exit(0 if success else 1)
\ No newline at end of file
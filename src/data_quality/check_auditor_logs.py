@@ -5,51 +5,114 @@ Compatible avec vos logs qui utilisent 'agent_name' et 'model_used'
 
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 
-def check_auditor_logs():
-    """Vérifie que l'Auditor Agent loggue correctement"""
-    
-    current_file = Path(__file__)
-    project_root = current_file.parent.parent.parent
-    LOG_FILE = project_root / "logs" / "experiment_data.json"
-    
-    print("\n" + "="*60)
-    print(" VÉRIFICATION AUDITOR AGENT - Data Officer")
-    print("="*60)
-    
-    # 1. Vérifier l'existence du fichier
-    if not LOG_FILE.exists():
-        print(" ERREUR: Fichier experiment_data.json introuvable")
-        print(f"   Chemin: {LOG_FILE}")
-        return False
-    
-    if LOG_FILE.stat().st_size == 0:
-        print(" ERREUR: Fichier vide - Aucun log enregistré")
-        return False
-    
-    try:
-        # 2. Charger les logs
-        with open(LOG_FILE, 'r', encoding='utf-8') as f:
-            logs = json.load(f)
-        
-        print(f" Logs totaux: {len(logs)} entrées")
-        
-        # CORRIGÉ: Vos logs utilisent 'agent_name', pas 'agent'
-        # Chercher l'Auditor dans le champ 'agent_name'
-        auditor_names = ['Auditor_Agent', 'Auditor', 'auditor_agent', 'auditor', 'AuditorAgent']
-        auditor_logs = []
-        
-        for log in logs:
-            # CORRIGÉ: Chercher d'abord 'agent_name', puis 'agent' comme fallback
-            agent = log.get('agent_name', log.get('agent', ''))
-            if any(name.lower() == agent.lower() for name in auditor_names):
-                auditor_logs.append(log)
-        
-        print(f" Logs Auditor: {len(auditor_logs)} entrées")
-        
-        if not auditor_logs:
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.log_scan import LogChecker, merge_counts, run_checker
+
+class AuditorLogChecker(LogChecker):
+    """Accumule les logs de l'Auditor pendant le parcours unique (cf. log_scan)"""
+
+    # CORRIGÉ: Vos logs utilisent 'agent_name', pas 'agent'
+    auditor_names = ['Auditor_Agent', 'Auditor', 'auditor_agent', 'auditor', 'AuditorAgent']
+
+    def __init__(self):
+        super().__init__()
+        self.total = 0
+        self.auditor_count = 0
+        self.first_log = None
+        self.last_log = None
+        self.actions = {}
+        self.good_logs = 0
+        self.problematic_count = 0
+        self.problem_lines = []
+        self.analysis_count = 0
+
+    def visit(self, log):
+        self.total += 1
+        # CORRIGÉ: Chercher d'abord 'agent_name', puis 'agent' comme fallback
+        agent = log.get('agent_name', log.get('agent', ''))
+        if not any(name.lower() == agent.lower() for name in self.auditor_names):
+            return
+
+        i = self.auditor_count
+        self.auditor_count += 1
+        if self.first_log is None:
+            self.first_log = log
+        self.last_log = log
+
+        action = log.get('action', 'UNKNOWN')
+        self.actions[action] = self.actions.get(action, 0) + 1
+
+        # Qualité des logs - Log quality check
+        details = log.get('details', {})
+        has_input = 'input_prompt' in details and len(str(details['input_prompt'])) > 10
+        has_output = 'output_response' in details and len(str(details['output_response'])) > 10
+
+        if has_input and has_output:
+            self.good_logs += 1
+        else:
+            self.problematic_count += 1
+            if self.problematic_count <= 3:  # Afficher seulement 3 problèmes max 
+                issues = []
+                if 'input_prompt' not in details: issues.append("no input")
+                elif len(str(details['input_prompt'])) <= 10: issues.append("short input")
+                if 'output_response' not in details: issues.append("no output")
+                elif len(str(details['output_response'])) <= 10: issues.append("short output")
+                self.problem_lines.append((i, ', '.join(issues)))
+
+        # Vérifier que l'Auditor fait bien de l'ANALYSIS - Check for ANALYSIS actions
+        if 'ANALYSIS' in log.get('action', ''):
+            self.analysis_count += 1
+
+    def merge(self, other):
+        self.total += other.total
+        self.problem_lines += [(i + self.auditor_count, issues) for i, issues in other.problem_lines]
+        del self.problem_lines[3:]
+        self.auditor_count += other.auditor_count
+        if self.first_log is None:
+            self.first_log = other.first_log
+        if other.last_log is not None:
+            self.last_log = other.last_log
+        merge_counts(self.actions, other.actions)
+        self.good_logs += other.good_logs
+        self.problematic_count += other.problematic_count
+        self.analysis_count += other.analysis_count
+
+    def report(self, scan):
+        LOG_FILE = scan.log_file
+
+        print("\n" + "="*60)
+        print(" VÉRIFICATION AUDITOR AGENT - Data Officer")
+        print("="*60)
+
+        # 1. Vérifier l'existence du fichier
+        if not scan.exists:
+            print(f" ERREUR: Fichier {LOG_FILE.name} introuvable")
+            print(f"   Chemin: {LOG_FILE}")
+            return False
+
+        if scan.total_size == 0:
+            print(" ERREUR: Fichier vide - Aucun log enregistré")
+            return False
+
+        if isinstance(scan.error, json.JSONDecodeError):
+            print(" ERREUR: Fichier JSON invalide")
+            return False
+        if scan.error is not None or self.failure is not None:
+            print(f" ERREUR: {scan.error or self.failure}")
+            return False
+
+        # 2. Logs chargés par le parcours
+        print(f" Logs totaux: {self.total} entrées")
+        print(f" Logs Auditor: {self.auditor_count} entrées")
+
+        if not self.auditor_count:
             print("\n CRITIQUE: Aucun log Auditor trouvé!")
             print("   Vos logs utilisent le champ 'agent_name'")
             print("   Vérifiez que votre AuditorAgent appelle log_experiment() avec:")
@@ -57,105 +120,78 @@ def check_auditor_logs():
             print("   - model_used='nom-du-modèle'")
             print("   - details avec 'input_prompt' et 'output_response'")
             return False
-        
+
         # 3. Vérifier la dernière entrée du log Auditor - Check last Auditor log entry
-        last_log = auditor_logs[-1]
+        last_log = self.last_log
         details = last_log.get('details', {})
-        
+
         print(f"\n DERNIÈRE ENTRÉE:")
         print(f"   Agent: {last_log.get('agent_name', last_log.get('agent', 'N/A'))}") 
         print(f"   Modèle: {last_log.get('model_used', last_log.get('model', 'N/A'))}")   
         print(f"   Action: {last_log.get('action', 'N/A')}")
         print(f"   Status: {last_log.get('status', 'N/A')}")
         print(f"   Timestamp: {last_log.get('timestamp', 'N/A')}")
-        
+
         # 4. Vérifier les champs obligatoires - input_prompt et output_response
         print("\n VÉRIFICATION CHAMPS OBLIGATOIRES:")
-        
+
         mandatory_fields = {'input_prompt': False, 'output_response': False}
-        
+
         if 'input_prompt' in details:
             mandatory_fields['input_prompt'] = True
             input_len = len(str(details['input_prompt']))
             print(f"    input_prompt: présent ({input_len} caractères)")
         else:
             print("    input_prompt: MANQUANT")
-        
+
         if 'output_response' in details:
             mandatory_fields['output_response'] = True
             output_len = len(str(details['output_response']))
             print(f"    output_response: présent ({output_len} caractères)")
         else:
             print("   output_response: MANQUANT")
-        
+
         # 5. Statistiques détaillées des logs Auditor - Detailed Auditor log statistics 
         print("\n STATISTIQUES DÉTAILLÉES:")
-        
-        actions = {}
-        for log in auditor_logs:
-            action = log.get('action', 'UNKNOWN')
-            actions[action] = actions.get(action, 0) + 1
-        
-        for action, count in actions.items():
+
+        for action, count in self.actions.items():
             print(f"   - {action}: {count} entrées")
-        
+
         # 6. Qualité des logs - Log quality check
         print("\n QUALITÉ DES LOGS:")
-        good_logs = 0
-        problematic_logs = []
-        
-        for i, log in enumerate(auditor_logs):
-            details = log.get('details', {})
-            has_input = 'input_prompt' in details and len(str(details['input_prompt'])) > 10
-            has_output = 'output_response' in details and len(str(details['output_response'])) > 10
-            
-            if has_input and has_output:
-                good_logs += 1
-            else:
-                problematic_logs.append(i)
-                if len(problematic_logs) <= 3:  # Afficher seulement 3 problèmes max 
-                    issues = []
-                    if 'input_prompt' not in details: issues.append("no input")
-                    elif len(str(details['input_prompt'])) <= 10: issues.append("short input")
-                    if 'output_response' not in details: issues.append("no output")
-                    elif len(str(details['output_response'])) <= 10: issues.append("short output")
-                    print(f"     Entrée #{i}: {', '.join(issues)}")
-        
-        quality = (good_logs / len(auditor_logs)) * 100 if auditor_logs else 0
-        print(f"   Logs valides: {good_logs}/{len(auditor_logs)} ({quality:.1f}%)")
-        
+        for i, issues in self.problem_lines:
+            print(f"     Entrée #{i}: {issues}")
+
+        quality = (self.good_logs / self.auditor_count) * 100
+        print(f"   Logs valides: {self.good_logs}/{self.auditor_count} ({quality:.1f}%)")
+
         # 7. Vérification spécifique à l'Auditor - Specific Auditor checks
         print("\n VÉRIFICATION SPÉCIFIQUE AUDITOR:")
-        
-        if auditor_logs:
-            # Vérifier que l'Auditor fait bien de l'ANALYSIS - Check for ANALYSIS actions
-            analysis_logs = [log for log in auditor_logs if 'ANALYSIS' in log.get('action', '')]
-            print(f"   - Logs d'ANALYSIS: {len(analysis_logs)}/{len(auditor_logs)}")
-            
-            # Vérifier les champs spécifiques à l'Auditor
-            sample_log = auditor_logs[0]
-            sample_details = sample_log.get('details', {})
-            
-            auditor_specific = ['issues_found', 'file_analyzed', 'analysis_type', 'code_quality']
-            found_fields = [field for field in auditor_specific if field in sample_details]
-            if found_fields:
-                print(f"   - Champs spécifiques Auditor: {', '.join(found_fields)}")
-            else:
-                print(f"   - Aucun champ spécifique Auditor trouvé")
-        
+
+        print(f"   - Logs d'ANALYSIS: {self.analysis_count}/{self.auditor_count}")
+
+        # Vérifier les champs spécifiques à l'Auditor
+        sample_log = self.first_log
+        sample_details = sample_log.get('details', {})
+
+        auditor_specific = ['issues_found', 'file_analyzed', 'analysis_type', 'code_quality']
+        found_fields = [field for field in auditor_specific if field in sample_details]
+        if found_fields:
+            print(f"   - Champs spécifiques Auditor: {', '.join(found_fields)}")
+        else:
+            print(f"   - Aucun champ spécifique Auditor trouvé")
+
         # 8. Vérification de la compatibilité avec vos logs - Compatibility check with your logs
         print("\n VÉRIFICATION COMPATIBILITÉ:")
-        if auditor_logs:
-            sample_log = auditor_logs[0]
-            print(f"   Champs utilisés dans les logs:")
-            print(f"   - 'agent_name': {'✅' if 'agent_name' in sample_log else '❌'}")
-            print(f"   - 'model_used': {'✅' if 'model_used' in sample_log else '❌'}")
-            print(f"   - 'agent': {'⚠️' if 'agent' in sample_log else '✅'}")
-            print(f"   - 'model': {'⚠️' if 'model' in sample_log else '✅'}")
-            print(" Vos logs utilisent 'agent_name' et 'model_used'")
-        
+        print(f"   Champs utilisés dans les logs:")
+        print(f"   - 'agent_name': {'✅' if 'agent_name' in sample_log else '❌'}")
+        print(f"   - 'model_used': {'✅' if 'model_used' in sample_log else '❌'}")
+        print(f"   - 'agent': {'⚠️' if 'agent' in sample_log else '✅'}")
+        print(f"   - 'model': {'⚠️' if 'model' in sample_log else '✅'}")
+        print(" Vos logs utilisent 'agent_name' et 'model_used'")
+
         print("\n" + "="*60)
-        
+
         # Critères de validation (adaptés à vos logs)
         if all(mandatory_fields.values()) and quality > 70:
             print("AUDITOR AGENT - LOGGING VALIDÉ")
@@ -168,13 +204,10 @@ def check_auditor_logs():
         else:
             print("AUDITOR AGENT - PROBLÈMES DÉTECTÉS")
             return False
-            
-    except json.JSONDecodeError:
-        print(" ERREUR: Fichier JSON invalide")
-        return False
-    except Exception as e:
-        print(f" ERREUR: {e}")
-        return False
+
+def check_auditor_logs():
+    """Vérifie que l'Auditor Agent loggue correctement"""
+    return run_checker(AuditorLogChecker())
 
 if __name__ == "__main__":
     success = check_auditor_logs()
@@ -3,128 +3,140 @@ Vérification des prompts - Data Officer
 """
 
 import re
+import sys
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.log_scan import LogChecker, run_checker
+
+class PromptsLogChecker(LogChecker):
+    """Vérification des fichiers de prompts ; les prompts des logs sont relevés pendant le parcours unique"""
+
+    def __init__(self):
+        super().__init__()
+        # Extraire les prompts utilisés dans les logs
+        self.used_prompts = set()
+
+    def visit(self, log):
+        details = log.get('details', {})
+        prompt = details.get('input_prompt', '')
+        if prompt and len(prompt) > 20:
+            # Prendre les premiers 50 caractères comme signature
+            signature = prompt[:50].replace('\n', ' ').strip()
+            if signature:
+                self.used_prompts.add(signature)
+
+    def merge(self, other):
+        self.used_prompts |= other.used_prompts
+
+    def report(self, scan):
+        prompts_dir = Path(__file__).parent.parent.parent / "src" / "prompts"
+        
+        print("\n" + "="*60)
+        print(" VÉRIFICATION DES PROMPTS - Data Officer")
+        print("="*60)
+        
+        if not prompts_dir.exists():
+            print(" Dossier prompts/ introuvable")
+            return False
+        
+        prompt_files = list(prompts_dir.glob("*.txt")) + list(prompts_dir.glob("*.md"))
+        print(f" Prompts trouvés: {len(prompt_files)} fichiers")
+        
+        if not prompt_files:
+            print(" Aucun fichier de prompt trouvé")
+            return True  # Pas critique mais étrange
+        
+        # 1. Vérifier chaque prompt
+        issues = []
+        warnings = []
+        
+        for prompt_file in prompt_files:
+            try:
+                with open(prompt_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                file_issues = []
+                file_warnings = []
+                
+                # Vérification sécurité
+                dangerous_patterns = [
+                    (r'api_key\s*=', "Variable API_KEY détectée"),
+                    (r'sk-[a-zA-Z0-9]{20,}', "Clé API OpenAI format"),
+                    (r'AIza[0-9A-Za-z\-_]{35}', "Clé API Google format"),
+                    (r'password\s*=', "Mot de passe en clair"),
+                    (r'secret\s*=', "Secret en clair")
+                ]
+                
+                for pattern, message in dangerous_patterns:
+                    if re.search(pattern, content, re.IGNORECASE):
+                        file_issues.append(f"{message} dans {prompt_file.name}")
+                
+                # Vérification qualité
+                if len(content.strip()) < 50:
+                    file_warnings.append(f"Prompt très court ({len(content)} caractères)")
+                
+                if len(content) > 10000:
+                    file_warnings.append(f"Prompt très long ({len(content)} caractères)")
+                
+                # Vérifier la structure
+                if "ROLE:" not in content and "You are" not in content:
+                    file_warnings.append("Structure ROLE:/You are manquante")
+                
+                if "TASK:" not in content and "Your task" not in content:
+                    file_warnings.append("Structure TASK:/Your task manquante")
+                
+                # Collecter
+                if file_issues:
+                    issues.extend(file_issues)
+                if file_warnings:
+                    warnings.extend([f"{prompt_file.name}: {w}" for w in file_warnings])
+                
+                print(f"    {prompt_file.name}: {len(content)} caractères")
+                
+            except Exception as e:
+                print(f"  Erreur lecture {prompt_file.name}: {e}")
+                issues.append(f"Erreur lecture {prompt_file.name}")
+        
+        # 2. Afficher les résultats
+        if issues:
+            print("\n PROBLÈMES CRITIQUES (sécurité):")
+            for issue in issues:
+                print(f"  {issue}")
+        
+        if warnings:
+            print("\nAVERTISSEMENTS (qualité):")
+            for warning in warnings[:5]:  # Limiter l'affichage
+                print(f"   • {warning}")
+            if len(warnings) > 5:
+                print(f"   ... et {len(warnings) - 5} avertissements supplémentaires")
+        
+        # 3. Vérifier la cohérence avec les logs
+        print("\nVÉRIFICATION COHÉRENCE LOGS:")
+        
+        if scan.exists:
+            if scan.error is not None or self.failure is not None:
+                print("  Impossible d'analyser les logs")
+            else:
+                print(f"   Prompts uniques dans les logs: {len(self.used_prompts)}")
+        else:
+            print(" Fichier de logs introuvable")
+        
+        print("\n" + "="*60)
+        
+        if not issues:
+            print("PROMPTS VALIDÉS (sécurité OK)")
+            return True
+        else:
+            print(" PROMPTS NON VALIDÉS - Données sensibles détectées")
+            return False
+
 def check_prompts_log():
     """Vérifie la qualité et sécurité des prompts"""
-    
-    prompts_dir = Path(__file__).parent.parent.parent / "src" / "prompts"
-    
-    print("\n" + "="*60)
-    print(" VÉRIFICATION DES PROMPTS - Data Officer")
-    print("="*60)
-    
-    if not prompts_dir.exists():
-        print(" Dossier prompts/ introuvable")
-        return False
-    
-    prompt_files = list(prompts_dir.glob("*.txt")) + list(prompts_dir.glob("*.md"))
-    print(f" Prompts trouvés: {len(prompt_files)} fichiers")
-    
-    if not prompt_files:
-        print(" Aucun fichier de prompt trouvé")
-        return True  # Pas critique mais étrange
-    
-    # 1. Vérifier chaque prompt
-    issues = []
-    warnings = []
-    
-    for prompt_file in prompt_files:
-        try:
-            with open(prompt_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            file_issues = []
-            file_warnings = []
-            
-            # Vérification sécurité
-            dangerous_patterns = [
-                (r'api_key\s*=', "Variable API_KEY détectée"),
-                (r'sk-[a-zA-Z0-9]{20,}', "Clé API OpenAI format"),
-                (r'AIza[0-9A-Za-z\-_]{35}', "Clé API Google format"),
-                (r'password\s*=', "Mot de passe en clair"),
-                (r'secret\s*=', "Secret en clair")
-            ]
-            
-            for pattern, message in dangerous_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    file_issues.append(f"{message} dans {prompt_file.name}")
-            
-            # Vérification qualité
-            if len(content.strip()) < 50:
-                file_warnings.append(f"Prompt très court ({len(content)} caractères)")
-            
-            if len(content) > 10000:
-                file_warnings.append(f"Prompt très long ({len(content)} caractères)")
-            
-            # Vérifier la structure
-            if "ROLE:" not in content and "You are" not in content:
-                file_warnings.append("Structure ROLE:/You are manquante")
-            
-            if "TASK:" not in content and "Your task" not in content:
-                file_warnings.append("Structure TASK:/Your task manquante")
-            
-            # Collecter
-            if file_issues:
-                issues.extend(file_issues)
-            if file_warnings:
-                warnings.extend([f"{prompt_file.name}: {w}" for w in file_warnings])
-            
-            print(f"    {prompt_file.name}: {len(content)} caractères")
-            
-        except Exception as e:
-            print(f"  Erreur lecture {prompt_file.name}: {e}")
-            issues.append(f"Erreur lecture {prompt_file.name}")
-    
-    # 2. Afficher les résultats
-    if issues:
-        print("\n PROBLÈMES CRITIQUES (sécurité):")
-        for issue in issues:
-            print(f"  {issue}")
-    
-    if warnings:
-        print("\nAVERTISSEMENTS (qualité):")
-        for warning in warnings[:5]:  # Limiter l'affichage
-            print(f"   • {warning}")
-        if len(warnings) > 5:
-            print(f"   ... et {len(warnings) - 5} avertissements supplémentaires")
-    
-    # 3. Vérifier la cohérence avec les logs
-    print("\nVÉRIFICATION COHÉRENCE LOGS:")
-    
-    logs_file = Path(__file__).parent.parent.parent / "logs" / "experiment_data.json"
-    if logs_file.exists():
-        try:
-            import json
-            with open(logs_file, 'r', encoding='utf-8') as f:
-                logs = json.load(f)
-            
-            # Extraire les prompts utilisés dans les logs
-            used_prompts = set()
-            for log in logs:
-                details = log.get('details', {})
-                prompt = details.get('input_prompt', '')
-                if prompt and len(prompt) > 20:
-                    # Prendre les premiers 50 caractères comme signature
-                    signature = prompt[:50].replace('\n', ' ').strip()
-                    if signature:
-                        used_prompts.add(signature)
-            
-            print(f"   Prompts uniques dans les logs: {len(used_prompts)}")
-            
-        except Exception:
-            print("  Impossible d'analyser les logs")
-    else:
-        print(" Fichier de logs introuvable")
-    
-    print("\n" + "="*60)
-    
-    if not issues:
-        print("PROMPTS VALIDÉS (sécurité OK)")
-        return True
-    else:
-        print(" PROMPTS NON VALIDÉS - Données sensibles détectées")
-        return False
+    return run_checker(PromptsLogChecker())
 
 def check_prompt_consistency():
     """Vérifie que les prompts sont cohérents entre les agents"""
@@ -4,142 +4,162 @@
 
 import json
 import ast
+import sys
 from pathlib import Path
 
-def check_tools_log():
-    """Vérifie que tous les outils utilisent correctement le logger"""
-    
-    current_file = Path(__file__)
-    project_root = current_file.parent.parent.parent
-    LOG_FILE = project_root / "logs" / "experiment_data.json"
-    
-    print("\n" + "="*60)
-    print("VÉRIFICATION DES OUTILS - Data Officer")
-    print("="*60)
-    
-    # 1. Vérifier les fichiers outils
-    toolsDir = project_root / "src" / "tools"
-    if not toolsDir.exists():
-        print("Dossier tools/ introuvable")
-        return False
-    
-    toolsFiles = list(toolsDir.glob("*.py"))
-    print(f"Outils trouvés: {len(toolsFiles)} fichiers")
-    
-    for tool_file in toolsFiles:
-        print(f"{tool_file.name}")
-    
-    # 2. Analyser chaque outil
-    tools_with_logger = []
-    tools_not_logger = []
-    
-    for tool_file in toolsFiles:
-        try:
-            with open(tool_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Vérifier si le fichier importe le logger ou log_experiment - logger import or log_experiment call
-            logger_import_exists = any(phrase in content for phrase in [
-                "from src.utils.logger import",
-                "import logger",
-                "log_experiment"
-            ])
-            
-            # Vérifier si le fichier appelle log_experiment - call to log_experiment
-            call_log_experiment = "log_experiment(" in content
-            
-            if logger_import_exists and call_log_experiment:
-                tools_with_logger.append(tool_file.name)
-            else:
-                tools_not_logger.append(tool_file.name)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.log_scan import LogChecker, run_checker
+
+class ToolsLogChecker(LogChecker):
+    """Analyse des outils ; les logs 'outils' sont relevés pendant le parcours unique (cf. log_scan)"""
+
+    tool_words = ['tool', 'pytest', 'pylint', 'linter', 'tester']
+
+    def __init__(self):
+        super().__init__()
+        self.tool_count = 0
+        self.examples = []
+
+    def visit(self, log):
+        # Chercher les logs des outils  - Look for tool logs
+        agent = log.get('agent', log.get('agent_name', ''))
+        if any(tool_word in agent.lower() for tool_word in self.tool_words):
+            self.tool_count += 1
+            if len(self.examples) < 3:
+                self.examples.append(log)
+
+    def merge(self, other):
+        self.tool_count += other.tool_count
+        self.examples = (self.examples + other.examples)[:3]
+
+    def report(self, scan):
+        current_file = Path(__file__)
+        project_root = current_file.parent.parent.parent
+        
+        print("\n" + "="*60)
+        print("VÉRIFICATION DES OUTILS - Data Officer")
+        print("="*60)
+        
+        # 1. Vérifier les fichiers outils
+        toolsDir = project_root / "src" / "tools"
+        if not toolsDir.exists():
+            print("Dossier tools/ introuvable")
+            return False
+        
+        toolsFiles = list(toolsDir.glob("*.py"))
+        print(f"Outils trouvés: {len(toolsFiles)} fichiers")
+        
+        for tool_file in toolsFiles:
+            print(f"{tool_file.name}")
+        
+        # 2. Analyser chaque outil
+        tools_with_logger = []
+        tools_not_logger = []
+        
+        for tool_file in toolsFiles:
+            try:
+                with open(tool_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
                 
-        except Exception as e:
-            print(f"Erreur lecture {tool_file.name}: {e}")
-    
-    # 3. Afficher les résultats de l'analyse des outils - Display results of tool analysis 
-    print("\nOUTILS AVEC LOGGER:")
-    if tools_with_logger:
-        for tool in tools_with_logger:
-            print(f" {tool}")
-    else:
-        print("   Aucun outil n'utilise le logger")
-    
-    if tools_not_logger:
-        print("\nOUTILS SANS LOGGER (CRITIQUE):")
-        for tool in tools_not_logger:
-            print(f"   X {tool}")
+                # Vérifier si le fichier importe le logger ou log_experiment - logger import or log_experiment call
+                logger_import_exists = any(phrase in content for phrase in [
+                    "from src.utils.logger import",
+                    "import logger",
+                    "log_experiment"
+                ])
+                
+                # Vérifier si le fichier appelle log_experiment - call to log_experiment
+                call_log_experiment = "log_experiment(" in content
+                
+                if logger_import_exists and call_log_experiment:
+                    tools_with_logger.append(tool_file.name)
+                else:
+                    tools_not_logger.append(tool_file.name)
+                    
+            except Exception as e:
+                print(f"Erreur lecture {tool_file.name}: {e}")
         
-        print("\n RECOMMANDATION:")
-        print("   Les outils qui appellent des LLM DEVRAIENT logguer.")
-        print("   Exemple: Si pylint_tool.py utilise un LLM pour l'analyse,")
-        print("   il devrait appeler log_experiment().")
-    
-    # 4. Vérifier dans les logs existants - Check existing logs
-    print("\nANALYSE DES LOGS EXISTANTS:")
-    
-    if LOG_FILE.exists():
-        try:
-            with open(LOG_FILE, 'r', encoding='utf-8') as f:
-                logs = json.load(f)
-            
-            # Chercher les logs des outils  - Look for tool logs
-            tool_logs = []
-            for log in logs:
-                agent = log.get('agent', log.get('agent_name', ''))
-                if any(tool_word in agent.lower() for tool_word in ['tool', 'pytest', 'pylint', 'linter', 'tester']):
-                    tool_logs.append(log)
-            
-            print(f"   Logs 'outils' détectés: {len(tool_logs)}")
-            
-            if tool_logs:
-                print("   Exemples d'agents outils:")
-                for log in tool_logs[:3]:
-                    print(f"   - {log.get('agent', 'N/A')}: {log.get('action', 'N/A')}")
-            else:
-                print(" Aucun log spécifique 'outil' trouvé")
-                print("   (Normal si les outils n'appellent pas de LLM)")
+        # 3. Afficher les résultats de l'analyse des outils - Display results of tool analysis 
+        print("\nOUTILS AVEC LOGGER:")
+        if tools_with_logger:
+            for tool in tools_with_logger:
+                print(f" {tool}")
+        else:
+            print("   Aucun outil n'utilise le logger")
         
-        except Exception as e:
-            print(f"Impossible d'analyser les logs: {e}")
-    else:
-        print("  Aucun fichier de logs existant")
-    
-    # 5. Vérification spécifique de VOS outils - Specific check for YOUR tools
-    print("\n ANALYSE DE VOS OUTILS SPÉCIFIQUES:")
-    
-    your_tools = {
-        "file_operations.py": "Ne devrait pas loguer (pas de LLM)",
-        "pylint_tool.py": "Devrait loguer si utilise LLM",
-        "pytest_tool.py": "Devrait loguer si utilise LLM"
-    }
-    
-    for tool_name, recommendation in your_tools.items():
-        tool_path = toolsDir / tool_name
-        if tool_path.exists():
-            with open(tool_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Vérifier si l'outil utilise un LLM
-            has_llm = any(keyword in content for keyword in [
-                "ChatGroq", "ChatOpenAI", "llm", "LLM", "model", "api_key"
-            ])
+        if tools_not_logger:
+            print("\nOUTILS SANS LOGGER (CRITIQUE):")
+            for tool in tools_not_logger:
+                print(f"   X {tool}")
             
-            if has_llm:
-                print(f" {tool_name}: Utilise un LLM → {recommendation}")
+            print("\n RECOMMANDATION:")
+            print("   Les outils qui appellent des LLM DEVRAIENT logguer.")
+            print("   Exemple: Si pylint_tool.py utilise un LLM pour l'analyse,")
+            print("   il devrait appeler log_experiment().")
+        
+        # 4. Vérifier dans les logs existants - Check existing logs
+        print("\nANALYSE DES LOGS EXISTANTS:")
+        
+        if scan.exists:
+            error = scan.error or self.failure
+            if error is not None:
+                print(f"Impossible d'analyser les logs: {error}")
             else:
-                print(f" {tool_name}: Pas de LLM → OK sans logging")
-    
-    print("\n" + "="*60)
-    
-    # Critère de succès final - Final success criteria
-    # Si aucun outil n'utilise de LLM, c'est OK - if no tools use LLM, it's OK
-    # Si des outils utilisent des LLM mais ne loguent pas, c'est un problème - if tools use LLM but don't log, it's an issue
-    if not tools_not_logger or len(tools_with_logger) > 0:
-        print(" OUTILS - LOGGING VALIDÉ (ou non nécessaire) ")
-        return True
-    else:
-        print(" OUTILS - LOGGING RECOMMANDÉ POUR LES LLM UTILISANT DES OUTILS  ")
-        return True  # Pas critique, mais recommandé
+                print(f"   Logs 'outils' détectés: {self.tool_count}")
+                
+                if self.tool_count:
+                    print("   Exemples d'agents outils:")
+                    for log in self.examples:
+                        print(f"   - {log.get('agent', 'N/A')}: {log.get('action', 'N/A')}")
+                else:
+                    print(" Aucun log spécifique 'outil' trouvé")
+                    print("   (Normal si les outils n'appellent pas de LLM)")
+        else:
+            print("  Aucun fichier de logs existant")
+        
+        # 5. Vérification spécifique de VOS outils - Specific check for YOUR tools
+        print("\n ANALYSE DE VOS OUTILS SPÉCIFIQUES:")
+        
+        your_tools = {
+            "file_operations.py": "Ne devrait pas loguer (pas de LLM)",
+            "pylint_tool.py": "Devrait loguer si utilise LLM",
+            "pytest_tool.py": "Devrait loguer si utilise LLM"
+        }
+        
+        for tool_name, recommendation in your_tools.items():
+            tool_path = toolsDir / tool_name
+            if tool_path.exists():
+                with open(tool_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Vérifier si l'outil utilise un LLM
+                has_llm = any(keyword in content for keyword in [
+                    "ChatGroq", "ChatOpenAI", "llm", "LLM", "model", "api_key"
+                ])
+                
+                if has_llm:
+                    print(f" {tool_name}: Utilise un LLM → {recommendation}")
+                else:
+                    print(f" {tool_name}: Pas de LLM → OK sans logging")
+        
+        print("\n" + "="*60)
+        
+        # Critère de succès final - Final success criteria
+        # Si aucun outil n'utilise de LLM, c'est OK - if no tools use LLM, it's OK
+        # Si des outils utilisent des LLM mais ne loguent pas, c'est un problème - if tools use LLM but don't log, it's an issue
+        if not tools_not_logger or len(tools_with_logger) > 0:
+            print(" OUTILS - LOGGING VALIDÉ (ou non nécessaire) ")
+            return True
+        else:
+            print(" OUTILS - LOGGING RECOMMANDÉ POUR LES LLM UTILISANT DES OUTILS  ")
+            return True  # Pas critique, mais recommandé
+
+def check_tools_log():
+    """Vérifie que tous les outils utilisent correctement le logger"""
+    return run_checker(ToolsLogChecker())
 
 def check_tool_imports():
     """Vérifie que les outils n'ont pas d'imports dangereux"""
@@ -0,0 +1,355 @@
+"""
+Export colonnaire des logs (Parquet / Feather) - Data Officer
+
+Aplati le schéma de log_experiment() en deux tables :
+  - entries : une ligne par entrée, champs scalaires de 'details' en colonnes
+              (pylint_score, issues_detected, code_length_before/after, ...)
+  - prompts : input_prompt / output_response, à part pour garder 'entries' léger
+
+L'export est incrémental : seules les entrées ajoutées depuis le dernier export
+sont écrites, dans un nouveau fichier part-XXXXXX. state.json garde la position
+atteinte (segments scellés, fichier lu, octet, empreinte comme log_checkpoint) :
+l'export suivant reprend la lecture à cet octet, sans relire le début du journal.
+Journal réécrit, tronqué ou restauré : réexport complet. Les tableaux de bord et
+les checkers lisent ensuite le dossier avec load_analytics() (requêtes vectorisées).
+
+Les valeurs de 'details' au mauvais type (pylint_score: "N/A", issues_detected: 2.5,
+tests_generated: "yes") deviennent nulles plutôt que de faire échouer l'export.
+
+Usage:
+    python src/data_quality/export_analytics.py [--format parquet|feather] [--full]
+"""
+
+import json
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import log_store
+from src.utils.log_checkpoint import current_sources, read_fingerprint
+from src.utils.log_stream import LogReader
+from src.utils.prompt_store import rehydrate_prompts
+
+# Colonnes scalaires extraites de 'details' (type pandas fixé pour que tous les
+# fichiers part-XXXXXX aient le même schéma)
+DETAIL_COLUMNS = {
+    "file_analyzed": "string",
+    "file_fixed": "string",
+    "file_evaluated": "string",
+    "module_name": "string",
+    "issues_detected": "Int64",
+    "issues_count": "Int64",
+    "code_length_before": "Int64",
+    "code_length_after": "Int64",
+    "tests_detected": "Int64",
+    "pylint_score": "Float64",
+    "pytest_passed": "boolean",
+    "tests_generated": "boolean",
+}
+ENTRY_COLUMNS = {
+    "seq": "int64",
+    "id": "string",
+    "timestamp": "datetime64[ns]",
+    "agent": "string",
+    "model": "string",
+    "action": "string",
+    "status": "string",
+    "file_path": "string",
+    "prompt_length": "Int64",
+    "response_length": "Int64",
+    "errors_count": "Int64",
+    **DETAIL_COLUMNS,
+}
+PROMPT_COLUMNS = {
+    "seq": "int64",
+    "id": "string",
+    "input_prompt": "string",
+    "output_response": "string",
+}
+FILE_FIELDS = ("file_analyzed", "file_fixed", "file_evaluated")
+# Valeurs acceptées pour les colonnes booléennes (les autres deviennent nulles)
+BOOLEAN_VALUES = {
+    True: True, False: False, 1: True, 0: False,
+    "true": True, "false": False, "yes": True, "no": False, "1": True, "0": False,
+}
+STATE_VERSION = 2
+EXTENSIONS = {"parquet": ".parquet", "feather": ".feather"}
+
+
+def get_analytics_dir() -> Path:
+    return log_store.LOGS_DIR / "analytics"
+
+
+def _flatten(seq: int, entry: dict):
+    details = entry.get("details") if isinstance(entry.get("details"), dict) else {}
+    # Les anciens logs (generate_test_logs) utilisent 'agent_name' / 'model_used'
+    row = {
+        "seq": seq,
+        "id": entry.get("id"),
+        "timestamp": entry.get("timestamp"),
+        "agent": entry.get("agent", entry.get("agent_name")),
+        "model": entry.get("model", entry.get("model_used")),
+        "action": entry.get("action"),
+        "status": entry.get("status"),
+        "file_path": next((details[f] for f in FILE_FIELDS if f in details), None),
+        "prompt_length": len(str(details["input_prompt"])) if "input_prompt" in details else None,
+        "response_length": len(str(details["output_response"])) if "output_response" in details else None,
+        "errors_count": len(details["errors"]) if isinstance(details.get("errors"), list) else None,
+    }
+    for column in DETAIL_COLUMNS:
+        value = details.get(column)
+        row[column] = value if isinstance(value, (str, int, float, bool)) else None
+    prompt = {
+        "seq": seq,
+        "id": entry.get("id"),
+        "input_prompt": _as_text(details.get("input_prompt")),
+        "output_response": _as_text(details.get("output_response")),
+    }
+    return row, prompt
+
+
+def _as_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _as_boolean(value):
+    if isinstance(value, str):
+        value = value.strip().lower()
+    try:
+        return BOOLEAN_VALUES.get(value)
+    except TypeError:
+        return None  # valeur non hachable
+
+
+def _coerce(values: pd.Series, dtype: str) -> pd.Series:
+    """Convertit une colonne au type `dtype` ; les valeurs incompatibles deviennent nulles."""
+    if dtype.startswith("datetime"):
+        # Horodatages ISO, avec ou sans 'Z' : normalisés en UTC naïf
+        return pd.to_datetime(values, errors="coerce", utc=True).dt.tz_localize(None)
+    if dtype == "boolean":
+        return values.map(_as_boolean, na_action="ignore").astype("boolean")
+    if dtype in ("Int64", "Float64"):
+        # Les booléens ne sont pas des nombres ici (True ne vaut pas un score de 1)
+        values = values.where(~values.map(lambda value: isinstance(value, bool)))
+        numbers = pd.to_numeric(values, errors="coerce")
+        if dtype == "Int64":
+            numbers = numbers.where(numbers.isna() | (numbers % 1 == 0))  # 2.5 n'est pas un compte
+        return numbers.astype(dtype)
+    return values.astype(dtype)
+
+
+def _frame(rows: list, columns: dict) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows, columns=list(columns))
+    for column, dtype in columns.items():
+        frame[column] = _coerce(frame[column], dtype)
+    return frame
+
+
+def _write(frame: pd.DataFrame, path: Path, fmt: str):
+    tmp_path = path.with_name(path.name + ".tmp")
+    if fmt == "feather":
+        frame.reset_index(drop=True).to_feather(tmp_path)
+    else:
+        frame.to_parquet(tmp_path, index=False)
+    tmp_path.replace(path)
+
+
+def _read_state(state_path: Path) -> dict:
+    if not state_path.exists():
+        return {}
+    with open(state_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _pending_sources(state: dict):
+    """
+    Ce qu'il reste à exporter d'après state.json.
+
+    Returns:
+        tuple: (fichiers à lire dans l'ordre, position de reprise dans le premier),
+               ou None si le journal a changé depuis (réexport complet).
+    """
+    sources = current_sources()
+    if sources is None or state.get("version") != STATE_VERSION:
+        return None
+    done, segments = state["segments"], sources["segments"]
+    if segments[:len(done)] != done:
+        return None  # segments remplacés (restauration)
+    if len(segments) == len(done):
+        if sources["active"] != state["source"]:
+            return None  # format du journal changé (migration)
+        resumed = log_store.find_log_file()
+        files = [resumed]
+    else:
+        # Rotation depuis le dernier export : le fichier lu a été scellé dans le segment suivant
+        resumed = log_store.SEGMENTS_DIR / segments[len(done)]
+        files = [resumed] + [log_store.SEGMENTS_DIR / name for name in segments[len(done) + 1:]]
+        files.append(log_store.find_log_file())
+    if read_fingerprint(resumed, state["offset"]) != state["fingerprint"]:
+        return None  # début du fichier réécrit ou tronqué
+    return files, state["offset"]
+
+
+def export_is_current(output_dir=None) -> bool:
+    """
+    True si l'export contient déjà tout le journal, d'après state.json seul.
+
+    Aucune entrée n'est lue : seulement l'empreinte et la taille du fichier
+    actif (au plus quelques octets après la position exportée, la fin "]" d'un
+    tableau JSON).
+    """
+    output_dir = Path(output_dir) if output_dir else get_analytics_dir()
+    state = _read_state(output_dir / "state.json")
+    try:
+        pending = _pending_sources(state) if "offset" in state else None
+    except (OSError, KeyError, TypeError):
+        return False
+    if pending is None:
+        return False
+    files, offset = pending
+    if len(files) > 1:
+        return False  # rotation depuis l'export
+    if not files[0].exists():
+        return offset == 0
+    remaining = files[0].stat().st_size - offset
+    if remaining > 64:
+        return False
+    with open(files[0], "rb") as f:
+        f.seek(offset)
+        return not f.read().strip(b" \t\r\n]")
+
+
+def export_analytics(fmt: str = "parquet", full: bool = False, batch_size: int = 50_000,
+                     output_dir=None) -> int:
+    """
+    Exporte les nouvelles entrées du journal en fichiers colonnaires.
+
+    Args:
+        fmt (str): "parquet" ou "feather".
+        full (bool): Ignore l'état et réexporte tout l'historique.
+        batch_size (int): Entrées max par fichier part (borne la mémoire).
+        output_dir (Path): Dossier de sortie (par défaut logs/analytics).
+
+    Returns:
+        int: Nombre d'entrées exportées lors de cet appel.
+    """
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Format d'export invalide : '{fmt}'. Utilisez 'parquet' ou 'feather'.")
+    output_dir = Path(output_dir) if output_dir else get_analytics_dir()
+    state_path = output_dir / "state.json"
+    state = {} if full else _read_state(state_path)
+    if state.get("format", fmt) != fmt:
+        state = {}
+
+    pending = None
+    if state.get("exported"):
+        try:
+            pending = _pending_sources(state)
+        except (OSError, KeyError, TypeError):
+            pending = None  # état illisible
+        if pending is None:
+            print(" Journal modifié depuis le dernier export : réexport complet")
+            state = {}
+    if pending is None:
+        pending = log_store.log_sources(), 0
+        for table in ("entries", "prompts"):
+            shutil.rmtree(output_dir / table, ignore_errors=True)
+    for table in ("entries", "prompts"):
+        (output_dir / table).mkdir(parents=True, exist_ok=True)
+
+    already = state.get("exported", 0)
+    part = state.get("parts", 0)
+    seq = already
+    rows, prompts = [], []
+
+    def flush():
+        nonlocal part, rows, prompts
+        if not rows:
+            return
+        part += 1
+        name = f"part-{part:06d}{EXTENSIONS[fmt]}"
+        _write(_frame(rows, ENTRY_COLUMNS), output_dir / "entries" / name, fmt)
+        _write(_frame(prompts, PROMPT_COLUMNS), output_dir / "prompts" / name, fmt)
+        rows, prompts = [], []
+
+    files, offset = pending
+    # Rotation pendant la lecture (sources différentes à la fin) : pas de point de reprise
+    sources = current_sources()
+    reader = None
+    for index, path in enumerate(files):
+        if not path.exists():
+            continue
+        reader = LogReader(path, log_store.detect_log_format(path), start_offset=offset if index == 0 else 0)
+        for entry in reader:
+            row, prompt = _flatten(seq, rehydrate_prompts(entry))
+            rows.append(row)
+            prompts.append(prompt)
+            seq += 1
+            if len(rows) >= batch_size:
+                flush()
+    flush()
+
+    state = {
+        "version": STATE_VERSION,
+        "format": fmt,
+        "exported": seq,
+        "parts": part,
+        "updated_at": datetime.now().isoformat(),
+    }
+    if sources is not None and current_sources() == sources:
+        # Position atteinte dans le fichier actif (0 s'il n'a pas été lu) : point de reprise du prochain export
+        active = log_store.find_log_file()
+        offset = reader.offset if reader is not None and reader.path == active else 0
+        state.update(segments=sources["segments"], source=active.name, offset=offset,
+                     fingerprint=read_fingerprint(active, offset))
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4)
+    tmp_path.replace(state_path)
+    return seq - already
+
+
+def load_analytics(table: str = "entries", columns: list = None, input_dir=None,
+                   dtype_backend: str = None) -> pd.DataFrame:
+    """
+    Charge une table exportée ("entries" ou "prompts") en un seul DataFrame.
+
+    dtype_backend="pyarrow" garde les colonnes au format Arrow (pas de conversion
+    des chaînes en objets Python : plus rapide pour les calculs vectorisés).
+    """
+    input_dir = Path(input_dir) if input_dir else get_analytics_dir()
+    state = _read_state(input_dir / "state.json")
+    fmt = state.get("format", "parquet")
+    files = sorted((input_dir / table).glob(f"part-*{EXTENSIONS[fmt]}"))
+    if not files:
+        return pd.DataFrame(columns=columns or list(ENTRY_COLUMNS if table == "entries" else PROMPT_COLUMNS))
+    options = {"columns": columns}
+    if dtype_backend:
+        options["dtype_backend"] = dtype_backend
+    if fmt == "feather":
+        frames = [pd.read_feather(f, **options) for f in files]
+    else:
+        frames = [pd.read_parquet(f, **options) for f in files]
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export colonnaire des logs d'expériences")
+    parser.add_argument("--format", choices=sorted(EXTENSIONS), default="parquet")
+    parser.add_argument("--full", action="store_true", help="réexporte tout l'historique")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    exported = export_analytics(args.format, full=args.full, batch_size=args.batch_size)
+    print(f" {exported} nouvelles entrées exportées dans {get_analytics_dir()}")
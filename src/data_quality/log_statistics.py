@@ -0,0 +1,207 @@
+"""
+Statistiques vectorisées des logs - Data Officer
+
+Calcule en quelques opérations pandas/NumPy, sur l'export colonnaire du journal
+(export_analytics, table 'entries'), les statistiques que les checkers
+accumulent entrée par entrée, et d'autres trop coûteuses en boucle Python :
+  - répartition par agent, par action et par statut
+  - champs input_prompt / output_response manquants ou trop courts
+  - percentiles des longueurs de prompts et de réponses
+  - taux d'échec par agent
+  - nombre d'itérations par fichier (entrées, corrections FIX, échecs)
+
+Portée : ce module est un rapport à part (check_all_agents.py --stats ou
+directement ci-dessous) ; check_all_agents et validate_log gardent leurs
+compteurs par entrée, qui font partie de leur parcours partagé et incrémental
+(points de reprise) et fonctionnent sans pandas. Leurs chiffres peuvent
+différer de ceux-ci :
+  - agent : l'export prend 'agent', sinon 'agent_name' (anciens logs), alors
+    que check_all_agents ne lit que 'agent' et validate_log que 'agent_name',
+    chacun comptant les autres entrées en UNKNOWN ;
+  - fichiers : chemins normalisés ("./sandbox\\x.py" et "sandbox/x.py" ne font
+    qu'un).
+
+Usage:
+    python src/data_quality/log_statistics.py [--refresh | --no-refresh] [--top 10]
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data_quality.export_analytics import export_analytics, export_is_current, load_analytics
+
+PERCENTILES = [50, 90, 95, 99]
+FAILURE_STATUSES = ["FAILURE", "ERROR"]
+SHORT_TEXT = 10  # même seuil que validate_log / check_all_agents
+COLUMNS = ["agent", "action", "status", "file_path", "prompt_length", "response_length"]
+
+
+def _factorize(column: pd.Series, missing=None, normalize=None):
+    """
+    Codes entiers d'une colonne texte, dans l'ordre de première apparition.
+
+    Les calculs se font ensuite sur les codes (np.bincount) plutôt que sur les
+    chaînes ; `normalize` ne s'applique qu'aux valeurs distinctes.
+
+    Args:
+        column (pd.Series): Colonne texte (valeurs manquantes possibles).
+        missing (str): Libellé des valeurs manquantes (None = code -1, ignorées).
+        normalize: Fonction appliquée à chaque valeur distincte ; des valeurs
+            devenues égales partagent ensuite le même code.
+
+    Returns:
+        tuple: (codes np.ndarray, libellés np.ndarray)
+    """
+    codes, uniques = column.array.factorize(use_na_sentinel=False)
+    labels = [missing if pd.isna(value) else value for value in uniques]
+    if normalize is not None:
+        labels = [None if label is None else normalize(label) for label in labels]
+    # Regroupe les libellés identiques (ex: manquant et "UNKNOWN" déjà présent)
+    label_codes, merged = pd.factorize(np.array(labels, dtype=object))
+    return label_codes[codes], merged
+
+
+def _normalize_path(path: str) -> str:
+    # Le Judge loggue "./sandbox\x.py", le Fixer "sandbox\x.py"
+    return path.replace("\\", "/").removeprefix("./")
+
+
+def _percentiles(lengths: np.ndarray) -> pd.Series:
+    values = lengths[~np.isnan(lengths)]
+    if not len(values):
+        return pd.Series(np.nan, index=PERCENTILES, dtype="float64")
+    return pd.Series(np.percentile(values, PERCENTILES), index=PERCENTILES)
+
+
+def compute_log_statistics(frame: pd.DataFrame = None, refresh: bool = None) -> dict:
+    """
+    Calcule les statistiques du journal sur des colonnes (aucune boucle par entrée).
+
+    Les agents sont ceux de l'export ('agent', sinon 'agent_name') : la
+    répartition ne reprend pas les UNKNOWN de check_all_agents / validate_log
+    (voir l'en-tête du module).
+
+    Args:
+        frame (pd.DataFrame): Table 'entries' de export_analytics (au moins les
+            colonnes de COLUMNS). Par défaut, chargée depuis logs/analytics.
+        refresh (bool): Quand `frame` n'est pas fourni, exporte d'abord les
+            nouvelles entrées du journal (export incrémental). None = seulement
+            si l'export est en retard sur le journal (export_is_current) ;
+            sinon les fichiers colonnaires existants sont lus directement.
+
+    Returns:
+        dict: entries, agents, actions, statuses (pd.Series), missing_prompts,
+              missing_responses, short_prompts, short_responses (int),
+              prompt_percentiles, response_percentiles (pd.Series indexées par
+              percentile), failures_by_agent et iterations_by_file (pd.DataFrame).
+    """
+    if frame is None:
+        if refresh or (refresh is None and not export_is_current()):
+            export_analytics()
+        frame = load_analytics("entries", columns=COLUMNS, dtype_backend="pyarrow")
+
+    agent_codes, agents = _factorize(frame["agent"], missing="UNKNOWN")
+    action_codes, actions = _factorize(frame["action"], missing="UNKNOWN")
+    status_codes, statuses = _factorize(frame["status"], missing="UNKNOWN")
+    file_codes, files = _factorize(frame["file_path"], normalize=_normalize_path)
+    prompt_length = frame["prompt_length"].to_numpy(dtype=np.float64, na_value=np.nan)
+    response_length = frame["response_length"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    failed = np.isin(statuses, FAILURE_STATUSES)[status_codes]
+    fix = (actions == "FIX")[action_codes]
+
+    # Taux d'échec par agent
+    agent_entries = np.bincount(agent_codes, minlength=len(agents))
+    agent_failures = np.bincount(agent_codes, weights=failed, minlength=len(agents)).astype(np.int64)
+    failures_by_agent = pd.DataFrame({
+        "entries": agent_entries,
+        "failures": agent_failures,
+        "failure_rate": agent_failures / np.maximum(agent_entries, 1),
+    }, index=pd.Index(agents, name="agent"))
+
+    # Itérations par fichier : toutes les entrées, corrections (FIX), échecs et dernier statut
+    has_file = file_codes >= 0
+    positions = np.flatnonzero(has_file)
+    codes = file_codes[has_file]
+    # Dernière entrée de chaque fichier : première occurrence dans l'ordre inverse
+    _, last = np.unique(codes[::-1], return_index=True)
+    last_positions = positions[::-1][last]
+    iterations_by_file = pd.DataFrame({
+        "entries": np.bincount(codes, minlength=len(files)),
+        "fix_iterations": np.bincount(codes, weights=fix[has_file], minlength=len(files)).astype(np.int64),
+        "failures": np.bincount(codes, weights=failed[has_file], minlength=len(files)).astype(np.int64),
+        "last_status": statuses[status_codes[last_positions]],
+    }, index=pd.Index(files, name="file_path")).sort_values("entries", ascending=False, kind="stable")
+
+    return {
+        "entries": len(frame),
+        "agents": pd.Series(agent_entries, index=agents),
+        "actions": pd.Series(np.bincount(action_codes, minlength=len(actions)), index=actions),
+        "statuses": pd.Series(np.bincount(status_codes, minlength=len(statuses)), index=statuses),
+        "missing_prompts": int(np.isnan(prompt_length).sum()),
+        "missing_responses": int(np.isnan(response_length).sum()),
+        "short_prompts": int((prompt_length < SHORT_TEXT).sum()),
+        "short_responses": int((response_length < SHORT_TEXT).sum()),
+        "prompt_percentiles": _percentiles(prompt_length),
+        "response_percentiles": _percentiles(response_length),
+        "failures_by_agent": failures_by_agent,
+        "iterations_by_file": iterations_by_file,
+    }
+
+
+def print_log_statistics(stats: dict, top: int = 10):
+    """Affiche les statistiques calculées par compute_log_statistics()."""
+    total = stats["entries"]
+    print("\n" + "=" * 70)
+    print(" STATISTIQUES DU JOURNAL (vectorisées)")
+    print("=" * 70)
+    print(f" Entrées: {total}")
+    if not total:
+        return
+
+    for title, counts in (("Agents ('agent', sinon 'agent_name')", stats["agents"]), ("Actions", stats["actions"]),
+                          ("Statuts", stats["statuses"])):
+        print(f"\n {title}:")
+        for name, count in counts.items():
+            print(f"   {str(name):20} : {count}")
+
+    print("\n Champs obligatoires:")
+    print(f"   input_prompt manquant    : {stats['missing_prompts']}/{total}")
+    print(f"   output_response manquant : {stats['missing_responses']}/{total}")
+    print(f"   Prompts trop courts      : {stats['short_prompts']}/{total}")
+    print(f"   Réponses trop courtes    : {stats['short_responses']}/{total}")
+
+    print("\n Longueurs (caractères):")
+    print("   " + " " * 10 + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES))
+    for label, key in (("prompt", "prompt_percentiles"), ("réponse", "response_percentiles")):
+        print(f"   {label:10}" + "".join(f"{value:>10.0f}" for value in stats[key]))
+
+    print("\n Taux d'échec par agent:")
+    for agent, entries, failures, rate in stats["failures_by_agent"].itertuples():
+        print(f"   {str(agent):20} : {failures:>6}/{entries:<6} ({rate:.1%})")
+
+    by_file = stats["iterations_by_file"]
+    print(f"\n Itérations par fichier ({len(by_file)} fichiers, {min(top, len(by_file))} premiers):")
+    for file_path, entries, fixes, failures, last_status in by_file.head(top).itertuples():
+        print(f"   {file_path}: {entries} entrées, {fixes} FIX, {failures} échecs, dernier statut {last_status}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Statistiques vectorisées du journal d'expériences")
+    refresh = parser.add_mutually_exclusive_group()
+    refresh.add_argument("--refresh", action="store_true", default=None,
+                         help="exporte les nouvelles entrées même si l'export semble à jour")
+    refresh.add_argument("--no-refresh", dest="refresh", action="store_false",
+                         help="n'exporte pas les nouvelles entrées")
+    parser.add_argument("--top", type=int, default=10, help="nombre de fichiers affichés")
+    args = parser.parse_args()
+    print_log_statistics(compute_log_statistics(refresh=args.refresh), top=args.top)
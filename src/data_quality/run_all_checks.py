@@ -2,33 +2,61 @@
 # Exécution de toutes les vérifications 
 import sys
 import importlib.util
+import os
 from pathlib import Path
 
+# (module, fichier relatif à la racine, classe visiteur) - le journal est lu une
+# seule fois pour toutes ces vérifications (voir src/utils/log_scan.py)
+LOG_CHECKERS = [
+    ("validate_log", "src/utils/validate_log.py", "ValidateLogChecker"),
+    ("check_auditor_logs", "src/data_quality/check_auditor_logs.py", "AuditorLogChecker"),
+    ("check_fixer_logs", "src/data_quality/check_fixer_logs.py", "FixerLogChecker"),
+    ("check_judge_logs", "src/data_quality/check_judge_logs.py", "JudgeLogChecker"),
+    ("check_tools_log", "src/data_quality/check_tools_log.py", "ToolsLogChecker"),
+    ("check_prompts_log", "src/data_quality/check_prompts_log.py", "PromptsLogChecker"),
+    ("check_all_agents", "src/data_quality/check_all_agents.py", "AllAgentsLogChecker"),
+]
 
-def run_all_checks():
-    print("=" * 70)
-    print(" AUDIT COMPLET - DATA OFFICER")
-    print("=" * 70)
-    
-    # Ajouter le dossier courant au path pour les imports
-    current_dir = Path(__file__).parent
-    project_root = current_dir.parent.parent
-    sys.path.insert(0, str(project_root))
-    sys.path.insert(0, str(current_dir.parent))
-    
+
+def _load_checkers(project_root):
+    """
+    Charge les modules de vérification et instancie leurs checkers.
+
+    Returns:
+        dict: module_name -> (module, checker), ou l'exception levée au chargement
+              (ré-affichée dans la section correspondante). Absent si le fichier manque.
+    """
+    loaded = {}
+    for module_name, relative_path, class_name in LOG_CHECKERS:
+        module_path = project_root / relative_path
+        if not module_path.exists():
+            continue
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, str(module_path))
+            module_obj = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module_obj)
+            loaded[module_name] = (module_obj, getattr(module_obj, class_name)())
+        except Exception as e:
+            loaded[module_name] = e
+    return loaded
+
+
+def _get(loaded, module_name):
+    item = loaded[module_name]
+    if isinstance(item, Exception):
+        raise item
+    return item
+
+
+def _section_general(loaded, scan):
     results = {}
-    
-    # 1. Vérification des logs principaux
     print("\n1. VÉRIFICATION LOGS GÉNÉRAUX")
     print("-" * 40)
     try:
         # Essayer d'importer validate_log
-        validate_path = project_root / "src" / "utils" / "validate_log.py"
-        if validate_path.exists():
-            spec = importlib.util.spec_from_file_location("validate_log", str(validate_path))
-            validate_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(validate_module)
-            results["general_logs"] = validate_module.validate_log()
+        if "validate_log" in loaded:
+            _, checker = _get(loaded, "validate_log")
+            results["general_logs"] = checker.report(scan)
         else:
             print("  validate_log.py non trouvé.")
             from data_quality.check_all_agents import check_all_agents
@@ -36,8 +64,11 @@ def run_all_checks():
     except Exception as e:
         print(f"  Erreur: {e}")
         results["general_logs"] = False
-    
-    # 2. Vérification par agent
+    return results
+
+
+def _section_agents(loaded, scan):
+    results = {}
     print("\n2. VÉRIFICATION PAR AGENT")
     print("-" * 40)
     
@@ -49,14 +80,10 @@ def run_all_checks():
     
     for agent_name, module_name in checks:
         try:
-            module_path = current_dir / f"{module_name}.py"
-            if module_path.exists():
+            if module_name in loaded:
                 print(f"  Chargement {module_name}...")
-                spec = importlib.util.spec_from_file_location(module_name, str(module_path))
-                module_obj = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module_obj)
-                check_func = getattr(module_obj, module_name)
-                results[f"agent_{agent_name.lower()}"] = check_func()
+                _, checker = _get(loaded, module_name)
+                results[f"agent_{agent_name.lower()}"] = checker.report(scan)
                 print(f"  {agent_name}: Test terminé")
             else:
                 print(f"   {agent_name}: Fichier {module_name}.py non trouvé")
@@ -64,17 +91,17 @@ def run_all_checks():
         except Exception as e:
             print(f"  {agent_name}: Erreur - {str(e)[:100]}")
             results[f"agent_{agent_name.lower()}"] = False
-    
-    # 3. Vérification outils
+    return results
+
+
+def _section_tools(loaded, scan):
+    results = {}
     print("\n3. VÉRIFICATION OUTILS")
     print("-" * 40)
     try:
-        tools_path = current_dir / "check_tools_log.py"
-        if tools_path.exists():
-            spec = importlib.util.spec_from_file_location("check_tools_log", str(tools_path))
-            tools_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(tools_module)
-            results["tools_logging"] = tools_module.check_tools_log()
+        if "check_tools_log" in loaded:
+            tools_module, checker = _get(loaded, "check_tools_log")
+            results["tools_logging"] = checker.report(scan)
             results["tools_security"] = tools_module.check_tool_imports()
             print("  Vérification outils terminée")
         else:
@@ -85,17 +112,17 @@ def run_all_checks():
         print(f"   Erreur: {e}")
         results["tools_logging"] = False
         results["tools_security"] = False
-    
-    # 4. Vérification prompts
+    return results
+
+
+def _section_prompts(loaded, scan):
+    results = {}
     print("\n4. VÉRIFICATION PROMPTS")
     print("-" * 40)
     try:
-        prompts_path = current_dir / "check_prompts_log.py"
-        if prompts_path.exists():
-            spec = importlib.util.spec_from_file_location("check_prompts_log", str(prompts_path))
-            prompts_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(prompts_module)
-            results["prompts_security"] = prompts_module.check_prompts_log()
+        if "check_prompts_log" in loaded:
+            prompts_module, checker = _get(loaded, "check_prompts_log")
+            results["prompts_security"] = checker.report(scan)
             results["prompts_consistency"] = prompts_module.check_prompt_consistency()
             print("  ✓ Vérification prompts terminée")
         else:
@@ -106,17 +133,17 @@ def run_all_checks():
         print(f"   Erreur: {e}")
         results["prompts_security"] = False
         results["prompts_consistency"] = False
-    
-    # 5. Vérification complète système
+    return results
+
+
+def _section_system(loaded, scan):
+    results = {}
     print("\n5. VÉRIFICATION COMPLÈTE SYSTÈME")
     print("-" * 40)
     try:
-        all_agents_path = current_dir / "check_all_agents.py"
-        if all_agents_path.exists():
-            spec = importlib.util.spec_from_file_location("check_all_agents", str(all_agents_path))
-            all_agents_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(all_agents_module)
-            results["complete_system"] = all_agents_module.check_all_agents_logs()
+        if "check_all_agents" in loaded:
+            _, checker = _get(loaded, "check_all_agents")
+            results["complete_system"] = checker.report(scan)
             print("  Vérification système terminée")
         else:
             print("  check_all_agents.py non trouvé")
@@ -124,6 +151,48 @@ def run_all_checks():
     except Exception as e:
         print(f"  Erreur: {e}")
         results["complete_system"] = False
+    return results
+
+
+# Sections du rapport, affichées dans cet ordre
+SECTIONS = [_section_general, _section_agents, _section_tools, _section_prompts, _section_system]
+
+
+def run_all_checks(full: bool = False, jobs: int = 1):
+    """
+    Exécute toutes les vérifications de qualité des données.
+
+    Args:
+        full (bool): Relit tout le journal au lieu des seules nouvelles entrées.
+        jobs (int): Nombre de processus (1 = séquentiel). Le journal est découpé
+            en plages lues en parallèle quand il doit être relu entièrement. Les
+            rapports n'affichent que l'état accumulé : ils restent séquentiels.
+
+    Returns:
+        bool: True si le score global est suffisant (code de sortie 0).
+    """
+    print("=" * 70)
+    print(" AUDIT COMPLET - DATA OFFICER")
+    print("=" * 70)
+    
+    # Ajouter le dossier courant au path pour les imports
+    current_dir = Path(__file__).parent
+    project_root = current_dir.parent.parent
+    sys.path.insert(0, str(project_root))
+    sys.path.insert(0, str(current_dir.parent))
+    
+    from src.utils.log_scan import scan_log
+
+    # 0. Un seul parcours du journal pour toutes les vérifications
+    # (seulement les nouvelles entrées si les points de reprise sont valables, sauf full=True)
+    loaded = _load_checkers(project_root)
+    scan = scan_log([item[1] for item in loaded.values() if not isinstance(item, Exception)],
+                    resume=not full, jobs=jobs)
+    
+    # 1. à 5. Rapports
+    results = {}
+    for section in SECTIONS:
+        results.update(section(loaded, scan))
     
     # 6. Résumé final
     print("\n" + "=" * 70)
@@ -185,5 +254,12 @@ def run_all_checks():
 
 
 if __name__ == "__main__":
-    success = run_all_checks()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Audit complet de la qualité des données")
+    parser.add_argument("--full", action="store_true", help="relit tout le journal (ignore les points de reprise)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="nombre de processus (0 = un par cœur)")
+    args = parser.parse_args()
+    success = run_all_checks(full=args.full, jobs=args.jobs or os.cpu_count() or 1)
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Sous-processus asyncio des variantes async des outils (run_pylint_async, run_pytest_async)
+
+Le processus lancé est chef de son groupe : au délai dépassé, ou à
+l'annulation de la tâche qui l'attend, le groupe entier est tué (processus
+lancés par l'outil compris) avant que l'erreur ne remonte. À la fin normale
+du processus, ceux qu'il a laissés derrière lui sont tués aussi.
+"""
+
+import asyncio
+import codecs
+import io
+import os
+import signal
+
+# Intervalle de vérification de la fin du processus
+EXIT_POLL_INTERVAL = 0.01
+
+
+async def _read(stream, sink, chunk_size: int = 65536) -> str:
+    """Lit un flux par morceaux dans `sink` (write / getvalue)."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            break
+        sink.write(decoder.decode(chunk))
+    sink.write(decoder.decode(b"", final=True))
+    return sink.getvalue()
+
+
+async def _exited(process):
+    """
+    Fin du processus lui-même : process.wait() attend aussi la fermeture de ses
+    tubes, que garde ouverts tout processus qu'il a laissé derrière lui.
+    """
+    while process.returncode is None:
+        await asyncio.sleep(EXIT_POLL_INTERVAL)
+
+
+def _kill_group(process):
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def run_process(command: list, timeout: float = None, sink=io.StringIO) -> tuple:
+    """
+    Lance `command` et attend sa fin sans bloquer la boucle d'événements.
+
+    Args:
+        command: Commande et arguments
+        timeout: Délai max en secondes (None = sans limite)
+        sink: Fabrique des tampons de sortie (write / getvalue), un par flux
+
+    Returns:
+        tuple: (code de sortie, stdout, stderr, délai dépassé)
+
+    Raises:
+        asyncio.CancelledError: tâche annulée, une fois le groupe de processus tué
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=hasattr(os, "killpg")  # groupe propre, tué en entier
+    )
+    readers = asyncio.gather(_read(process.stdout, sink()), _read(process.stderr, sink()))
+    timed_out = False
+    try:
+        try:
+            await asyncio.wait_for(_exited(process), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+        # Délai dépassé : tout le groupe ; sinon les processus laissés par l'outil, qui
+        # garderaient les tubes ouverts et bloqueraient la lecture
+        _kill_group(process)
+        await process.wait()
+        stdout, stderr = await readers
+    except BaseException:
+        # Annulation (ou erreur de lecture) : le groupe ne survit pas à la tâche
+        if process.returncode is None:
+            _kill_group(process)
+        readers.cancel()
+        await process.wait()
+        await asyncio.wait([readers])
+        if not readers.cancelled():
+            readers.exception()  # lue : pas d'avertissement "exception was never retrieved"
+        raise
+    return process.returncode, stdout, stderr, timed_out
@@ -0,0 +1,251 @@
+"""
+Gouverneur des exécutions d'outils (pylint, pytest) - une limite par type pour tout le processus
+
+Chaque type a son budget de places : "lint" (run_pylint, run_pylint_batch)
+et "test" (run_pytest). Par défaut, les cœurs disponibles sont partagés entre
+les deux types, et chaque budget est plafonné par la mémoire libre au
+démarrage (config.GOVERNOR_*). Une exécution prend une place le temps de son
+processus (slot / slot_async) ; au-delà du budget, les demandes attendent
+dans une file FIFO par type : premier arrivé, premier servi.
+
+Une place n'est accordée que si la mémoire disponible reste au-dessus de
+config.GOVERNOR_MEMORY_RESERVE_MB, sauf quand aucune exécution du type n'est
+en cours : une exécution à la fois est toujours possible.
+
+governor_stats() donne, par type : limite, exécutions en cours, profondeur de
+la file (actuelle et maximale) et temps d'attente (total, moyen, maximal).
+"""
+
+import asyncio
+import collections
+import contextlib
+import os
+import threading
+import time
+
+from src.utils import config
+
+KINDS = ("lint", "test")
+# Intervalle de réexamen d'une demande en attente (mémoire libérée sans fin d'exécution)
+RETRY_INTERVAL = 0.05
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def available_cores() -> int:
+    """Cœurs utilisables par ce processus (affinité CPU comprise)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def available_memory_mb():
+    """Mémoire disponible en Mo (MemAvailable sous Linux), None si inconnue."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class _Request:
+    """Une demande de `count` places, réveillée par `wake` quand elles sont accordées."""
+
+    __slots__ = ("count", "wake", "enqueued", "granted", "queued")
+
+    def __init__(self, count: int, wake):
+        self.count = count
+        self.wake = wake
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.queued = False  # n'a pas eu ses places dès la demande
+
+
+class _Budget:
+    def __init__(self, limit: int, process_mb: float):
+        self.limit = max(1, limit)
+        self.process_mb = process_mb
+        self.running = 0
+        self.queue = collections.deque()
+        self.max_queued = 0
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class Governor:
+    """
+    Budgets de places par type d'outil, files d'attente FIFO.
+
+    Args:
+        limits (dict): Type -> nombre maximal d'exécutions simultanées.
+        process_mb (dict): Type -> mémoire estimée d'une exécution (Mo).
+        reserve_mb (float): Mémoire à laisser libre pour accorder une place de plus.
+        memory: Fonction donnant la mémoire disponible en Mo (None si inconnue).
+    """
+
+    def __init__(self, limits: dict, process_mb: dict, reserve_mb: float = 0, memory=available_memory_mb):
+        self._lock = threading.Lock()
+        self._budgets = {kind: _Budget(limits[kind], process_mb.get(kind, 0)) for kind in limits}
+        self.reserve_mb = reserve_mb
+        self._memory = memory
+
+    def _memory_allows(self, budget: _Budget, count: int) -> bool:
+        if budget.running == 0:
+            return True
+        free = self._memory()
+        return free is None or free - self.reserve_mb >= budget.process_mb * count
+
+    def _dispatch(self, budget: _Budget):
+        """Sous self._lock : accorde leurs places aux demandes en tête de file, dans l'ordre."""
+        while budget.queue:
+            request = budget.queue[0]
+            if budget.running + request.count > budget.limit or not self._memory_allows(budget, request.count):
+                return
+            budget.queue.popleft()
+            budget.running += request.count
+            waited = time.monotonic() - request.enqueued
+            budget.acquired += 1
+            if request.queued:
+                budget.waited += 1
+                budget.total_wait += waited
+                budget.max_wait = max(budget.max_wait, waited)
+            request.granted = True
+            request.wake()
+
+    def _enqueue(self, kind: str, count: int, wake) -> _Request:
+        budget = self._budgets[kind]
+        # Jamais plus que le budget : une demande trop grosse attendrait indéfiniment
+        request = _Request(min(max(1, count), budget.limit), wake)
+        with self._lock:
+            budget.queue.append(request)
+            self._dispatch(budget)
+            request.queued = not request.granted
+            budget.max_queued = max(budget.max_queued, len(budget.queue))
+        return request
+
+    def _retry(self, kind: str):
+        with self._lock:
+            self._dispatch(self._budgets[kind])
+
+    def _release(self, kind: str, request: _Request):
+        budget = self._budgets[kind]
+        with self._lock:
+            if request.granted:
+                budget.running -= request.count
+            else:
+                budget.queue.remove(request)  # attente abandonnée (interruption, annulation)
+            self._dispatch(budget)
+
+    @contextlib.contextmanager
+    def slot(self, kind: str, count: int = 1):
+        """
+        Attend puis garde `count` places de `kind` (au plus la limite du type).
+
+        Yields:
+            int: Nombre de places accordées
+        """
+        granted = threading.Event()
+        request = self._enqueue(kind, count, granted.set)
+        try:
+            while not granted.wait(RETRY_INTERVAL):
+                self._retry(kind)
+            yield request.count
+        finally:
+            self._release(kind, request)
+
+    @contextlib.asynccontextmanager
+    async def slot_async(self, kind: str, count: int = 1):
+        """slot() sans bloquer la boucle d'événements ; annuler l'attente retire la demande de la file."""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+            except RuntimeError:
+                pass  # boucle fermée : personne n'attend plus
+
+        request = self._enqueue(kind, count, wake)
+        try:
+            while not granted.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(granted), RETRY_INTERVAL)
+                except asyncio.TimeoutError:
+                    self._retry(kind)
+            yield request.count
+        finally:
+            self._release(kind, request)
+
+    def limit(self, kind: str) -> int:
+        """Nombre maximal d'exécutions simultanées de `kind`."""
+        return self._budgets[kind].limit
+
+    def stats(self) -> dict:
+        """Par type : limite, en cours, file (actuelle, max), attentes (nombre, total / moyenne / max en secondes)."""
+        with self._lock:
+            return {kind: {
+                "limit": budget.limit,
+                "running": budget.running,
+                "queued": len(budget.queue),
+                "max_queued": budget.max_queued,
+                "acquired": budget.acquired,
+                "waited": budget.waited,
+                "total_wait": budget.total_wait,
+                "mean_wait": budget.total_wait / budget.waited if budget.waited else 0.0,
+                "max_wait": budget.max_wait,
+            } for kind, budget in self._budgets.items()}
+
+
+def _default_limits() -> dict:
+    """Limites de config.GOVERNOR_*_SLOTS, ou part des cœurs ; plafonnées par la mémoire libre."""
+    cores = available_cores()
+    shares = {"lint": max(1, cores // 2), "test": max(1, cores - cores // 2)}
+    configured = {"lint": config.GOVERNOR_LINT_SLOTS, "test": config.GOVERNOR_TEST_SLOTS}
+    process_mb = {"lint": config.GOVERNOR_LINT_PROCESS_MB, "test": config.GOVERNOR_TEST_PROCESS_MB}
+    free = available_memory_mb()
+    limits = {}
+    for kind in KINDS:
+        limit = configured[kind] or shares[kind]
+        if free is not None and process_mb[kind]:
+            limit = min(limit, int((free - config.GOVERNOR_MEMORY_RESERVE_MB) // process_mb[kind]))
+        limits[kind] = max(1, limit)
+    return limits
+
+
+def get_governor() -> Governor:
+    """Gouverneur du processus, créé à la première utilisation (config.GOVERNOR_*)."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = Governor(_default_limits(),
+                                 {"lint": config.GOVERNOR_LINT_PROCESS_MB, "test": config.GOVERNOR_TEST_PROCESS_MB},
+                                 config.GOVERNOR_MEMORY_RESERVE_MB)
+        return _governor
+
+
+def governor_stats() -> dict:
+    """Limites, profondeur des files et temps d'attente du gouverneur, par type."""
+    return get_governor().stats()
+
+
+def tool_slot(kind: str, count: int = 1):
+    """Place du gouverneur pour une exécution d'outil (accordée d'office sans config.GOVERNOR_ENABLED)."""
+    if not config.GOVERNOR_ENABLED:
+        return contextlib.nullcontext(count)
+    return get_governor().slot(kind, count)
+
+
+def tool_slot_async(kind: str, count: int = 1):
+    """tool_slot pour `async with`."""
+    if not config.GOVERNOR_ENABLED:
+        return contextlib.nullcontext(count)
+    return get_governor().slot_async(kind, count)
@@ -1,34 +1,650 @@
+import asyncio
+import io
+import json
+import os
 import subprocess
 import re
+import sysconfig
+import threading
 from pathlib import Path
 
+from src.tools.async_process import run_process
+from src.tools.governor import tool_slot, tool_slot_async
+from src.tools.result_cache import ResultCache, local_imports, make_key
+from src.utils import config
+
+SCORE_PATTERN = re.compile(r"rated at ([\d\.]+)/10")
+# Score section of the report; the "previous run" part depends on history, not on the code
+RATING_PATTERN = re.compile(r"^-+\n(Your code has been rated at ([\d\.]+)/10)(?: \(previous run: [^)\n]*\))?$",
+                            re.MULTILINE)
+# Default pylint module-rgx (snake_case): decides whether invalid-name is reported for the file name
+MODULE_NAME_PATTERN = re.compile(r"[^\W\dA-Z][^\WA-Z]*\Z")
+# Messages that only exist when several files are linted together (absent from a per-file run)
+SESSION_ONLY_MESSAGES = ("duplicate-code", "cyclic-import")
+# Default rendering of a PylintMessage: short, without the file path
+MESSAGE_TEMPLATE = "{line}:{column}: {msg_id} ({symbol}) {message}"
+# Placeholders stored in cached reports instead of the file-specific parts
+PATH_MARK, MODULE_MARK, NAME_MARK, RATING_MARK = "\x00path\x00", "\x00module\x00", "\x00name\x00", "\x00rating\x00"
+# Expected failures of the in-process run, which then falls back to the `pylint` command:
+# exit requested by pylint (rejected option or configuration), recursion too deep in astroid,
+# astroid internals other than the ones _forget_user_modules knows, unreadable file or report.
+# Any other exception reaches the caller.
+IN_PROCESS_ERRORS = (SystemExit, RecursionError, AttributeError, KeyError, OSError)
+
+# Pylint is not thread-safe: one in-process run at a time
+_lint_lock = threading.Lock()
+_installed_roots = None
+_in_process_available = True
+_fallback_reported = False
+# In-process runs abandoned by a cancelled task, still running and holding _lint_lock
+_abandoned_runs = 0
+_runs_lock = threading.Lock()
+_cache = None
+_versions = None
+
+
+class _RatingError(Exception):
+    """The configured `evaluation` formula failed on a file of a batch session."""
+
+
+class PylintMessage:
+    """
+    One pylint message, as read from pylint's JSON output.
+
+    Compact and hashable: callers filter, deduplicate and render only the
+    messages they need instead of pasting the whole text report.
+    """
+
+    __slots__ = ("path", "line", "column", "symbol", "msg_id", "category", "message")
+
+    def __init__(self, path: str, line: int, column: int, symbol: str, msg_id: str, category: str, message: str):
+        self.path = path
+        self.line = line
+        self.column = column
+        self.symbol = symbol
+        self.msg_id = msg_id
+        self.category = category
+        self.message = message
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PylintMessage":
+        """Builds a message from one item of pylint's `json` (or `json2`) output."""
+        return cls(data["path"], data["line"], data["column"], data["symbol"],
+                   data.get("message-id") or data.get("messageId"), data["type"], data["message"])
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def format(self, template: str = None) -> str:
+        """Renders the message; `template` uses the attribute names, e.g. "{line}: {symbol}"."""
+        return (template or MESSAGE_TEMPLATE).format(**self.to_dict())
+
+    def _key(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, PylintMessage) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"PylintMessage({self.path}:{self.line}:{self.column} {self.msg_id} {self.symbol})"
+
+
+def filter_messages(messages: list, categories=None, symbols=None, exclude=None) -> list:
+    """
+    Keeps the messages matching the given criteria.
+
+    Args:
+        messages (list): PylintMessage list.
+        categories: Categories to keep ("error", "warning", "convention", "refactor", ...), None = all.
+        symbols: Symbols or message ids to keep, None = all.
+        exclude: Symbols or message ids to drop.
+
+    Returns:
+        list: The matching messages, in order.
+    """
+    categories = set(categories) if categories else None
+    symbols = set(symbols) if symbols else None
+    exclude = set(exclude or ())
+    return [message for message in messages
+            if (categories is None or message.category in categories)
+            and (symbols is None or message.symbol in symbols or message.msg_id in symbols)
+            and message.symbol not in exclude and message.msg_id not in exclude]
+
+
+def dedupe_messages(messages: list, key=("path", "line", "symbol", "message")) -> list:
+    """
+    Drops the messages equal to an earlier one on the `key` attributes.
+
+    The default only drops repeats on the same line (e.g. the same undefined
+    name used twice); key=("symbol",) keeps one message per kind of problem.
+    """
+    seen, unique = set(), []
+    for message in messages:
+        value = tuple(getattr(message, name) for name in key)
+        if value not in seen:
+            seen.add(value)
+            unique.append(message)
+    return unique
+
+
+def render_messages(messages: list, template: str = None, limit: int = None) -> str:
+    """One line per message (MESSAGE_TEMPLATE by default), at most `limit` lines plus a count of the rest."""
+    shown = messages if limit is None else messages[:limit]
+    lines = [message.format(template) for message in shown]
+    if len(messages) > len(shown):
+        lines.append(f"... {len(messages) - len(shown)} more message(s)")
+    return "\n".join(lines)
+
+
+def _parse_score(output: str):
+    match = SCORE_PATTERN.search(output)
+    return float(match.group(1)) if match else None
+
+
+def _read_json_messages(text: str) -> list:
+    data = json.loads(text) if text.strip() else []
+    if isinstance(data, dict):  # json2 layout
+        data = data.get("messages", [])
+    return [PylintMessage.from_json(item) for item in data]
+
+
+def _json_report_path() -> str:
+    import tempfile
+
+    fd, json_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    return json_path
+
+
+def _pylint_command(path: Path, json_path: str) -> list:
+    # Text report on stdout, JSON messages in a side file
+    return ["pylint", f"--output-format=text,json:{json_path}", str(path)]
+
+
+def _read_json_report(json_path: str) -> list:
+    try:
+        return _read_json_messages(Path(json_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def _run_subprocess(path: Path) -> tuple:
+    """Cold path: a fresh `pylint` process (interpreter startup + astroid initialization)."""
+    json_path = _json_report_path()
+    try:
+        with tool_slot("lint"):
+            process = subprocess.run(_pylint_command(path, json_path), capture_output=True, text=True)
+        messages = _read_json_report(json_path)
+    finally:
+        os.remove(json_path)
+    return process.stdout + process.stderr, messages
+
+
+async def _run_subprocess_async(path: Path, timeout: float = None) -> tuple:
+    """_run_subprocess on an asyncio subprocess; its process group is killed on timeout or cancellation."""
+    json_path = _json_report_path()
+    try:
+        async with tool_slot_async("lint"):
+            _, stdout, stderr, timed_out = await run_process(_pylint_command(path, json_path), timeout)
+        messages = [] if timed_out else _read_json_report(json_path)
+    finally:
+        os.remove(json_path)
+    output = stdout + stderr
+    if timed_out:
+        output += f"\nTIMEOUT: pylint stopped after {timeout}s (process group killed)\n"
+    return output, messages
+
+
+class _InProcessRun:
+    """An in-process run started in a worker thread for an asyncio task."""
+
+    __slots__ = ("done", "abandoned")
+
+    def __init__(self):
+        self.done = False
+        self.abandoned = False
+
+
+def _lint_in_thread(path: Path, run: _InProcessRun) -> tuple:
+    global _abandoned_runs
+    try:
+        return _lint(path)
+    finally:
+        with _runs_lock:
+            run.done = True
+            if run.abandoned:
+                _abandoned_runs -= 1
+
+
+def _abandon(run: _InProcessRun):
+    """The task waiting for `run` was cancelled: the run finishes on its own, with nobody to read it."""
+    global _abandoned_runs
+    with _runs_lock:
+        if not run.done:
+            run.abandoned = True
+            _abandoned_runs += 1
+
+
+async def _lint_async(path: Path, timeout: float = None) -> tuple:
+    if timeout is None and _in_process_ready():
+        # In a worker thread, one run at a time (_lint_lock): still far cheaper than a process per file.
+        # There is no child to kill: a cancelled run finishes in the background, and until then later
+        # calls use the command instead of waiting for _lint_lock behind it.
+        run = _InProcessRun()
+        future = asyncio.get_running_loop().run_in_executor(None, _lint_in_thread, path, run)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            _abandon(run)
+            raise
+    # With a timeout, only a process can be stopped in time: its process group is killed
+    return await _run_subprocess_async(path, timeout)
+
+
+def _is_installed(location) -> bool:
+    """True for stdlib / site-packages files, which cannot change between two lint runs."""
+    global _installed_roots
+    if _installed_roots is None:
+        paths = sysconfig.get_paths()
+        _installed_roots = tuple({paths[key] for key in ("stdlib", "platstdlib", "purelib", "platlib")})
+    return location is None or str(location).startswith(_installed_roots)
+
+
+def _forget_user_modules():
+    """
+    Drops every non-installed module from astroid's caches.
+
+    astroid returns a cached AST when the same module is linted again, so an
+    edited sandbox file (or a module it imports) would be reported as it was on
+    the previous call. Stdlib and site-packages ASTs are kept: they are the
+    expensive part of the warm-up and never change.
+
+    `_mod_file_cache` is private to astroid (tests/test_pylint_tool.py fails if
+    it goes away); without it, the whole cache is cleared, as the command would.
+    """
+    from astroid import MANAGER
+
+    if not (isinstance(getattr(MANAGER, "astroid_cache", None), dict)
+            and isinstance(getattr(MANAGER, "_mod_file_cache", None), dict)):
+        MANAGER.clear_cache()
+        return
+    for name, module in list(MANAGER.astroid_cache.items()):
+        if not _is_installed(module.file):
+            del MANAGER.astroid_cache[name]
+    for key, spec in list(MANAGER._mod_file_cache.items()):
+        # Failed lookups are dropped too: the missing module may exist now
+        if isinstance(spec, Exception) or not _is_installed(spec.location):
+            del MANAGER._mod_file_cache[key]
+
+
+def _run_in_process(path: Path) -> tuple:
+    """
+    Warm path: pylint runs inside this interpreter and keeps its imports and
+    the astroid cache of installed modules between calls.
+
+    The text reporter writes the same report as the command line, the JSON
+    reporter the messages.
+    """
+    from pylint.lint import Run
+    from pylint.reporters import JSONReporter, MultiReporter
+    from pylint.reporters.text import TextReporter
+
+    with _lint_lock, tool_slot("lint"):
+        _forget_user_modules()
+        output, json_output = io.StringIO(), io.StringIO()
+        reporter = MultiReporter([TextReporter(output), JSONReporter(json_output)], lambda: None)
+        Run([str(path)], reporter=reporter, exit=False)
+        return output.getvalue(), _read_json_messages(json_output.getvalue())
+
+
+def get_pylint_cache() -> ResultCache:
+    """Process-wide cache of pylint reports (config.PYLINT_CACHE_*)."""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache(config.PYLINT_CACHE_SIZE, config.PYLINT_CACHE_DIR,
+                             int(config.PYLINT_CACHE_MAX_MB * 1024 * 1024))
+    return _cache
+
+
+def pylint_cache_stats() -> dict:
+    """Hit / miss counters of the pylint cache."""
+    return get_pylint_cache().stats()
+
+
+def _pylint_versions() -> str:
+    global _versions
+    if _versions is None:
+        try:
+            import astroid
+            import pylint
+            _versions = f"pylint {pylint.__version__} astroid {astroid.__version__}"
+        except ImportError:
+            _versions = subprocess.run(["pylint", "--version"], capture_output=True, text=True).stdout
+    return _versions
+
+
+def _config_fingerprint() -> list:
+    """Path and content of every configuration file pylint would read from here."""
+    try:
+        from pylint.config import find_default_config_files
+    except ImportError:
+        return []
+    parts = []
+    for config_file in find_default_config_files():
+        parts += [str(config_file), Path(config_file).read_bytes()]
+    return parts
+
+
+def _local_imports(path: Path, source: bytes) -> list:
+    """Name and content of the modules next to `path` that it imports (they change what pylint infers)."""
+    parts = []
+    for name, module_path in local_imports(path, source):
+        parts += [name, module_path.read_bytes()]
+    return parts
+
+
+def _module_name(path: Path) -> str:
+    """Module name pylint gives to a file (dotted when it sits in packages)."""
+    parts = [path.stem]
+    parent = path.resolve().parent
+    while (parent / "__init__.py").exists():
+        parts.insert(0, parent.name)
+        parent = parent.parent
+    return ".".join(parts)
+
+
+def _cache_key(path: Path, source: bytes) -> str:
+    name_ok = MODULE_NAME_PATTERN.match(path.stem) is not None
+    return make_key(_pylint_versions(), name_ok, source, *_config_fingerprint(), *_local_imports(path, source))
+
+
+def _previous_note(module: str):
+    """Score of the last run on this module, from pylint's own history (None if unknown)."""
+    try:
+        from pylint.lint import load_results
+    except ImportError:
+        return None
+    stats = load_results(module)
+    return stats.global_note if stats is not None else None
+
+
+def _record_note(module: str, note: float):
+    """Keeps pylint's history up to date on a cache hit, as a real run would."""
+    try:
+        from pylint.lint import save_results
+        from pylint.utils import LinterStats
+    except ImportError:
+        return
+    stats = LinterStats()
+    stats.global_note = note
+    save_results(stats, module)
+
+
+def _to_cache_entry(output: str, path: Path, module: str, note: float = None, messages: list = ()):
+    """Report with the file-specific parts replaced by placeholders (None: not cacheable)."""
+    match = RATING_PATTERN.search(output)
+    if match is None:
+        return None
+    if note is None:
+        note = _previous_note(module)  # just saved by pylint: unrounded score
+    text = output[:match.start()] + RATING_MARK + output[match.end():]
+    text = text.replace(str(path), PATH_MARK)
+    text = text.replace(f"************* Module {module}\n", f"************* Module {MODULE_MARK}\n")
+    text = text.replace(f'Module name "{path.stem}"', f'Module name "{NAME_MARK}"')
+    stored = [[message.line, message.column, message.symbol, message.msg_id, message.category,
+               message.message.replace(f'Module name "{path.stem}"', f'Module name "{NAME_MARK}"')]
+              for message in messages]
+    score = float(match.group(2))
+    return {"output": text, "rating": match.group(1), "score": score, "messages": stored,
+            "note": note if note is not None and f"{note:.2f}" == match.group(2) else score}
+
+
+def _from_cache_entry(entry: dict, path: Path, module: str) -> tuple:
+    """Rebuilds the report pylint would print for `path`, history included, and its messages."""
+    rating = entry["rating"]
+    previous = _previous_note(module)
+    if previous is not None:
+        rating += f" (previous run: {previous:.2f}/10, {entry['note'] - previous:+.2f})"
+    _record_note(module, entry["note"])
+    text = entry["output"].replace(RATING_MARK, "-" * len(rating) + "\n" + rating)
+    text = text.replace(PATH_MARK, str(path))
+    text = text.replace(f"************* Module {MODULE_MARK}\n", f"************* Module {module}\n")
+    text = text.replace(f'Module name "{NAME_MARK}"', f'Module name "{path.stem}"')
+    messages = [PylintMessage(str(path), line, column, symbol, msg_id, category,
+                              message.replace(f'Module name "{NAME_MARK}"', f'Module name "{path.stem}"'))
+                for line, column, symbol, msg_id, category, message in entry["messages"]]
+    return text, messages
+
+
+def _report_fallback(error: BaseException):
+    """Reports the fallback of the in-process run to the command, once per process."""
+    global _fallback_reported
+    if not _fallback_reported:
+        _fallback_reported = True
+        print(f" Attention : pylint en mémoire a échoué ({type(error).__name__}: {error}), "
+              f"repli sur la commande pylint")
+
+
+def _in_process_ready() -> bool:
+    """In-process run possible, and no abandoned run still holding _lint_lock."""
+    return config.PYLINT_IN_PROCESS and _in_process_available and not _abandoned_runs
+
+
+def _lint(path: Path) -> tuple:
+    global _in_process_available
+    if _in_process_ready():
+        try:
+            return _run_in_process(path)
+        except ImportError:
+            # pylint only available as a command: stop trying in this process
+            _in_process_available = False
+        except IN_PROCESS_ERRORS as e:
+            _report_fallback(e)
+    return _run_subprocess(path)
+
+
 def run_pylint(file_path: str) -> dict:
     """
     Runs pylint on a given Python file.
     Returns a dictionary with:
       - 'output': full pylint text output
       - 'score': float score (0-10) if found, else None
+      - 'messages': PylintMessage list, from pylint's JSON output
+        (see filter_messages, dedupe_messages, render_messages)
     This is used by the Auditor Agent to detect style/logic violations.
+
+    With config.PYLINT_IN_PROCESS, pylint stays loaded in this process between
+    calls (no interpreter startup per file); an expected failure of the
+    in-process run (IN_PROCESS_ERRORS) falls back to the `pylint` command.
+
+    With config.PYLINT_CACHE, reports are cached by content (source, sibling
+    modules it imports, pylint version and configuration): linting the same
+    code again, even from another temporary file, returns the same report
+    with that file's path and module name.
+
+    Each run takes a "lint" slot of the process-wide governor
+    (src/tools/governor.py); cache hits do not.
+    """
+    path = _check_path(file_path)
+    key, module, cached = _cached_report(path)
+    if cached is not None:
+        return _result(*cached)
+    output, messages = _lint(path)
+    _store_report(key, path, module, output, messages)
+    return _result(output, messages)
+
+
+async def run_pylint_async(file_path: str, timeout: float = None) -> dict:
+    """
+    Awaitable counterpart of run_pylint, returning the same dictionary.
+
+    With config.PYLINT_IN_PROCESS and no `timeout`, cache misses are linted
+    in this process from a worker thread, without blocking the event loop;
+    if the task is cancelled, the run finishes in the background and later
+    calls use the command until then. Otherwise the `pylint` command runs on
+    an asyncio subprocess: several files are linted concurrently, and
+    cancelling the task or running out of time kills the pylint process
+    group. A run stopped after `timeout` seconds has no score and is not
+    cached.
     """
+    path = _check_path(file_path)
+    key, module, cached = _cached_report(path)
+    if cached is not None:
+        return _result(*cached)
+    output, messages = await _lint_async(path, timeout)
+    _store_report(key, path, module, output, messages)
+    return _result(output, messages)
+
+
+def _check_path(file_path: str) -> Path:
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
+    return path
+
+
+def _cached_report(path: Path) -> tuple:
+    """(cache key, module, cached (output, messages) or None); the key is None when caching does not apply."""
+    if not config.PYLINT_CACHE or path.name == "__init__.py":
+        return None, None, None
+    module = _module_name(path)
+    key = _cache_key(path, path.read_bytes())
+    entry = get_pylint_cache().get(key)
+    if entry is not None and "messages" in entry:
+        return key, module, _from_cache_entry(entry, path, module)
+    # Miss, or entry written on disk before messages were cached
+    return key, module, None
 
-    process = subprocess.run(
-        ["pylint", str(path)],
-        capture_output=True,
-        text=True
-    )
 
-    output = process.stdout + process.stderr
+def _store_report(key: str, path: Path, module: str, output: str, messages: list):
+    if key is None:
+        return
+    entry = _to_cache_entry(output, path, module, messages=messages)
+    if entry is not None:
+        get_pylint_cache().put(key, entry)
 
-    # Extract score from pylint
-    score = None
-    match = re.search(r"rated at ([\d\.]+)/10", output)
-    if match:
-        score = float(match.group(1))
 
+def _result(output: str, messages: list) -> dict:
     return {
         "output": output,
-        "score": score
-    }
\ No newline at end of file
+        "score": _parse_score(output),
+        "messages": messages
+    }
+
+
+def _file_report(module: str, messages: list, stats: dict, evaluation: str):
+    """
+    Report of one file out of a batch session, as `pylint <file>` prints it.
+
+    Returns:
+        tuple: (output, unrounded score or None)
+    """
+    lines = [message.format("{path}:{line}:{column}: {msg_id}: {msg} ({symbol})") for message in messages]
+    output = f"************* Module {module}\n" + "\n".join(lines) + "\n" if lines else ""
+    if not stats or not stats["statement"]:
+        # Nothing evaluated (e.g. syntax error): pylint prints no score
+        return output, None
+    # `evaluation` comes from the pylint configuration (rcfile, pyproject.toml, --evaluation), which
+    # pylint itself passes to eval() the same way: this trusts nothing pylint does not already trust.
+    # A formula that fails is reported by pylint as "An exception occurred while rating"; here the
+    # batch raises instead, and run_pylint_batch falls back to one `pylint` process per file.
+    try:
+        note = eval(evaluation, {}, dict(stats))  # pylint: disable=eval-used
+    except Exception as e:
+        raise _RatingError(f"evaluation {evaluation!r}: {e}") from e
+    rating = f"Your code has been rated at {note:.2f}/10"
+    return output + "\n" + "-" * len(rating) + "\n" + rating + "\n\n", note
+
+
+def _run_batch_in_process(files: list, jobs: int) -> dict:
+    """One pylint session over all files (pylint's own --jobs), split per file."""
+    from pylint.lint import Run
+    from pylint.reporters import CollectingReporter
+
+    # One lint slot per pylint job, at most the whole lint budget
+    with _lint_lock, tool_slot("lint", jobs) as granted:
+        _forget_user_modules()
+        reporter = CollectingReporter()
+        # No history for the session: it would be saved under a single name for all files
+        run = Run([*files, f"--jobs={granted}", "--persistent=n", f"--disable={','.join(SESSION_ONLY_MESSAGES)}"],
+                  reporter=reporter, exit=False)
+
+    by_file = {str(Path(file).resolve()): [] for file in files}
+    for message in reporter.messages:
+        if message.abspath in by_file:
+            by_file[message.abspath].append(message)
+
+    by_module = run.linter.stats.by_module
+    results = {}
+    for file in files:
+        path = Path(file)
+        module = _module_name(path)
+        stats = by_module.get(module)
+        if stats is None:
+            # With --jobs > 1, workers may prefix the name with the enclosing directories
+            stats = next((value for name, value in by_module.items() if name.endswith("." + module)), None)
+        collected = by_file[str(path.resolve())]
+        output, note = _file_report(module, collected, stats, run.linter.config.evaluation)
+        messages = [PylintMessage(message.path, message.line, message.column, message.symbol, message.msg_id,
+                                  message.category, message.msg) for message in collected]
+        results[file] = (output, note, messages)
+    return results
+
+
+def run_pylint_batch(files: list, jobs: int = None) -> dict:
+    """
+    Runs pylint on many files in a single session.
+
+    astroid parses the imports shared by the files once, and pylint spreads
+    the files over `jobs` processes. Each report is then rebuilt as
+    `run_pylint` would return it for that file alone (messages that only
+    exist across files, like duplicate-code, are disabled), pylint's history
+    included, and stored in the pylint cache: later `run_pylint` calls on
+    unchanged files are hits.
+
+    Args:
+        files (list): Paths of the Python files.
+        jobs (int): Processes used by pylint (default: all cores), capped by the governor's lint budget.
+
+    Returns:
+        dict: file path (as given) -> {'output', 'score', 'messages'}
+    """
+    global _in_process_available
+    files = [str(file) for file in files]
+    for file in files:
+        if not Path(file).exists():
+            raise FileNotFoundError(f"File not found: {file}")
+    if not files:
+        return {}
+    jobs = jobs or os.cpu_count() or 1
+
+    reports = None
+    if _in_process_ready():
+        try:
+            reports = _run_batch_in_process(files, jobs)
+        except ImportError:
+            _in_process_available = False
+        except (_RatingError, *IN_PROCESS_ERRORS) as e:
+            _report_fallback(e)
+    if reports is None:
+        # pylint not importable here, or the session failed: one `pylint` process per file, `jobs` at a time
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return dict(zip(files, pool.map(run_pylint, files)))
+
+    results = {}
+    for file, (output, note, messages) in reports.items():
+        path = Path(file)
+        module = _module_name(path)
+        entry = _to_cache_entry(output, path, module, note, messages)
+        if entry is not None:
+            if config.PYLINT_CACHE and path.name != "__init__.py":
+                get_pylint_cache().put(_cache_key(path, path.read_bytes()), entry)
+            # Score section and history as a per-file run would print / record them
+            output, messages = _from_cache_entry(entry, path, module)
+        results[file] = {"output": output, "score": _parse_score(output), "messages": messages}
+    return results
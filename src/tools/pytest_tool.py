@@ -1,42 +1,755 @@
 """
 Outil pytest - Exécute les tests sur un fichier Python
+
+Avec config.PYTEST_WARM_POOL, les exécutions passent par des processus modèles
+(pytest_worker.py) où pytest et ses plugins sont déjà importés : chaque
+exécution est un fork du modèle, isolé comme un nouveau processus, sans
+redémarrage de l'interpréteur.
+
+Chaque exécution est bornée : au-delà de config.TEST_TIMEOUT secondes, son
+groupe de processus est tué, et un test seul est arrêté après
+config.TEST_CASE_TIMEOUT secondes (processus modèles seulement). À la fin de
+l'exécution, les processus laissés par les tests sont tués aussi.
+
+Avec config.PYTEST_CACHE, les résultats sont mis en cache par contenu (fichier
+de test, modules voisins qu'il importe, versions de Python et de pytest) :
+réexécuter les mêmes tests sur le même code ne lance pas pytest.
+
+Le détail par test (TestCaseResult) est lu dans le rapport JUnit XML de pytest :
+les appelants n'envoient que l'essentiel des tests en échec (failed_tests,
+render_tests) et repèrent les tests lents (slowest_tests).
+
+Mode retour rapide (boucle d'auto-correction) : run_pytest(max_failures=N,
+output_limit=M) arrête pytest après N échecs (--maxfail) et lit sa sortie par
+morceaux dans un tampon borné (début et fin gardés, milieu omis) au lieu de
+la garder entière en mémoire.
+
+run_pytest_async : même résultat sans bloquer la boucle d'événements asyncio.
+
+Chaque exécution de pytest prend une place "test" du gouverneur du processus
+(src/tools/governor.py) ; les résultats servis par le cache n'en prennent pas.
+Le pool démarre config.PYTEST_POOL_SIZE processus modèles et en ajoute un
+quand une exécution n'en trouve aucun de libre, jusqu'au nombre de places
+"test" du gouverneur : une exécution qui a sa place trouve toujours un modèle,
+sans processus inactifs lancés d'avance pour toutes les places.
 """
 
+import asyncio
+import atexit
+import collections
+import functools
+import json
+import os
+import queue
 import subprocess
+import sys
+import tempfile
+import threading
 import re
+import signal
+import xml.etree.ElementTree as ElementTree
 from pathlib import Path
 
+from src.tools.async_process import run_process
+from src.tools.governor import get_governor, tool_slot, tool_slot_async
+from src.tools.result_cache import ResultCache, local_imports, make_key
+from src.utils import config
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+PYTEST_ARGS = ["--tb=short", "--disable-warnings"]
+# Rapport JUnit XML : la famille xunit1 donne le fichier et la ligne de chaque test
+JUNIT_ARGS = ["-o", "junit_family=xunit1"]
+# Emplacement "fichier:ligne: " dans une trace --tb=short
+LOCATION_PATTERN = re.compile(r"^(\S+?):(\d+): ", re.MULTILINE)
+WORKER_SCRIPT = Path(__file__).with_name("pytest_worker.py")
+# Fichiers lus par pytest dans le dossier du test et ses parents
+PYTEST_CONTEXT_FILES = ("conftest.py", "pytest.ini", "pyproject.toml", "tox.ini", "setup.cfg")
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_available = True
+_cache = None
+_versions = None
+
+
+class TestCaseResult:
+    """
+    Résultat d'un test, lu dans le rapport JUnit XML de pytest.
+
+    outcome : "passed", "failed", "error" (erreur de collecte ou de fixture)
+    ou "skipped" ; location : "fichier:ligne" de l'échec dans la trace.
+    """
+
+    __test__ = False  # pas une classe de test pour pytest
+    __slots__ = ("nodeid", "outcome", "duration", "message", "location")
+
+    def __init__(self, nodeid: str, outcome: str, duration: float, message: str = "", location: str = ""):
+        self.nodeid = nodeid
+        self.outcome = outcome
+        self.duration = duration
+        self.message = message
+        self.location = location
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def format(self, width: int = 300) -> str:
+        """Une ligne pour le test, suivie de son message d'échec (tronqué à `width` caractères)."""
+        line = f"{self.outcome.upper()} {self.nodeid}"
+        if self.location:
+            line += f" ({self.location})"
+        line += f" [{self.duration:.2f}s]"
+        if self.message:
+            message = self.message if len(self.message) <= width else self.message[:width] + "..."
+            line += "".join(f"\n    {text}" for text in message.splitlines() if text.strip())
+        return line
+
+    def __eq__(self, other):
+        return isinstance(other, TestCaseResult) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"TestCaseResult({self.nodeid} {self.outcome} {self.duration:.3f}s)"
+
+
+def failed_tests(tests: list) -> list:
+    """Tests en échec ou en erreur, dans l'ordre d'exécution."""
+    return [test for test in tests if test.outcome in ("failed", "error")]
+
+
+def slowest_tests(tests: list, count: int = 5) -> list:
+    """Les `count` tests les plus lents."""
+    return sorted(tests, key=lambda test: test.duration, reverse=True)[:count]
+
+
+def render_tests(tests: list, limit: int = None, width: int = 300) -> str:
+    """Un bloc par test (TestCaseResult.format), au plus `limit` tests plus le nombre des autres."""
+    shown = tests if limit is None else tests[:limit]
+    blocks = [test.format(width) for test in shown]
+    if len(tests) > len(shown):
+        blocks.append(f"... {len(tests) - len(shown)} more test(s)")
+    return "\n".join(blocks)
+
+
+class _BoundedOutput:
+    """
+    Sortie lue par morceaux, bornée à `limit` caractères (None = sans limite).
+
+    Le premier quart garde le début (en-tête, premiers échecs), le reste est un
+    tampon circulaire des derniers caractères (résumé de pytest) ; le milieu est
+    remplacé par le nombre de caractères omis.
+    """
+
+    def __init__(self, limit: int = None):
+        self.limit = limit
+        self.head_limit = limit // 4 if limit is not None else None
+        self._head, self._head_size = [], 0
+        self._tail, self._tail_size = collections.deque(), 0
+        self.dropped = 0
+
+    def write(self, text: str):
+        if self.limit is None:
+            self._head.append(text)
+            return
+        if self._head_size < self.head_limit:
+            part = text[:self.head_limit - self._head_size]
+            self._head.append(part)
+            self._head_size += len(part)
+            text = text[len(part):]
+        if not text:
+            return
+        self._tail.append(text)
+        self._tail_size += len(text)
+        excess = self._tail_size - (self.limit - self.head_limit)
+        while excess > 0:
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                removed = len(first)
+            else:
+                self._tail[0] = first[excess:]
+                removed = excess
+            self._tail_size -= removed
+            self.dropped += removed
+            excess -= removed
+
+    def getvalue(self) -> str:
+        head, tail = "".join(self._head), "".join(self._tail)
+        if self.dropped:
+            return f"{head}\n[... {self.dropped} caractères omis ...]\n{tail}"
+        return head + tail
+
+
+def _read_bounded(stream, limit: int = None, chunk_size: int = 65536) -> str:
+    """Lit un flux texte par morceaux dans un _BoundedOutput : au plus `limit` caractères en mémoire."""
+    output = _BoundedOutput(limit)
+    for chunk in iter(lambda: stream.read(chunk_size), ""):
+        output.write(chunk)
+    return output.getvalue()
+
+
+def _nodeid(case) -> str:
+    """Identifiant pytest (fichier::Classe::test) d'un <testcase> xunit1."""
+    file, name = case.get("file", ""), case.get("name", "")
+    classname = case.get("classname", "")
+    module = file[:-3].replace("/", ".") if file.endswith(".py") else ""
+    if not file:
+        return "::".join(part for part in (classname, name) if part)
+    classes = classname[len(module) + 1:].split(".") if module and classname.startswith(module + ".") else []
+    return "::".join([file, *classes, name])
+
+
+def _read_junit(xml_path: str) -> list:
+    """TestCaseResult de chaque <testcase> du rapport (liste vide si pytest n'a pas écrit le rapport)."""
+    try:
+        root = ElementTree.parse(xml_path).getroot()
+    except (OSError, ElementTree.ParseError):
+        return []
+    tests = []
+    for case in root.iter("testcase"):
+        outcome, message, location = "passed", "", ""
+        for tag in ("failure", "error", "skipped"):
+            element = case.find(tag)
+            if element is not None:
+                outcome = "failed" if tag == "failure" else tag
+                message = element.get("message", "")
+                if message == "collection failure":
+                    # Message générique : la cause est la dernière ligne "E   ..." de la trace
+                    causes = [text[1:].strip() for text in (element.text or "").splitlines() if text.startswith("E ")]
+                    if causes:
+                        message += f": {causes[-1]}"
+                # Dernier emplacement de la trace : la ligne où l'échec s'est produit
+                locations = LOCATION_PATTERN.findall(element.text or "")
+                if locations:
+                    location = ":".join(locations[-1])
+                break
+        tests.append(TestCaseResult(_nodeid(case), outcome, float(case.get("time") or 0), message, location))
+    return tests
+
+
+class _Worker:
+    """Un processus modèle (pytest_worker.py) : une exécution à la fois."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, str(WORKER_SCRIPT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8"
+        )
+        self.ready = False
+
+    def _read(self) -> dict:
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError("processus modèle pytest arrêté")
+        return json.loads(line)
+
+    def _send(self, message: dict):
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+
+    def run(self, args: list, cwd: str, timeout: float, test_timeout: float, output_limit: int = None,
+            cancellation: "_Cancellation" = None):
+        """
+        Exécute pytest dans un fork du modèle ; stdout et stderr relus bornés à `output_limit` caractères.
+
+        Returns:
+            tuple: (code de sortie, stdout, stderr, délai dépassé, tests arrêtés par leur délai),
+            ou None si `cancellation` a été demandée avant l'envoi de la requête
+        """
+        if not self.ready:
+            self._read()  # import de pytest terminé
+            self.ready = True
+        outputs = {}
+        for name in ("stdout", "stderr", "timeouts"):
+            fd, outputs[name] = tempfile.mkstemp(prefix=f"pytest_{name}_", suffix=".txt")
+            os.close(fd)
+        request = {"args": args, "cwd": cwd, "timeout": timeout, "test_timeout": test_timeout, **outputs}
+        try:
+            if cancellation is None:
+                self._send(request)
+            elif not cancellation.start(self, lambda: self._send(request)):
+                return None
+            try:
+                response = self._read()
+            finally:
+                if cancellation is not None:
+                    cancellation.finish()
+            texts = {}
+            for name, limit in (("stdout", output_limit), ("stderr", output_limit), ("timeouts", None)):
+                with open(outputs[name], encoding="utf-8", errors="replace") as stream:
+                    texts[name] = _read_bounded(stream, limit)
+
+        finally:
+            for output in outputs.values():
+                os.remove(output)
+        return (response["returncode"], texts["stdout"], texts["stderr"], response["timed_out"],
+                texts["timeouts"].splitlines())
+
+    def cancel(self):
+        """Annule l'exécution en cours : le modèle tue le groupe de l'enfant et répond aussitôt."""
+        try:
+            self._send({"cancel": True})
+        except (OSError, ValueError):
+            pass  # modèle déjà arrêté : plus rien à annuler
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+class _Cancellation:
+    """
+    Annulation d'une exécution du pool depuis un autre thread (run_pytest_async).
+
+    La requête n'est envoyée (start) que si l'annulation n'est pas déjà
+    demandée ; ensuite, et jusqu'à la réponse (finish), cancel() transmet
+    l'annulation au modèle, qui tue le groupe de l'enfant.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._worker = None
+        self.requested = False
+
+    def start(self, worker: _Worker, send) -> bool:
+        with self._lock:
+            if self.requested:
+                return False
+            send()
+            self._worker = worker
+            return True
+
+    def finish(self):
+        with self._lock:
+            self._worker = None
+
+    def cancel(self) -> bool:
+        """Demande l'annulation ; True si une exécution était en cours (sa réponse va arriver)."""
+        with self._lock:
+            self.requested = True
+            if self._worker is None:
+                return False
+            self._worker.cancel()
+            return True
+
+
+class _WorkerPool:
+    """
+    Processus modèles partagés entre les threads, démarrés à la demande.
+
+    Args:
+        size (int): Modèles démarrés à l'avance.
+        limit (int): Nombre maximal de modèles (exécutions simultanées), `size` par défaut.
+    """
+
+    def __init__(self, size: int, limit: int = None):
+        self.limit = max(1, limit or size)
+        self._lock = threading.Lock()
+        self._idle = queue.Queue()
+        self._workers = [_Worker() for _ in range(min(max(1, size), self.limit))]
+        for worker in self._workers:
+            self._idle.put(worker)
 
-def run_pytest(file_path: str) -> dict:
+    def _take(self) -> _Worker:
+        """Un modèle libre ; sinon un nouveau modèle si la limite le permet ; sinon attend qu'un modèle se libère."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._workers) < self.limit:
+                worker = _Worker()
+                self._workers.append(worker)
+                return worker
+        return self._idle.get()
+
+    def run(self, args: list, cwd: str, timeout: float, test_timeout: float, output_limit: int = None,
+            cancellation: _Cancellation = None):
+        worker = self._take()
+        try:
+            result = worker.run(args, cwd, timeout, test_timeout, output_limit, cancellation)
+        except (OSError, ValueError, RuntimeError):
+            # Modèle inutilisable : remplacé, l'appelant repasse par la commande pytest
+            ready = worker.ready
+            worker.close()
+            with self._lock:
+                self._workers.remove(worker)
+                replacement = _Worker()
+                self._workers.append(replacement)
+            self._idle.put(replacement)
+            if not ready:
+                raise ImportError("pytest ne démarre pas dans le processus modèle")
+            raise
+        self._idle.put(worker)
+        return result
+
+    def close(self):
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            worker.close()
+
+
+def _pool_size() -> int:
+    """Nombre maximal de modèles : une place "test" du gouverneur par modèle (sinon config.PYTEST_POOL_SIZE)."""
+    if config.GOVERNOR_ENABLED:
+        return get_governor().limit("test")
+    return config.PYTEST_POOL_SIZE
+
+
+def warm_pytest_pool():
+    """
+    Démarre config.PYTEST_POOL_SIZE processus modèles en avance : l'import de
+    pytest se fait en arrière-plan. Les autres (jusqu'à _pool_size()) démarrent
+    quand des exécutions simultanées les demandent.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None and config.PYTEST_WARM_POOL and _pool_available and hasattr(os, "fork"):
+            limit = _pool_size()
+            _pool = _WorkerPool(min(config.PYTEST_POOL_SIZE, limit), limit)
+            atexit.register(_pool.close)
+        return _pool
+
+
+def _run_subprocess(args: list, timeout: float, output_limit: int = None) -> tuple:
+    """Chemin à froid : un nouveau processus `pytest` (interpréteur, imports et plugins à chaque fois)."""
+    process = subprocess.Popen(
+        ["pytest", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        start_new_session=hasattr(os, "killpg")  # groupe propre, tué en entier au délai dépassé
+    )
+    # Un thread par flux : les sorties sont lues au fil de l'eau, bornées à `output_limit` caractères
+    outputs = {}
+
+    def read(name, stream):
+        outputs[name] = _read_bounded(stream, output_limit)
+
+    readers = [threading.Thread(target=read, args=(name, stream), daemon=True)
+               for name, stream in (("stdout", process.stdout), ("stderr", process.stderr))]
+    for reader in readers:
+        reader.start()
+    try:
+        process.wait(timeout=timeout)
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        timed_out = True
+    # Délai dépassé : tout le groupe ; sinon les processus laissés par les tests, qui
+    # garderaient les tubes ouverts et bloqueraient la lecture (comme pytest_worker.py)
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        elif timed_out:
+            process.kill()
+    except ProcessLookupError:
+        pass
+    process.wait()
+    for reader in readers:
+        reader.join()
+    process.stdout.close()
+    process.stderr.close()
+    # Pas de délai par test ici (plugin des processus modèles) : seul le délai global s'applique
+    return process.returncode, outputs["stdout"], outputs["stderr"], timed_out, []
+
+
+def _run_with_fallback(args: list, timeout: float, output_limit: int = None) -> tuple:
+    global _pool_available
+    pool = warm_pytest_pool() if config.PYTEST_WARM_POOL else None
+    if pool is not None:
+        try:
+            return pool.run(args, os.getcwd(), timeout, config.TEST_CASE_TIMEOUT, output_limit)
+        except ImportError:
+            # pytest absent de cet interpréteur : on ne réessaie plus
+            _pool_available = False
+        except (OSError, ValueError, RuntimeError):
+            pass
+    return _run_subprocess(args, timeout, output_limit)
+
+
+async def _run_pool_async(pool: _WorkerPool, args: list, timeout: float, output_limit: int = None) -> tuple:
+    """Exécution du pool dans un thread ; annuler la tâche tue l'enfant forké avant que l'annulation ne remonte."""
+    cancellation = _Cancellation()
+    future = asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(pool.run, args, os.getcwd(), timeout, config.TEST_CASE_TIMEOUT, output_limit,
+                                cancellation))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if cancellation.cancel():
+            # Le modèle tue le groupe et répond aussitôt
+            try:
+                await future
+            except Exception:
+                pass
+        raise
+
+
+async def _run_with_fallback_async(args: list, timeout: float, output_limit: int = None) -> tuple:
+    global _pool_available
+    pool = warm_pytest_pool() if config.PYTEST_WARM_POOL else None
+    if pool is not None:
+        try:
+            return await _run_pool_async(pool, args, timeout, output_limit)
+        except ImportError:
+            _pool_available = False
+        except (OSError, ValueError, RuntimeError):
+            pass
+    returncode, stdout, stderr, timed_out = await run_process(["pytest", *args], timeout,
+                                                              sink=lambda: _BoundedOutput(output_limit))
+    return returncode, stdout, stderr, timed_out, []
+
+
+def _pytest_args(path: Path, xml_path: str, max_failures: int = None) -> list:
+    args = [str(path), *PYTEST_ARGS, *JUNIT_ARGS, f"--junitxml={xml_path}"]
+    if max_failures:
+        args.append(f"--maxfail={max_failures}")
+    return args
+
+
+def _junit_path() -> str:
+    fd, xml_path = tempfile.mkstemp(prefix="pytest_junit_", suffix=".xml")
+    os.close(fd)
+    return xml_path
+
+
+def _without_junit_line(stdout: str, xml_path: str) -> str:
+    """Sortie identique à une exécution sans rapport."""
+    return "".join(line for line in stdout.splitlines(keepends=True)
+                   if f"generated xml file: {xml_path}" not in line)
+
+
+def _run(path: Path, timeout: float, max_failures: int = None, output_limit: int = None) -> tuple:
+    """Exécute pytest avec un rapport JUnit XML. Retourne aussi les TestCaseResult."""
+    xml_path = _junit_path()
+    try:
+        with tool_slot("test"):
+            returncode, stdout, stderr, timed_out, timeouts = _run_with_fallback(
+                _pytest_args(path, xml_path, max_failures), timeout, output_limit)
+        tests = _read_junit(xml_path)
+    finally:
+        os.remove(xml_path)
+    return returncode, _without_junit_line(stdout, xml_path), stderr, timed_out, timeouts, tests
+
+
+async def _run_async(path: Path, timeout: float, max_failures: int = None, output_limit: int = None) -> tuple:
+    """_run sans bloquer la boucle d'événements."""
+    xml_path = _junit_path()
+    try:
+        async with tool_slot_async("test"):
+            returncode, stdout, stderr, timed_out, timeouts = await _run_with_fallback_async(
+                _pytest_args(path, xml_path, max_failures), timeout, output_limit)
+        tests = _read_junit(xml_path)
+    finally:
+        os.remove(xml_path)
+    return returncode, _without_junit_line(stdout, xml_path), stderr, timed_out, timeouts, tests
+
+
+def get_pytest_cache() -> ResultCache:
+    """Cache des résultats pytest du processus (config.PYTEST_CACHE_*)."""
+    global _cache
+    if _cache is None:
+        directory = config.PYTEST_CACHE_DIR
+        if directory:
+            # Relatif à la racine du projet, comme logs/, quel que soit le dossier courant
+            directory = PROJECT_ROOT / directory
+        _cache = ResultCache(config.PYTEST_CACHE_SIZE, directory,
+                             int(config.PYTEST_CACHE_MAX_MB * 1024 * 1024))
+    return _cache
+
+
+def pytest_cache_stats() -> dict:
+    """Compteurs hits / misses du cache pytest."""
+    return get_pytest_cache().stats()
+
+
+def _pytest_versions() -> str:
+    global _versions
+    if _versions is None:
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            _versions = f"python {sys.version} pytest {version('pytest')}"
+        except PackageNotFoundError:
+            _versions = subprocess.run(["pytest", "--version"], capture_output=True, text=True).stdout
+    return _versions
+
+
+def _local_modules(path: Path, source: bytes) -> list:
+    """Modules voisins importés par le test, et ceux qu'ils importent à leur tour : (nom, contenu)."""
+    modules, pending = {}, local_imports(path, source)
+    while pending:
+        name, module_path = pending.pop()
+        if name in modules or module_path.resolve() == path.resolve():
+            continue
+        modules[name] = module_path.read_bytes()
+        pending += local_imports(module_path, modules[name])
+    return sorted(modules.items())
+
+
+def _context_files(path: Path) -> list:
+    """conftest.py et fichiers de configuration de pytest, du dossier du test jusqu'à la racine."""
+    parts = []
+    for directory in path.resolve().parents:
+        for name in PYTEST_CONTEXT_FILES:
+            candidate = directory / name
+            if candidate.is_file():
+                parts += [str(candidate), candidate.read_bytes()]
+    return parts
+
+
+def _mark(index: int) -> str:
+    return f"\x00name{index}\x00"
+
+
+def _hide_names(text: str, names: list) -> str:
+    """Remplace les noms de modules (mots entiers) par des marques : les fichiers temporaires du JudgeAgent changent de nom."""
+    for index, name in sorted(enumerate(names), key=lambda item: -len(item[1])):
+        text = re.sub(rf"\b{re.escape(name)}\b", _mark(index), text)
+    return text
+
+
+def _show_names(text: str, names: list) -> str:
+    for index, name in enumerate(names):
+        text = text.replace(_mark(index), name)
+    return text
+
+
+def _cache_key(path: Path, timeout: float, max_failures: int = None, output_limit: int = None) -> tuple:
+    """(clé, noms de modules masqués) : le même test sur le même code donne la même clé, quel que soit le nom des fichiers."""
+    source = path.read_bytes()
+    modules = _local_modules(path, source)
+    names = [path.stem] + [name for name, _ in modules]
+    hidden = [_hide_names(content.decode("utf-8", errors="replace"), names) for _, content in modules]
+    # Longueur des noms dans la clé : pytest aligne ses lignes sur la largeur du terminal.
+    # Dossier courant aussi : pytest y est lancé, et sans fichier de configuration il en fait son
+    # rootdir ; les chemins de la sortie ("a/test_x.py::test_y") sont écrits relativement à lui.
+    key = make_key(_pytest_versions(), *PYTEST_ARGS, timeout, config.TEST_CASE_TIMEOUT, max_failures, output_limit,
+                   *map(len, names),
+                   os.getcwd(), str(path.resolve().parent), _hide_names(source.decode("utf-8", errors="replace"), names),
+                   *hidden, *_context_files(path))
+    return key, names
+
+
+def run_pytest(file_path: str, timeout: float = None, max_failures: int = None, output_limit: int = None) -> dict:
     """
     Exécute pytest sur un fichier Python donné.
-    
+
     Args:
         file_path: Chemin vers le fichier Python à tester
-        
+        timeout: Délai max de l'exécution en secondes (défaut: config.TEST_TIMEOUT)
+        max_failures: Arrêt de pytest après ce nombre d'échecs (None = tous les tests)
+        output_limit: Caractères gardés par flux de sortie, début et fin (None = sortie complète)
+
+    Avec max_failures, 'passed' reste exact : pytest ne s'arrête qu'en cas
+    d'échec, donc une exécution réussie a lancé tous les tests.
+
+    config.TEST_CASE_TIMEOUT (délai par test) ne s'applique qu'aux processus
+    modèles (config.PYTEST_WARM_POOL). En sous-processus (pool désactivé ou
+    indisponible), seul `timeout` borne l'exécution : un test bloqué la fait
+    arrêter en entier, et timeout['tests'] reste vide.
+
+    Avec config.PYTEST_CACHE, un test déjà exécuté sur le même code (même
+    contenu, même sous un autre nom de fichier) est servi par le cache sans
+    lancer pytest. Les exécutions arrêtées par un délai ne sont pas mises en
+    cache (elles dépendent de la charge de la machine).
+
     Returns:
         dict: {
             'passed': bool,  # True si tous les tests passent
-            'output': str,   # Sortie complète de pytest
-            'pylint_score': float or None  # Score Pylint si disponible
+            'output': str,   # Sortie de pytest (complète, ou bornée par output_limit)
+            'timed_out': bool,  # True si l'exécution ou un test a dépassé son délai
+            'timeout': dict or None,  # None, ou si timed_out : {
+                #   'run_killed': bool,  # exécution entière arrêtée (groupe de processus tué)
+                #   'limit': float,      # délai de l'exécution en secondes
+                #   'tests': list,       # identifiants pytest des tests arrêtés par leur délai
+                #   'test_limit': float  # délai par test (config.TEST_CASE_TIMEOUT)
+                # }
+            'tests': list,   # TestCaseResult de chaque test (rapport JUnit XML, vide si pytest n'a pas fini)
         }
     """
+    path, timeout = _check_path(file_path), timeout if timeout is not None else config.TEST_TIMEOUT
+    key, names, cached = _cached_result(path, timeout, max_failures, output_limit)
+    if cached is not None:
+        return cached
+    # Exécuter pytest (processus modèle préchauffé si disponible)
+    return _result(key, names, timeout, *_run(path, timeout, max_failures, output_limit))
+
+
+async def run_pytest_async(file_path: str, timeout: float = None, max_failures: int = None,
+                           output_limit: int = None) -> dict:
+    """
+    Variante async de run_pytest (mêmes arguments, même dictionnaire) : plusieurs
+    fichiers peuvent être testés en même temps sur une boucle d'événements.
+
+    L'exécution passe par les processus modèles (dans un thread) ou par un
+    sous-processus asyncio ; annuler la tâche tue le groupe de processus des
+    tests avant que l'annulation ne remonte.
+    """
+    path, timeout = _check_path(file_path), timeout if timeout is not None else config.TEST_TIMEOUT
+    key, names, cached = _cached_result(path, timeout, max_failures, output_limit)
+    if cached is not None:
+        return cached
+    return _result(key, names, timeout, *await _run_async(path, timeout, max_failures, output_limit))
+
+
+def _check_path(file_path: str) -> Path:
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
+    return path
 
-    # Exécuter pytest
-    process = subprocess.run(
-        ["pytest", str(path), "--tb=short", "--disable-warnings"],
-        capture_output=True,
-        text=True
-    )
 
-    output = process.stdout + process.stderr
-    passed = process.returncode == 0  # 0 = succès dans pytest
+def _cached_result(path: Path, timeout: float, max_failures: int = None, output_limit: int = None) -> tuple:
+    """(clé, noms masqués, résultat servi par le cache ou None) ; clé None sans config.PYTEST_CACHE."""
+    if not config.PYTEST_CACHE:
+        return None, None, None
+    key, names = _cache_key(path, timeout, max_failures, output_limit)
+    entry = get_pytest_cache().get(key)
+    if entry is None or "tests" not in entry:
+        return key, names, None
+    tests = [TestCaseResult(_show_names(nodeid, names), outcome, duration, _show_names(message, names),
+                            _show_names(location, names))
+             for nodeid, outcome, duration, message, location in entry["tests"]]
+    return key, names, {"passed": entry["passed"], "output": _show_names(entry["output"], names),
+                        "timed_out": False, "timeout": None, "tests": tests}
+
+
+def _result(key: str, names: list, timeout: float, returncode: int, stdout: str, stderr: str,
+            run_timed_out: bool, timeouts: list, tests: list) -> dict:
+    """Dictionnaire de run_pytest pour une exécution, mis en cache si aucun délai n'a été dépassé."""
+    output = stdout + stderr
+    if run_timed_out:
+        output += f"\nTIMEOUT: exécution de pytest arrêtée après {timeout}s (groupe de processus tué)\n"
+    passed = returncode == 0 and not run_timed_out  # 0 = succès dans pytest
+
+    timeout_info = None
+    if run_timed_out or timeouts:
+        timeout_info = {
+            "run_killed": run_timed_out,  # exécution entière arrêtée à `limit` secondes
+            "limit": timeout,
+            "tests": timeouts,  # tests arrêtés à `test_limit` secondes (identifiants pytest)
+            "test_limit": config.TEST_CASE_TIMEOUT,
+        }
 
+    if key is not None and timeout_info is None:
+        stored = [[_hide_names(test.nodeid, names), test.outcome, test.duration, _hide_names(test.message, names),
+                   _hide_names(test.location, names)] for test in tests]
+        get_pytest_cache().put(key, {"passed": passed, "output": _hide_names(output, names), "tests": stored})
 
     return {
         "passed": passed,
         "output": output,
-                }
+        "timed_out": timeout_info is not None,
+        "timeout": timeout_info,
+        "tests": tests,
+    }
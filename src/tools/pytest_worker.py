@@ -0,0 +1,234 @@
+"""
+Processus modèle pour pytest_tool - pytest importé une fois, un fork par exécution
+
+Lancé par pytest_tool (python pytest_worker.py) ; lit une requête JSON par ligne
+sur l'entrée standard et répond une ligne JSON sur la sortie standard :
+    {"args": [...], "cwd": "...", "stdout": "fichier", "stderr": "fichier",
+     "timeouts": "fichier", "timeout": 30, "test_timeout": 10}
+    -> {"returncode": 0, "timed_out": false, "cancelled": false}
+
+Pendant une exécution, la ligne {"cancel": true} l'annule : le groupe de
+l'enfant est tué et la réponse arrive aussitôt (cancelled: true). Reçue
+entre deux exécutions, elle est ignorée.
+
+Chaque exécution se fait dans un enfant forké : il hérite de pytest et de ses
+plugins déjà importés, mais jamais des modules testés (le modèle ne lance
+aucun test), donc chaque exécution importe le code testé à neuf.
+
+Délais : l'enfant est chef de son groupe de processus ; au-delà de `timeout`
+secondes, le groupe entier est tué (processus lancés par les tests compris).
+Dans l'exécution, un test qui dépasse `test_timeout` secondes échoue (SIGALRM)
+et son identifiant est ajouté au fichier `timeouts`.
+
+Pas d'import de src : ce fichier tourne hors du projet, comme la commande pytest.
+"""
+
+import json
+import os
+import select
+import signal
+import sys
+import time
+
+
+def _warm_up():
+    """Importe pytest, ses plugins internes et ceux des paquets installés (entry points pytest11)."""
+    import importlib
+
+    import pytest  # noqa: F401
+    from _pytest.config import default_plugins
+
+    for name in default_plugins:
+        try:
+            importlib.import_module(f"_pytest.{name}")
+        except ImportError:
+            pass
+    try:
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group="pytest11"):
+            try:
+                entry_point.load()
+            except Exception:
+                # Plugin cassé : pytest le signalera lui-même dans l'enfant
+                pass
+    except ImportError:
+        pass
+
+
+def _test_timeout_plugin(seconds: float, report_path: str):
+    """Plugin pytest : un test dont l'appel dépasse `seconds` échoue au lieu de bloquer l'exécution."""
+    import pytest
+
+    class TestTimeout:
+        @pytest.hookimpl(wrapper=True)
+        def pytest_runtest_call(self, item):
+            def on_alarm(signum, frame):
+                with open(report_path, "a", encoding="utf-8") as report:
+                    report.write(item.nodeid + "\n")
+                # Failed dérive de BaseException : un `except Exception` du code testé ne l'arrête pas
+                pytest.fail(f"Timeout: test arrêté après {seconds}s")
+
+            previous = signal.signal(signal.SIGALRM, on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, seconds)
+            try:
+                return (yield)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous)
+
+    return TestTimeout()
+
+
+def _run_child(request: dict, protocol_out: int):
+    """Dans l'enfant forké : exécute pytest, sorties redirigées vers les fichiers demandés."""
+    os.close(protocol_out)
+    code = 3  # ExitCode.INTERNAL_ERROR si pytest ne démarre même pas
+    try:
+        os.setpgid(0, 0)  # groupe propre : tué d'un coup au délai dépassé
+        os.chdir(request["cwd"])
+        null_fd = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(null_fd, 0)
+        for fd, name in ((1, "stdout"), (2, "stderr")):
+            os.dup2(os.open(request[name], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), fd)
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+        sys.stderr = open(2, "w", encoding="utf-8", closefd=False)
+
+        import pytest
+
+        plugins = []
+        if request.get("test_timeout") and hasattr(signal, "setitimer"):
+            plugins.append(_test_timeout_plugin(request["test_timeout"], request["timeouts"]))
+        code = int(pytest.main(request["args"], plugins=plugins))
+    except BaseException as exc:  # l'enfant ne doit jamais revenir dans la boucle du modèle
+        try:
+            print(f"pytest worker: {exc!r}", file=sys.stderr)
+        except Exception:
+            pass
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+class _Requests:
+    """
+    Lignes de l'entrée standard, lues sans tampon caché : pendant une exécution,
+    select() sur le descripteur voit arriver une annulation.
+    """
+
+    def __init__(self, fd: int = 0):
+        self.fd = fd
+        self._buffer = b""
+        self.closed = False
+
+    def has_line(self) -> bool:
+        return b"\n" in self._buffer
+
+    def readline(self):
+        """Ligne suivante décodée (None à la fermeture de l'entrée standard)."""
+        while not self.has_line():
+            data = os.read(self.fd, 65536)
+            if not data:
+                self.closed = True
+                line, self._buffer = self._buffer, b""
+                return line.decode("utf-8") if line.strip() else None
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line.decode("utf-8")
+
+
+def _is_cancel(line) -> bool:
+    """Annulation : ligne {"cancel": true}, ou entrée standard fermée (processus parent disparu)."""
+    if line is None:
+        return True
+    try:
+        return bool(json.loads(line).get("cancel")) if line.strip() else False
+    except ValueError:
+        return False
+
+
+def _wait(pid: int, timeout: float, requests: _Requests) -> str:
+    """
+    Attend la fin de l'enfant au plus `timeout` secondes (None = sans limite),
+    ou une annulation sur l'entrée standard.
+
+    L'enfant n'est pas récupéré (il reste zombie) : son numéro de groupe reste
+    réservé jusqu'au kill du groupe. Retourne "exited", "timeout" ou "cancelled".
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pidfd = os.pidfd_open(pid) if hasattr(os, "pidfd_open") else None
+    try:
+        while True:
+            while requests.has_line():
+                if _is_cancel(requests.readline()):
+                    return "cancelled"
+            if os.waitid(os.P_PID, pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None:
+                return "exited"
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return "timeout"
+            if pidfd is None:
+                # Sans pidfd : l'entrée standard est surveillée par tranches de 10 ms
+                remaining = 0.01 if remaining is None else min(remaining, 0.01)
+                watched = [] if requests.closed else [requests.fd]
+            else:
+                watched = [pidfd] if requests.closed else [pidfd, requests.fd]
+            ready, _, _ = select.select(watched, [], [], remaining)
+            if requests.fd in ready and _is_cancel(requests.readline()):
+                return "cancelled"
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+
+def _kill_group(pid: int):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def serve():
+    """Boucle du modèle : une requête à la fois, jusqu'à la fermeture de l'entrée standard."""
+    # Même sys.path que la commande pytest : pas le dossier de ce fichier
+    if sys.path and os.path.abspath(sys.path[0] or ".") == os.path.dirname(os.path.abspath(__file__)):
+        del sys.path[0]
+    _warm_up()
+
+    # Les réponses passent par une copie de la sortie standard ; les enfants écrivent dans leurs fichiers
+    protocol_out = os.dup(1)
+    null_fd = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(null_fd, 1)
+    os.write(protocol_out, b'{"ready": true}\n')
+
+    requests = _Requests(sys.stdin.fileno())
+    while True:
+        line = requests.readline()
+        if line is None:
+            break
+        if not line.strip() or _is_cancel(line):
+            continue  # vide, ou annulation arrivée après la fin de l'exécution visée
+        request = json.loads(line)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            _run_child(request, protocol_out)
+        try:
+            os.setpgid(pid, pid)  # aussi côté modèle : le groupe existe avant un éventuel kill
+        except OSError:
+            pass
+        state = _wait(pid, request.get("timeout"), requests)
+        # Délai dépassé ou annulation : tout le groupe ; sinon les processus laissés par les tests
+        _kill_group(pid)
+        code = os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+        response = {"returncode": code, "timed_out": state == "timeout", "cancelled": state == "cancelled"}
+        os.write(protocol_out, (json.dumps(response) + "\n").encode("utf-8"))
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,199 @@
+"""
+Cache de résultats des outils (pylint, pytest) indexé par empreinte de contenu
+
+Deux niveaux :
+  - mémoire : LRU de `max_entries` résultats (OrderedDict)
+  - disque (optionnel) : un fichier JSON par résultat, directory/ab/<clé>.json,
+    plafonné à `max_bytes` ; au-delà, les fichiers les moins récemment lus ou
+    écrits sont supprimés
+
+Les valeurs sont des dict sérialisables en JSON. La clé est calculée par
+l'appelant (make_key) à partir de tout ce dont dépend le résultat.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def make_key(*parts) -> str:
+    """Empreinte SHA-256 d'une suite de morceaux (bytes ou texte)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        # Longueur en préfixe : ("ab", "c") et ("a", "bc") donnent deux clés différentes
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def local_imports(path: Path, source: bytes) -> list:
+    """
+    Modules voisins de `path` (même dossier) importés par `source`.
+
+    Ils font partie de la clé : une modification du module importé change le
+    résultat de l'outil sur `path`.
+
+    Returns:
+        list: (nom, chemin) triés par nom
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                names.add(node.module.split(".")[0])
+            if node.level:
+                names.update(alias.name for alias in node.names)
+    modules = []
+    for name in sorted(names):
+        for candidate in (path.parent / f"{name}.py", path.parent / name / "__init__.py"):
+            if candidate.is_file():
+                modules.append((name, candidate))
+                break
+    return modules
+
+
+class ResultCache:
+    """
+    Cache LRU en mémoire, doublé d'un stockage disque optionnel.
+
+    Args:
+        max_entries (int): Résultats gardés en mémoire.
+        directory: Dossier du stockage disque (None = mémoire seulement).
+        max_bytes (int): Taille maximale du stockage disque.
+    """
+
+    def __init__(self, max_entries: int = 256, directory=None, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # calculé au premier accès disque
+        self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, value: dict):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        """Retourne le résultat enregistré pour `key`, ou None."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+            value = self._read_disk(key)
+            if value is not None:
+                self._remember(key, value)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: dict):
+        """Enregistre un résultat (mémoire, puis disque si configuré)."""
+        with self._lock:
+            self._remember(key, value)
+            if self.directory is not None:
+                self._write_disk(key, value)
+
+    def _read_disk(self, key: str):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # date d'accès pour l'éviction
+            return value
+        except (OSError, ValueError):
+            # Absent, supprimé entre-temps par un autre processus ou illisible : simple défaut de cache
+            return None
+
+    def _scan_disk(self) -> list:
+        """(date, taille, chemin) des fichiers du stockage disque."""
+        files = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _write_disk(self, key: str, value: dict):
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        try:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+            previous = path.stat().st_size if path.exists() else 0
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._disk_bytes += len(data) - previous
+        if self._disk_bytes > self.max_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Supprime les fichiers les plus anciens jusqu'à 90 % du plafond."""
+        files = sorted(self._scan_disk())
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._disk_bytes = total
+
+    def clear(self):
+        """Vide la mémoire et le stockage disque."""
+        with self._lock:
+            self._memory.clear()
+            if self.directory is not None:
+                for _, _, path in self._scan_disk():
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                self._disk_bytes = 0
+
+    def stats(self) -> dict:
+        """Compteurs : hits (dont disk_hits), misses, entrées en mémoire, octets sur disque, évictions."""
+        with self._lock:
+            if self._disk_bytes is None and self.directory is not None:
+                self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes or 0,
+                "evictions": self.evictions,
+            }
@@ -1,102 +1,360 @@
 """
 Système de sauvegarde des logs - Data Officer
+
+Sauvegardes incrémentales dédupliquées, dans logs/backups/ :
+  - chaque fichier du journal (segments scellés, manifest des segments, fichier
+    actif) et du magasin de prompts (logs/prompt_store) est découpé en blocs de CHUNK_SIZE octets, stockés une seule fois
+    sous leur empreinte SHA-256 et compressés (zlib) : chunks/ab/abcd....zz
+  - chaque sauvegarde est un manifest (snapshots/experiment_data_<date>.json)
+    qui liste les fichiers, leur taille et leurs blocs
+  - un fichier inchangé depuis la sauvegarde précédente (même inode, taille et
+    date de modification : les segments scellés) reprend ses blocs sans être
+    relu ; les autres sont relus en entier et chaque bloc est haché, seuls les
+    blocs inconnus sont compressés et stockés (un fichier réécrit au milieu,
+    par compact_prompts ou une restauration, est donc sauvegardé correctement)
+
+La place occupée dépend des entrées ajoutées depuis la précédente ; la durée,
+de la taille du fichier actif (au plus config.MAX_LOG_SIZE_MB) et des fichiers
+modifiés. restore_backup() reconstruit les fichiers à l'identique (empreinte
+de chaque bloc vérifiée).
+
+Le magasin de prompts ne fait que grandir : à la restauration, il n'est
+réécrit que s'il a perdu des données (fichier absent ou plus court), les
+prompts ajoutés depuis restent disponibles. L'index SQLite est recréé.
+
+Les anciennes sauvegardes (copies complètes experiment_data_*.json / .jsonl)
+restent listées et restaurables.
 """
 
+import hashlib
+import json
+import os
 import shutil
+import sys
+import zlib
 from datetime import datetime
 from pathlib import Path
 
-def backup_experiment_data():
-    """Crée une sauvegarde du fichier de logs"""
-    
-    logs_path = Path(__file__).parent.parent.parent / "logs" / "experiment_data.json"
-    
-    if not logs_path.exists():
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import log_store
+from src.utils.log_index import get_index, get_index_path
+from src.utils.prompt_store import get_store
+from src.utils.file_lock import FileLock
+from src.utils.log_checkpoint import clear_checkpoints
+
+CHUNK_SIZE = 1 << 20  # 1 Mio
+PROMPT_STORE_PREFIX = "prompt_store/"
+SNAPSHOT_VERSION = 1
+COMPRESSION_LEVEL = 6
+
+
+def get_backup_dir() -> Path:
+    return log_store.LOGS_DIR / "backups"
+
+
+def _chunk_path(digest: str) -> Path:
+    return get_backup_dir() / "chunks" / digest[:2] / f"{digest}.zz"
+
+
+def _store_chunk(data: bytes, stats: dict) -> str:
+    """Enregistre un bloc s'il n'est pas déjà connu. Retourne son empreinte."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = _chunk_path(digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = zlib.compress(data, COMPRESSION_LEVEL)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(compressed)
+        os.replace(tmp_path, path)
+        stats["stored"] += len(compressed)
+        stats["new_chunks"] += 1
+    return digest
+
+
+def _read_chunk(digest: str) -> bytes:
+    data = zlib.decompress(_chunk_path(digest).read_bytes())
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f"Bloc corrompu: {digest}")
+    return data
+
+
+def _snapshot_file(path: Path, name: str, previous: dict, stats: dict) -> dict:
+    """
+    Découpe un fichier du journal en blocs.
+
+    Args:
+        path (Path): Fichier à sauvegarder.
+        name (str): Nom du fichier dans le manifest.
+        previous (dict): Le même fichier dans la sauvegarde précédente (ou None).
+        stats (dict): Compteurs read / stored / new_chunks mis à jour.
+
+    Returns:
+        dict: {"path", "size", "stat", "chunks"} pour le manifest de la sauvegarde.
+    """
+    status = path.stat()
+    size = status.st_size
+    signature = [status.st_ino, status.st_mtime_ns]
+    if previous and previous.get("stat") == signature and previous["size"] == size:
+        # Fichier inchangé (segment scellé) : mêmes blocs, sans relecture
+        return {"path": name, "size": size, "stat": signature, "chunks": previous["chunks"]}
+    chunks = []
+    offset = 0
+    with open(path, "rb") as f:
+        # Lecture limitée à la taille relevée : une écriture concurrente n'y est pas incluse.
+        # Chaque bloc est haché ; _store_chunk ne compresse que les blocs inconnus.
+        while offset < size:
+            data = f.read(min(CHUNK_SIZE, size - offset))
+            if not data:
+                break
+            chunks.append(_store_chunk(data, stats))
+            offset += len(data)
+            stats["read"] += len(data)
+    return {"path": name, "size": offset, "stat": signature if offset == size else None, "chunks": chunks}
+
+
+def _journal_files() -> list:
+    """
+    Fichiers qui composent le journal : segments, manifest des segments et fichiers
+    actifs des deux formats (l'autre format sert de repli selon config.LOG_FORMAT).
+    """
+    files = [path for path in log_store.log_sources() if path.exists()]
+    for path in (log_store.MANIFEST_FILE, log_store.JSON_LOG_FILE, log_store.JSONL_LOG_FILE):
+        if path.exists() and path not in files:
+            files.append(path)
+    return files
+
+
+def _prompt_store_files() -> list:
+    """Fichiers du magasin de prompts (les entrées n'y gardent qu'une référence)."""
+    store = get_store()
+    return [path for path in (store.pack_path, store.index_path) if path.exists()]
+
+
+def _backup_name(path: Path) -> str:
+    store_root = get_store().root
+    if path.parent == store_root:
+        return PROMPT_STORE_PREFIX + path.name
+    return path.relative_to(log_store.LOGS_DIR).as_posix()
+
+
+def _restore_path(name: str) -> Path:
+    if name.startswith(PROMPT_STORE_PREFIX):
+        return get_store().root / name[len(PROMPT_STORE_PREFIX):]
+    return log_store.LOGS_DIR / name
+
+
+def _list_snapshots() -> list:
+    return sorted((get_backup_dir() / "snapshots").glob("experiment_data_*.json"))
+
+
+def _read_snapshot(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def backup_experiment_data(full: bool = False):
+    """
+    Crée une sauvegarde incrémentale du journal (tous formats, segments compris).
+
+    Args:
+        full (bool): Relit et redécoupe tous les fichiers au lieu de reprendre les
+            blocs de la sauvegarde précédente (les blocs restent dédupliqués).
+
+    Returns:
+        Path: Manifest de la sauvegarde créée (None en cas d'échec).
+    """
+    if not _journal_files():
         print(" Fichier source introuvable pour la sauvegarde ")
         return None
-    
-    # Créer le dossier de backup s'il n'existe pas - Create backup directory if not exists 
-    backup_dir = logs_path.parent / "backups"
-    backup_dir.mkdir(exist_ok=True)
-    
-    # Nom du fichier de backup avec timestamp - Backup filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Nom de la sauvegarde avec horodatage - Backup name with timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
     backup_name = f"experiment_data_{timestamp}.json"
-    backup_path = backup_dir / backup_name
-    
-    # Copie
+    backup_path = get_backup_dir() / "snapshots" / backup_name
+
     try:
-        shutil.copy2(logs_path, backup_path)
-        print(f" Sauvegarde créée: {backup_name}")
+        snapshots = _list_snapshots()
+        previous = {} if full or not snapshots else {
+            item["path"]: item for item in _read_snapshot(snapshots[-1])["files"]}
+        stats = {"read": 0, "stored": 0, "new_chunks": 0}
+        # Sous le verrou du journal : pas d'ajout ni de rotation pendant la sauvegarde
+        with FileLock(log_store.LOCK_FILE):
+            files = []
+            for path in _journal_files():
+                name = _backup_name(path)
+                files.append(_snapshot_file(path, name, previous.get(name), stats))
+        # Magasin de prompts ensuite : il contient au moins les prompts référencés ci-dessus
+        if _prompt_store_files():
+            with FileLock(get_store().lock_path):
+                for path in _prompt_store_files():
+                    name = _backup_name(path)
+                    files.append(_snapshot_file(path, name, previous.get(name), stats))
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "chunk_size": CHUNK_SIZE,
+            "size": sum(item["size"] for item in files),
+            "stored": stats["stored"],
+            "files": files,
+        }
+        backup_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = backup_path.with_name(backup_name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=1)
+        os.replace(tmp_path, backup_path)
+
+        print(f" Sauvegarde créée: {backup_name} ({snapshot['size'] / 1024 / 1024:.2f} MB, "
+              f"{stats['new_chunks']} nouveaux blocs, +{stats['stored'] / 1024 / 1024:.2f} MB stockés)")
         return backup_path
     except Exception as e:
         print(f" Erreur lors de la sauvegarde: {e}")
         return None
 
+
 def list_backups():
-    """Liste toutes les sauvegardes disponibles"""
-    
-    backup_dir = Path(__file__).parent.parent.parent / "logs" / "backups"
-    
+    """Liste toutes les sauvegardes disponibles (incrémentales et anciennes copies complètes)"""
+
+    backup_dir = get_backup_dir()
+
     if not backup_dir.exists():
         print(" Aucune sauvegarde trouvée")
         return []
-    
-    backups = list(backup_dir.glob("experiment_data_*.json"))
-    backups.sort(reverse=True)  # Plus récent en premier
-    
+
+    backups = (list(backup_dir.glob("experiment_data_*.json")) + list(backup_dir.glob("experiment_data_*.jsonl"))
+               + _list_snapshots())
+    backups.sort(key=lambda b: b.stem, reverse=True)  # Plus récent en premier
+
     print(" SAUVEGARDES DISPONIBLES:")
     for i, backup in enumerate(backups[:10]):  # 10 plus récentes
-        size_mb = backup.stat().st_size / 1024 / 1024
-        print(f"   {i+1}. {backup.name} ({size_mb:.2f} MB)")
-    
+        if backup.parent.name == "snapshots":
+            snapshot = _read_snapshot(backup)
+            size_mb = snapshot["size"] / 1024 / 1024
+            stored_mb = snapshot["stored"] / 1024 / 1024
+            print(f"   {i+1}. {backup.stem} ({size_mb:.2f} MB, incrémentale +{stored_mb:.2f} MB)")
+        else:
+            size_mb = backup.stat().st_size / 1024 / 1024
+            print(f"   {i+1}. {backup.name} ({size_mb:.2f} MB)")
+
     return backups
 
+
+def _remove_journal():
+    """Supprime le journal actuel (fichiers actifs, fichiers en cours de scellement, segments)."""
+    for path in (log_store.JSON_LOG_FILE, log_store.JSONL_LOG_FILE):
+        for candidate in (path, path.with_name(path.name + log_store.SEALING_SUFFIX)):
+            if candidate.exists():
+                candidate.unlink()
+    if log_store.SEGMENTS_DIR.exists():
+        shutil.rmtree(log_store.SEGMENTS_DIR)
+
+
+def _restore_snapshot(backup_path: Path):
+    """Reconstruit les fichiers d'une sauvegarde incrémentale, puis remplace le journal."""
+    snapshot = _read_snapshot(backup_path)
+    missing = [digest for item in snapshot["files"] for digest in item["chunks"]
+               if not _chunk_path(digest).exists()]
+    if missing:
+        raise FileNotFoundError(f"{len(missing)} blocs manquants dans {get_backup_dir() / 'chunks'}")
+
+    # Reconstruction dans un dossier temporaire : le journal actuel reste intact en cas d'erreur
+    staging = get_backup_dir() / "restore"
+    shutil.rmtree(staging, ignore_errors=True)
+    restored, prompt_files = [], []
+    try:
+        for index, item in enumerate(snapshot["files"]):
+            destination = _restore_path(item["path"])
+            if item["path"].startswith(PROMPT_STORE_PREFIX):
+                # Magasin de prompts : seulement s'il a perdu des données depuis la sauvegarde
+                if destination.exists() and destination.stat().st_size >= item["size"]:
+                    continue
+                target = prompt_files
+            else:
+                target = restored
+            tmp_path = staging / f"{index:06d}"
+            tmp_path.parent.mkdir(parents=True, exist_ok=True)
+            target.append((tmp_path, destination))
+            with open(tmp_path, "wb") as f:
+                for digest in item["chunks"]:
+                    f.write(_read_chunk(digest))
+            if tmp_path.stat().st_size != item["size"]:
+                raise ValueError(f"Taille incorrecte après reconstruction: {item['path']}")
+
+        if prompt_files:
+            with FileLock(get_store().lock_path):
+                for tmp_path, destination in prompt_files:
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(tmp_path, destination)
+        with FileLock(log_store.LOCK_FILE):
+            _remove_journal()
+            for tmp_path, destination in restored:
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, destination)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
 def restore_backup(backup_number=1):
     """Restaure une sauvegarde"""
-    
+
     backups = list_backups()
-    
+
     if not backups:
         print(" Aucune sauvegarde à restaurer")
         return False
-    
+
     if backup_number < 1 or backup_number > len(backups):
         print(f" Numéro invalide. Choisissez entre 1 et {len(backups)}")
         return False
-    
+
     backup_to_restore = backups[backup_number - 1]
-    destination = backup_to_restore.parent.parent / "experiment_data.json"
-    
+
     try:
         # Sauvegarde de l'actuel d'abord
         current_backup = backup_experiment_data()
         if current_backup:
             print(f" Sauvegarde actuelle: {current_backup.name}")
-        
-        # Restauration
-        shutil.copy2(backup_to_restore, destination)
+
+        # Restauration : la sauvegarde remplace tout le journal (segments compris)
+        if backup_to_restore.parent.name == "snapshots":
+            _restore_snapshot(backup_to_restore)
+        else:
+            # Ancienne copie complète : son format (.json / .jsonl) détermine le fichier restauré
+            destination = log_store.LOGS_DIR / f"experiment_data{backup_to_restore.suffix}"
+            tmp_path = destination.with_name(destination.name + ".restore")
+            shutil.copy2(backup_to_restore, tmp_path)
+            # Sous le verrou du journal, comme _restore_snapshot : aucun ajout entre suppression et copie
+            with FileLock(log_store.LOCK_FILE):
+                _remove_journal()
+                os.replace(tmp_path, destination)
+        # Le journal a changé : la prochaine validation repart de zéro, l'index est recréé
+        clear_checkpoints()
+        if get_index_path().exists():
+            get_index().rebuild()
         print(f" Restauré: {backup_to_restore.name}")
         return True
-        
+
     except Exception as e:
         print(f" Erreur restauration: {e}")
         return False
 
 if __name__ == "__main__":
     import sys
-    
+
     if len(sys.argv) > 1:
         command = sys.argv[1]
-        
+
         if command == "backup":
-            backup_experiment_data()
+            backup_experiment_data(full="--full" in sys.argv)
         elif command == "list":
             list_backups()
         elif command == "restore" and len(sys.argv) > 2:
             restore_backup(int(sys.argv[2]))
         else:
-            print("Usage: python backup_logs.py [backup|list|restore <num>]")
+            print("Usage: python backup_logs.py [backup [--full]|list|restore <num>]")
     else:
         # Par défaut: faire une sauvegarde
-        backup_experiment_data()
\ No newline at end of file
+        backup_experiment_data()
@@ -6,6 +6,32 @@ Configuration constants for the Refactoring Swarm.
 MAX_ITERATIONS = 10
 QUALITY_THRESHOLD = 8.0  # Minimum pylint score (0-10)
 TEST_TIMEOUT = 30  # seconds per test file
+TEST_CASE_TIMEOUT = 10  # secondes par test (processus pytest préchauffés)
+# Pylint gardé chargé dans le processus entre deux fichiers (sinon un processus `pylint` par appel)
+PYLINT_IN_PROCESS = True
+# Cache des rapports pylint par contenu : LRU en mémoire + stockage disque optionnel
+PYLINT_CACHE = True
+PYLINT_CACHE_SIZE = 256  # rapports gardés en mémoire
+PYLINT_CACHE_DIR = None  # ex: ".cache/pylint" (None = mémoire seulement)
+PYLINT_CACHE_MAX_MB = 64
+# Processus pytest préchauffés (pytest déjà importé), un fork isolé par exécution
+PYTEST_WARM_POOL = True
+PYTEST_POOL_SIZE = 2  # modèles démarrés d'avance ; sans gouverneur, aussi le maximum (avec : sa limite "test")
+# Cache des résultats pytest par contenu (test + modules importés), sur disque et plafonné
+PYTEST_CACHE = True
+PYTEST_CACHE_SIZE = 256  # résultats gardés en mémoire
+PYTEST_CACHE_DIR = ".cache/pytest"  # relatif à la racine du projet (None = mémoire seulement)
+PYTEST_CACHE_MAX_MB = 64
+# Mode retour rapide de la boucle de self-healing : arrêt après N échecs, sortie bornée
+PYTEST_FEEDBACK_MAX_FAILURES = 3
+PYTEST_FEEDBACK_OUTPUT_CHARS = 20000  # par flux (stdout, stderr) : début et fin gardés
+# Gouverneur des exécutions pylint / pytest : places par type, files FIFO (src/tools/governor.py)
+GOVERNOR_ENABLED = True
+GOVERNOR_LINT_SLOTS = None  # None = moitié des cœurs (au moins 1)
+GOVERNOR_TEST_SLOTS = None  # None = le reste des cœurs (au moins 1)
+GOVERNOR_LINT_PROCESS_MB = 250  # mémoire estimée d'une exécution pylint
+GOVERNOR_TEST_PROCESS_MB = 200  # mémoire estimée d'une exécution pytest
+GOVERNOR_MEMORY_RESERVE_MB = 512  # mémoire laissée libre au reste de la machine
 
 # Path Configuration
 SANDBOX_DIR = "sandbox"
@@ -25,4 +51,20 @@ BLACKLISTED_IMPORTS = [
 
 # Logging Configuration
 LOG_FILE = "logs/experiment_data.json"
-MAX_LOG_SIZE_MB = 10
\ No newline at end of file
+MAX_LOG_SIZE_MB = 10
+# "json" : tableau unique réécrit à chaque entrée (format historique du TP)
+# "jsonl" : une entrée par ligne, ajout en fin de fichier (logs/experiment_data.jsonl)
+LOG_FORMAT = "json"
+# Écriture asynchrone : file bornée vidée par lots par un thread de fond
+LOG_ASYNC = True
+LOG_FLUSH_INTERVAL = 0.5  # secondes avant d'écrire un lot incomplet
+LOG_BATCH_SIZE = 64  # entrées max par écriture
+LOG_QUEUE_SIZE = 1000  # au-delà, log_experiment attend (backpressure)
+# Prompts stockés une seule fois dans logs/prompt_store/ (les entrées gardent une référence)
+LOG_PROMPT_STORE = False
+PROMPT_STORE_FIELDS = ("input_prompt",)
+PROMPT_STORE_MIN_CHARS = 512  # les prompts plus courts restent dans l'entrée
+# Index SQLite (logs/experiment_index.sqlite) mis à jour par l'écrivain de fond et avant chaque recherche
+LOG_INDEX = True
+# Validation incrémentale : état des checkers enregistré dans logs/checkpoints/
+VALIDATION_CHECKPOINTS = True
@@ -0,0 +1,82 @@
+"""
+Verrou de fichier inter-processus - Data Officer
+
+Utilisé pour que plusieurs workers main.py (ou plusieurs threads) puissent écrire
+dans le même journal sans perdre ni entrelacer d'entrées.
+  - POSIX   : fcntl.flock (verrou exclusif sur un fichier .lock)
+  - Windows : msvcrt.locking sur le premier octet du fichier .lock
+"""
+
+import os
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Verrou exclusif bloquant, utilisable avec `with`.
+
+    Args:
+        path (Path): Fichier de verrou (créé s'il n'existe pas).
+        timeout (float): Attente max en secondes (None = illimitée).
+    """
+
+    def __init__(self, path, timeout: float = None):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._fd = None
+
+    def acquire(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        try:
+            if fcntl is not None and deadline is None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                while not self._try_lock(fd):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise TimeoutError(f"Verrou {self.path} non obtenu après {self.timeout}s")
+                    time.sleep(0.01)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return self
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    @staticmethod
+    def _try_lock(fd) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
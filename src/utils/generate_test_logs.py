@@ -1,64 +1,469 @@
 """
 Générateur de logs de test - Data Officer
+
+Générateur de charge pour les benchmarks du pipeline de logs : écrit des
+millions d'entrées au format de log_experiment() sans jamais les garder en
+mémoire (une entrée à la fois), en tableau JSON ou en JSON Lines.
+
+Le contenu suit un profil (LogProfile) : mélange agents / modèles / actions,
+statuts, tailles des prompts et des réponses, champs de details. Le profil par
+défaut reprend les appels réels des agents (Auditor, Fixer, Judge) ; il peut
+aussi être appris d'un journal existant (learn_profile) puis enregistré.
+Avec une graine (seed), le fichier produit est identique octet pour octet.
+Par défaut, le journal est écrit dans logs/synthetic/ : le vrai journal
+(logs/experiment_data.*) n'est remplacé que s'il est passé à --output.
+
+Usage:
+    python src/utils/generate_test_logs.py                       # 20 entrées (logs/synthetic/)
+    python src/utils/generate_test_logs.py --entries 5000000 --format jsonl --seed 42 --output /tmp/big.jsonl
+    python src/utils/generate_test_logs.py --entries 1000000 --learn logs/experiment_data.json --seed 1
+    python src/utils/generate_test_logs.py --learn --save-profile profile.json --entries 0
 """
 
+import itertools
 import json
+import math
+import os
 import random
+import sys
+import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 
-def generate_test_logs(num_entries=20):
-    """Génère des logs de test valides"""
-    
-    logs_dir = Path(__file__).parent.parent.parent / "logs"
-    logs_dir.mkdir(exist_ok=True)
-    
-    logs_file = logs_dir / "experiment_data.json"
-    
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import config, log_store
+
+
+def get_synthetic_dir() -> Path:
+    """Dossier par défaut des journaux générés (séparé du vrai journal)."""
+    return log_store.LOGS_DIR / "synthetic"
+
+PROMPTS_DIR = PROJECT_ROOT / "src" / "prompts"
+FILE_FIELDS = ("file_analyzed", "file_fixed", "file_evaluated")
+TEXT_FIELDS = ("input_prompt", "output_response")
+MAX_SAMPLES = 2000  # longueurs gardées par type d'entrée (échantillonnage par réservoir)
+MAX_VALUES = 16  # valeurs d'exemple gardées par champ de details
+MAX_FILES = 1000  # chemins de fichiers gardés
+DEFAULT_INTERVAL = 30.0  # secondes entre deux entrées (moyenne)
+
+# Profil par défaut : les appels log_experiment() des agents (src/agents/*.py).
+# Longueurs en caractères : {"median", "sigma"} d'une loi log-normale.
+DEFAULT_KINDS = [
+    {
+        "agent": "AuditorAgent", "model": "llama-3.3-70b-versatile", "action": "CODE_ANALYSIS",
+        "weight": 30, "statuses": {"SUCCESS": 1},
+        "template": "auditor_prompt.txt", "file_field": "file_analyzed",
+        "prompt": {"median": 3500, "sigma": 0.5}, "response": {"median": 900, "sigma": 0.6},
+        "extra": {"issues_detected": [0, 1, 2, 3, 4, 5, 8]},
+    },
+    {
+        "agent": "FixerAgent", "model": "llama-3.3-70b-versatile", "action": "FIX",
+        "weight": 30, "statuses": {"SUCCESS": 1},
+        "template": "fixer_prompt.txt", "file_field": "file_fixed",
+        "prompt": {"median": 5000, "sigma": 0.5}, "response": {"median": 2000, "sigma": 0.7},
+        "extra": {"issues_count": [1, 2, 3, 4, 6], "code_length_before": [800, 1500, 2400, 4000],
+                  "code_length_after": [900, 1600, 2500, 4200]},
+    },
+    {
+        "agent": "JudgeAgent", "model": "llama-3.3-70b-versatile", "action": "CODE_GEN",
+        "weight": 10, "statuses": {"SUCCESS": 1},
+        "template": "judge_prompt.txt", "file_field": "file_analyzed",
+        "prompt": {"median": 3000, "sigma": 0.4}, "response": {"median": 1800, "sigma": 0.5},
+        "extra": {"module_name": ["main", "utils", "agent", "calculator"], "tests_detected": [2, 3, 4, 5, 6]},
+    },
+    {
+        "agent": "JudgeAgent", "model": "llama-3.3-70b-versatile", "action": "DEBUG",
+        "weight": 25, "statuses": {"SUCCESS": 6, "FAILURE": 4},
+        "file_field": "file_evaluated",
+        "prompt": {"median": 30, "sigma": 0.1}, "response": {"median": 45, "sigma": 0.1},
+        "extra": {"pytest_passed": [True, False], "pylint_score": [4.5, 6.25, 7.8, 8.5, 9.1, 10.0],
+                  "tests_generated": [True, False], "errors": [[]]},
+    },
+    {
+        "agent": "JudgeAgent", "model": "llama-3.3-70b-versatile", "action": "CODE_ANALYSIS",
+        "weight": 5, "statuses": {"SUCCESS": 1},
+        "prompt": {"median": 2500, "sigma": 0.5}, "response": {"median": 700, "sigma": 0.6},
+        "extra": {"issues_detected": [0, 1, 2, 3]},
+    },
+]
+DEFAULT_FILES = [f"sandbox/module_{i}.py" for i in range(200)]
+
+
+def _weighted(weights: dict):
+    """(valeurs, poids cumulés) pour random.choices(cum_weights=...)."""
+    values = list(weights)
+    return values, list(itertools.accumulate(weights[value] for value in values))
+
+
+class LogProfile:
+    """
+    Distribution des entrées à générer.
+
+    Args:
+        kinds (list): Types d'entrées (dict) : agent, model, action, weight,
+            statuses {statut: poids}, file_field, template (fichier de
+            src/prompts/), prompt / response ({"median", "sigma"} ou
+            {"samples": [...]}), missing {champ: probabilité}, extra
+            {champ de details: [valeurs possibles]}.
+        files (list): Chemins de fichiers utilisés pour file_analyzed & co.
+        interval (float): Écart moyen entre deux entrées (secondes).
+    """
+
+    def __init__(self, kinds: list, files: list = None, interval: float = DEFAULT_INTERVAL):
+        if not kinds:
+            raise ValueError(" Profil vide : aucun type d'entrée")
+        self.kinds = kinds
+        self.files = files or DEFAULT_FILES
+        self.interval = interval
+
+    @classmethod
+    def default(cls) -> "LogProfile":
+        return cls([dict(kind) for kind in DEFAULT_KINDS])
+
+    def to_dict(self) -> dict:
+        return {"kinds": self.kinds, "files": self.files, "interval": self.interval}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LogProfile":
+        return cls(data["kinds"], data.get("files"), data.get("interval", DEFAULT_INTERVAL))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path) -> "LogProfile":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def learn_profile(path=None, max_samples: int = MAX_SAMPLES) -> LogProfile:
+    """
+    Apprend un profil en parcourant un journal existant (en flux, mémoire bornée).
+
+    Les entrées sont regroupées par (agent, modèle, action, champ fichier) ; pour
+    chaque groupe on garde le poids, les statuts, un échantillon des longueurs
+    de prompts / réponses, la fréquence des champs manquants et quelques
+    valeurs des autres champs de details.
+
+    Args:
+        path: Fichier de logs (par défaut tout le journal, segments compris).
+        max_samples (int): Longueurs gardées par groupe.
+
+    Returns:
+        LogProfile: Le profil appris.
+    """
+    sampler = random.Random(0)  # échantillonnage reproductible
+    kinds = {}
+    files, seen_files = [], 0
+    first_time = last_time = None
+    entries = 0
+
+    for entry in log_store.iter_log_entries(path):
+        if not isinstance(entry, dict):
+            continue
+        entries += 1
+        details = entry.get("details") if isinstance(entry.get("details"), dict) else {}
+        file_field = next((field for field in FILE_FIELDS if field in details), None)
+        # Anciens logs : 'agent_name' / 'model_used'
+        agent = entry.get("agent", entry.get("agent_name"))
+        model = entry.get("model", entry.get("model_used"))
+        key = (agent, model, entry.get("action"), file_field)
+        kind = kinds.get(key)
+        if kind is None:
+            kind = kinds[key] = {
+                "agent": agent, "model": model, "action": entry.get("action"),
+                "weight": 0, "statuses": {}, "file_field": file_field,
+                "prompt": {"samples": []}, "response": {"samples": []},
+                "missing": {field: 0 for field in TEXT_FIELDS}, "extra": {},
+            }
+        kind["weight"] += 1
+        status = entry.get("status")
+        kind["statuses"][status] = kind["statuses"].get(status, 0) + 1
+
+        for field, spec in zip(TEXT_FIELDS, ("prompt", "response")):
+            value = details.get(field)
+            if value is None:
+                kind["missing"][field] += 1
+                continue
+            samples = kind[spec]["samples"]
+            length = len(value) if isinstance(value, str) else len(str(value))
+            # Réservoir : chaque longueur a la même probabilité d'être gardée
+            seen = kind["weight"] - kind["missing"][field]
+            if len(samples) < max_samples:
+                samples.append(length)
+            else:
+                index = sampler.randrange(seen)
+                if index < max_samples:
+                    samples[index] = length
+
+        for field, value in details.items():
+            if field in TEXT_FIELDS or field == file_field:
+                continue
+            values = kind["extra"].setdefault(field, [])
+            if len(values) < MAX_VALUES and value not in values and len(json.dumps(value, default=str)) <= 200:
+                values.append(value)
+
+        if file_field and isinstance(details[file_field], str):
+            seen_files += 1
+            if len(files) < MAX_FILES:
+                files.append(details[file_field])
+            else:
+                index = sampler.randrange(seen_files)
+                if index < MAX_FILES:
+                    files[index] = details[file_field]
+
+        timestamp = entry.get("timestamp")
+        if isinstance(timestamp, str):
+            try:
+                moment = datetime.fromisoformat(timestamp.rstrip("Z"))
+            except ValueError:
+                moment = None
+            if moment is not None:
+                first_time = first_time or moment
+                last_time = moment
+
+    if not entries:
+        raise ValueError(" Journal vide : impossible d'apprendre un profil")
+
+    learned = []
+    for kind in kinds.values():
+        for field, missing in kind["missing"].items():
+            kind["missing"][field] = missing / kind["weight"]
+        for spec in ("prompt", "response"):
+            if not kind[spec]["samples"]:
+                kind[spec] = {"median": 0, "sigma": 0}
+            else:
+                kind[spec]["samples"].sort()
+        # Statuts manquants : clé JSON valide pour save()
+        kind["statuses"] = {("UNKNOWN" if status is None else str(status)): count
+                            for status, count in kind["statuses"].items()}
+        learned.append(kind)
+
+    interval = DEFAULT_INTERVAL
+    if first_time and last_time and entries > 1 and last_time > first_time:
+        interval = (last_time - first_time).total_seconds() / (entries - 1)
+    return LogProfile(learned, files or None, interval)
+
+
+def _code_corpus(size: int = 1 << 18) -> str:
+    """Texte source pseudo-réaliste dans lequel les prompts et réponses sont découpés."""
+    rng = random.Random(0)
+    names = ["value", "items", "result", "config", "data", "index", "total", "path", "node", "cache"]
+    parts = []
+    length = 0
+    while length < size:
+        name = rng.choice(names)
+        block = (f"def {name}_{rng.randrange(1000)}({rng.choice(names)}, {rng.choice(names)}=None):\n"
+                 f"    \"\"\"Calcule {name} ({rng.randrange(100)}).\"\"\"\n"
+                 f"    if {rng.choice(names)} is None:\n"
+                 f"        return {rng.randrange(100)}\n"
+                 f"    return [{name} * {rng.randrange(10)} for {name} in range({rng.randrange(50)})]\n\n")
+        parts.append(block)
+        length += len(block)
+    return "".join(parts)
+
+
+class EntryGenerator:
+    """
+    Itérateur d'entrées synthétiques (une à la fois).
+
+    Args:
+        profile (LogProfile): Distribution des entrées (défaut : LogProfile.default()).
+        seed (int): Graine ; None = aléatoire. Avec une graine, les horodatages
+            partent du 2025-01-01 et la sortie est reproductible.
+        start (datetime): Horodatage de la première entrée.
+    """
+
+    def __init__(self, profile: LogProfile = None, seed: int = None, start: datetime = None):
+        self.profile = profile or LogProfile.default()
+        self.rng = random.Random(seed)
+        if start is None:
+            start = datetime(2025, 1, 1) if seed is not None else datetime.now() - timedelta(hours=2)
+        self.time = start
+        self.corpus = _code_corpus()
+        self.templates = {}
+        self.kinds, self.kind_weights = _weighted({index: kind["weight"]
+                                                   for index, kind in enumerate(self.profile.kinds)})
+        self.statuses = [_weighted(kind["statuses"] or {"SUCCESS": 1}) for kind in self.profile.kinds]
+
+    def _template(self, name: str) -> str:
+        if name not in self.templates:
+            path = PROMPTS_DIR / name if name else None
+            self.templates[name] = path.read_text(encoding="utf-8") if path and path.exists() else ""
+        return self.templates[name]
+
+    def _length(self, spec: dict) -> int:
+        samples = spec.get("samples")
+        if samples:
+            return samples[self.rng.randrange(len(samples))]
+        if not spec.get("median"):
+            return 0
+        return max(1, int(self.rng.lognormvariate(math.log(spec["median"]), spec.get("sigma", 0))))
+
+    def _text(self, length: int, header: str = "") -> str:
+        if length <= len(header):
+            header = ""
+        header = header + "\n\n" if header else ""
+        remaining = length - len(header)
+        start = self.rng.randrange(len(self.corpus))
+        text = self.corpus[start:start + remaining]
+        while len(text) < remaining:
+            text += self.corpus[:remaining - len(text)]
+        return header + text
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        rng = self.rng
+        index = rng.choices(self.kinds, cum_weights=self.kind_weights)[0]
+        kind = self.profile.kinds[index]
+        statuses, status_weights = self.statuses[index]
+
+        details = {}
+        if kind.get("file_field"):
+            details[kind["file_field"]] = self.profile.files[rng.randrange(len(self.profile.files))]
+        missing = kind.get("missing", {})
+        if rng.random() >= missing.get("input_prompt", 0):
+            details["input_prompt"] = self._text(self._length(kind["prompt"]), self._template(kind.get("template")))
+        if rng.random() >= missing.get("output_response", 0):
+            details["output_response"] = self._text(self._length(kind["response"]))
+        for field, values in kind.get("extra", {}).items():
+            if values:
+                details[field] = values[rng.randrange(len(values))]
+
+        self.time += timedelta(seconds=rng.expovariate(1 / self.profile.interval) if self.profile.interval else 0)
+        status = rng.choices(statuses, cum_weights=status_weights)[0]
+        return {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "timestamp": self.time.isoformat(),
+            "agent": kind["agent"],
+            "model": kind["model"],
+            "action": kind["action"],
+            "details": details,
+            "status": None if status == "UNKNOWN" else status,
+        }
+
+
+def write_log(path, entries, fmt: str, max_bytes: int = None) -> int:
+    """
+    Écrit des entrées en flux dans un fichier de logs.
+
+    Le tableau JSON a la même mise en forme que log_store (json.dump, indent=4),
+    un ajout ultérieur par le logger le réécrit donc à l'identique. Le fichier
+    est écrit à côté puis renommé : un journal existant n'est jamais tronqué.
+
+    Args:
+        path: Fichier à écrire.
+        entries: Itérable d'entrées (consommé au fur et à mesure).
+        fmt (str): "json" ou "jsonl".
+        max_bytes (int): Arrête l'écriture une fois cette taille atteinte
+            (comptée en caractères, proche des octets pour ce contenu).
+
+    Returns:
+        int: Nombre d'entrées écrites.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    written = count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                if fmt == log_store.FORMAT_JSONL:
+                    text = json.dumps(entry, ensure_ascii=False) + "\n"
+                else:
+                    text = ("[" if not count else ",") + "\n    " + json.dumps(
+                        entry, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+                f.write(text)
+                count += 1
+                written += len(text)
+                if max_bytes is not None and written >= max_bytes:
+                    break
+            if fmt != log_store.FORMAT_JSONL:
+                f.write("\n]" if count else "[]")
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
+
+
+def generate_test_logs(num_entries=20, fmt: str = None, path=None, seed: int = None,
+                       profile: LogProfile = None, learn_from=None, max_bytes: int = None):
+    """
+    Génère des logs de test valides.
+
+    Args:
+        num_entries (int): Nombre d'entrées (None = jusqu'à max_bytes).
+        fmt (str): "json" ou "jsonl" (défaut : config.LOG_FORMAT).
+        path: Fichier à écrire (défaut : logs/synthetic/experiment_data.<format>).
+        seed (int): Graine pour une sortie reproductible.
+        profile (LogProfile): Distribution des entrées (défaut : agents réels).
+        learn_from: Journal dont le profil est appris (True = journal actuel),
+            ignoré si `profile` est fourni.
+        max_bytes (int): Taille maximale approximative du fichier (en caractères).
+
+    Returns:
+        Path: Le fichier écrit.
+    """
+    fmt = fmt or config.LOG_FORMAT
+    logs_file = Path(path) if path else get_synthetic_dir() / log_store.get_log_path(fmt).name
+
     print("=" * 60)
     print(" GÉNÉRATION DE LOGS DE TEST - Data Officer")
     print("=" * 60)
-    
-    # Données de test
-    agents = ["Auditor_Agent", "Fixer_Agent", "JudgeAgent"]
-    models = ["gemini-2.5-flash", "llama-3.3-70b-versatile", "gpt-4o-mini"]
-    actions = ["ANALYSIS", "FIX", "GENERATION", "DEBUG"]
-    files = ["main.py", "utils.py", "agent.py", "test_file.py"]
-    
-    # Génération
-    logs_data = []
-    base_time = datetime.now() - timedelta(hours=2)
-    
-    for i in range(num_entries):
-        timestamp = (base_time + timedelta(minutes=i*5)).isoformat() + "Z"
-        
-        log = {
-            "agent_name": random.choice(agents),
-            "model_used": random.choice(models),
-            "action": random.choice(actions),
-            "timestamp": timestamp,
-            "details": {
-                "input_prompt": f"Prompt de test #{i+1} - Analyse du code pour amélioration",
-                "output_response": f"Réponse de test #{i+1} - J'ai trouvé {random.randint(1,5)} problèmes",
-                "file_analyzed": random.choice(files),
-                "issues_found": random.randint(1, 5)
-            },
-            "status": "SUCCESS" if random.random() > 0.1 else "ERROR"
-        }
-        
-        logs_data.append(log)
-    
-    # Sauvegarde
-    with open(logs_file, 'w', encoding='utf-8') as f:
-        json.dump(logs_data, f, indent=2, ensure_ascii=False)
-    
-    print(f" {num_entries} logs générés")
+
+    if profile is None and learn_from is not None:
+        # Profil appris en entier avant d'écrire (le journal source peut être la destination)
+        profile = learn_profile(None if learn_from is True else learn_from)
+        print(f" Profil appris: {len(profile.kinds)} types d'entrées")
+
+    entries = EntryGenerator(profile, seed)
+    if num_entries is not None:
+        entries = itertools.islice(entries, num_entries)
+    count = write_log(logs_file, entries, fmt, max_bytes)
+
+    print(f" {count} logs générés")
     print(f" Chemin: {logs_file}")
-    print("\n Utilisation:")
-    print("   1. python src/utils/validate_logs.py")
-    print("   2. python src/data_quality/check_all_agents.py")
-    
+    if logs_file.resolve() == log_store.get_log_path(fmt).resolve():
+        print("\n Utilisation:")
+        print("   1. python src/utils/validate_logs.py")
+        print("   2. python src/data_quality/check_all_agents.py")
+    else:
+        print(" (le journal réel n'est pas modifié ; --output logs/experiment_data.<format> pour le remplacer)")
+
     return logs_file
 
+
 if __name__ == "__main__":
-    generate_test_logs()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Générateur de logs de test (charge synthétique)")
+    parser.add_argument("--entries", type=int, default=20, help="nombre d'entrées")
+    parser.add_argument("--size-mb", type=float, help="taille maximale (Mo), avec --entries 0 = sans limite d'entrées")
+    parser.add_argument("--format", choices=[log_store.FORMAT_JSON, log_store.FORMAT_JSONL], help="défaut : config.LOG_FORMAT")
+    parser.add_argument("--output", help="fichier à écrire (défaut : logs/synthetic/experiment_data.<format>)")
+    parser.add_argument("--seed", type=int, help="graine (sortie reproductible)")
+    parser.add_argument("--learn", nargs="?", const=True, help="apprend le profil d'un journal (défaut : journal actuel)")
+    parser.add_argument("--profile", help="profil enregistré (JSON)")
+    parser.add_argument("--save-profile", help="enregistre le profil utilisé (JSON)")
+    args = parser.parse_args()
+
+    if args.profile:
+        selected = LogProfile.load(args.profile)
+    elif args.learn is not None:
+        selected = learn_profile(None if args.learn is True else args.learn)
+    else:
+        selected = LogProfile.default()
+    if args.save_profile:
+        selected.save(args.save_profile)
+        print(f" Profil enregistré: {args.save_profile}")
+    limit = int(args.size_mb * 1024 * 1024) if args.size_mb else None
+    # --entries 0 : sans limite d'entrées avec --size-mb, sinon rien à écrire (ex: --save-profile seul)
+    if args.entries or limit:
+        generate_test_logs(args.entries or None, args.format, args.output, args.seed, selected, max_bytes=limit)
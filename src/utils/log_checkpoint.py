@@ -0,0 +1,165 @@
+"""
+Points de reprise de la validation des logs - Data Officer
+
+Après chaque parcours, l'état accumulé de chaque checker (compteurs par agent
+et par action, avertissements, ...) est enregistré dans logs/checkpoints/ avec
+la position atteinte dans le fichier actif. Le parcours suivant ne lit que les
+entrées ajoutées depuis.
+
+Le point de reprise est ignoré (revalidation complète) si :
+  - le fichier actif a été tronqué, remplacé ou réécrit (taille, empreinte du
+    début du fichier et des octets précédant la position enregistrée) ;
+  - le journal a tourné (liste des segments scellés différente) ;
+  - le code du checker a changé ;
+  - une sauvegarde a été restaurée (backup_logs.restore_backup appelle clear_checkpoints()).
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from src.utils import log_store
+from src.utils.log_stream import open_binary
+
+CHECKPOINT_VERSION = 1
+FINGERPRINT_BYTES = 4096
+
+# Encodage JSON des états : set, tuple et dict à clés non textuelles
+_TAGS = ("$set", "$tuple", "$items")
+
+
+def get_checkpoint_dir() -> Path:
+    return log_store.LOGS_DIR / "checkpoints"
+
+
+def clear_checkpoints():
+    """Supprime tous les points de reprise : le prochain parcours revalide tout le journal."""
+    directory = get_checkpoint_dir()
+    if directory.exists():
+        for path in directory.glob("*.json"):
+            path.unlink()
+
+
+def _encode(value):
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and not (len(value) == 1 and next(iter(value)) in _TAGS):
+            return {key: _encode(item) for key, item in value.items()}
+        return {"$items": [[_encode(key), _encode(item)] for key, item in value.items()]}
+    if isinstance(value, (set, frozenset)):
+        return {"$set": [_encode(item) for item in value]}
+    if isinstance(value, tuple):
+        return {"$tuple": [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if len(value) == 1:
+            tag, items = next(iter(value.items()))
+            if tag == "$set":
+                return {_decode(item) for item in items}
+            if tag == "$tuple":
+                return tuple(_decode(item) for item in items)
+            if tag == "$items":
+                return {_decode(key): _decode(item) for key, item in items}
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _code_version(checker) -> str:
+    """Empreinte du fichier source du checker : un checker modifié repart de zéro."""
+    source = Path(type(checker).visit.__code__.co_filename)
+    try:
+        return _digest(source.read_bytes())
+    except OSError:
+        return ""
+
+
+def read_fingerprint(path: Path, offset: int) -> dict:
+    """
+    Empreinte de la partie déjà lue du fichier : son début et les octets avant `offset`.
+
+    Pour un segment .gz, `offset` se compte dans le contenu décompressé (comme LogReader).
+    """
+    if not path.exists():
+        return {"head": _digest(b""), "tail": _digest(b"")}
+    with open_binary(path) as f:
+        head = f.read(min(offset, FINGERPRINT_BYTES))
+        start = max(0, offset - FINGERPRINT_BYTES)
+        f.seek(start)
+        tail = f.read(offset - start)
+    return {"head": _digest(head), "tail": _digest(tail)}
+
+
+def current_sources() -> dict:
+    """Segments scellés et fichier actif du journal (None si une rotation est en cours)."""
+    sources = log_store.log_sources()
+    active = log_store.find_log_file()
+    segments = [path.name for path in sources if path != active]
+    if any(name.endswith(log_store.SEALING_SUFFIX) for name in segments):
+        return None
+    return {"segments": segments, "active": active.name}
+
+
+def load_checkpoint(checker, sources: dict):
+    """
+    Restaure l'état du checker si son point de reprise est encore valable.
+
+    Returns:
+        int: Position (octets) dans le fichier actif à partir de laquelle reprendre,
+             ou None si tout le journal doit être relu (l'état n'est alors pas modifié).
+    """
+    path = get_checkpoint_dir() / f"{type(checker).__name__}.json"
+    if sources is None or not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if (checkpoint.get("version") != CHECKPOINT_VERSION
+                or checkpoint.get("code") != _code_version(checker)
+                or checkpoint.get("sources") != sources):
+            return None
+        active = log_store.find_log_file()
+        offset = checkpoint["offset"]
+        if (active.stat().st_size if active.exists() else 0) < offset:
+            return None  # fichier tronqué
+        if read_fingerprint(active, offset) != checkpoint["fingerprint"]:
+            return None  # fichier remplacé ou réécrit
+        checker.set_state(_decode(checkpoint["state"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None  # point de reprise illisible : revalidation complète
+    return offset
+
+
+def save_checkpoint(checker, sources: dict, offset: int):
+    """Enregistre l'état du checker et la position atteinte dans le fichier actif."""
+    directory = get_checkpoint_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{type(checker).__name__}.json"
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "code": _code_version(checker),
+        "sources": sources,
+        "offset": offset,
+        "fingerprint": read_fingerprint(log_store.find_log_file(), offset),
+        "state": _encode(checker.get_state()),
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def drop_checkpoint(checker):
+    path = get_checkpoint_dir() / f"{type(checker).__name__}.json"
+    if path.exists():
+        path.unlink()
@@ -0,0 +1,427 @@
+"""
+Index SQLite du journal d'expériences - Data Officer
+
+L'écrivain de fond (log_writer) met à jour logs/experiment_index.sqlite après
+chaque lot, et chaque recherche indexe d'abord les entrées écrites depuis
+(écritures synchrones, autres processus) : un ajout au journal reste une seule
+écriture. Les recherches du type "toutes les entrées JudgeAgent en FAILURE sur
+le fichier X depuis une heure" deviennent des lectures d'index au lieu d'un
+parcours complet du journal.
+
+Usage:
+    python src/utils/log_index.py query --agent JudgeAgent --status FAILURE --since 1h
+    python src/utils/log_index.py query --file "sandbox/*.py" --limit 5 --json
+    python src/utils/log_index.py stats
+    python src/utils/log_index.py sync | rebuild
+"""
+
+import json
+import re
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import log_store
+from src.utils.file_lock import FileLock
+from src.utils.log_checkpoint import read_fingerprint
+from src.utils.log_stream import LogDecodeError, LogReader
+from src.utils.prompt_store import rehydrate_prompts
+
+FILE_FIELDS = ("file_analyzed", "file_fixed", "file_evaluated")
+# Version du schéma (PRAGMA user_version) : un index d'un ancien schéma est recréé
+INDEX_VERSION = 2
+
+# Une ligne par entrée : colonnes de recherche et position de l'entrée dans le
+# journal (fichier, octet de reprise pour LogReader). L'entrée elle-même n'est
+# pas copiée : elle est relue dans le journal quand une recherche la retourne.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT,
+    timestamp TEXT,
+    agent TEXT,
+    model TEXT,
+    action TEXT,
+    status TEXT,
+    file_path TEXT,
+    source TEXT NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    UNIQUE (source, byte_offset)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_agent ON entries (agent, timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_action ON entries (action, timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_status ON entries (status, timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries (timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_file ON entries (file_path, timestamp);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def get_index_path() -> Path:
+    return log_store.LOGS_DIR / "experiment_index.sqlite"
+
+
+def _row(entry: dict, source: str, offset: int) -> tuple:
+    details = entry.get("details") if isinstance(entry.get("details"), dict) else {}
+    file_path = next((details[f] for f in FILE_FIELDS if f in details), None)
+    return (
+        entry.get("id"),
+        entry.get("timestamp"),
+        entry.get("agent", entry.get("agent_name")),
+        entry.get("model", entry.get("model_used")),
+        entry.get("action"),
+        entry.get("status"),
+        str(file_path) if file_path is not None else None,
+        source,
+        offset,
+    )
+
+
+def _source_path(source: str) -> Path:
+    """Fichier du journal désigné par `source` (segment scellé ou fichier actif)."""
+    segment = log_store.SEGMENTS_DIR / source
+    if segment.exists():
+        return segment
+    path = log_store.LOGS_DIR / source
+    sealing = path.with_name(path.name + log_store.SEALING_SUFFIX)
+    # Scellement interrompu : le fichier actif attend sous son nom temporaire
+    return sealing if not path.exists() and sealing.exists() else path
+
+
+def _read_at(path: Path, offsets: list):
+    """
+    Relit les entrées qui commencent aux positions `offsets` (triées) de `path`.
+
+    Yields:
+        tuple: (position, entrée)
+    """
+    fmt = log_store.detect_log_format(path)
+    if path.suffix != ".gz":
+        # Fichier non compressé : un accès direct par entrée
+        for offset in offsets:
+            for entry in LogReader(path, fmt, start_offset=offset):
+                yield offset, entry
+                break
+        return
+    # Segment compressé : une seule lecture, de la première à la dernière entrée demandée
+    wanted = set(offsets)
+    reader = LogReader(path, fmt, start_offset=offsets[0])
+    position = offsets[0]
+    for entry in reader:
+        if position in wanted:
+            yield position, entry
+        position = reader.offset
+        if position > offsets[-1]:
+            break
+
+
+def parse_since(value: str) -> str:
+    """Convertit "30m", "1h", "2d" (ou un timestamp ISO) en borne ISO comparable aux logs."""
+    match = re.fullmatch(r"(\d+)\s*([smhd])", value.strip())
+    if not match:
+        return value
+    amount, unit = int(match.group(1)), match.group(2)
+    delta = {"s": timedelta(seconds=amount), "m": timedelta(minutes=amount),
+             "h": timedelta(hours=amount), "d": timedelta(days=amount)}[unit]
+    return (datetime.now() - delta).isoformat()
+
+
+class LogIndex:
+    """
+    Index SQLite des entrées de log (agent, action, status, timestamp, fichier).
+
+    Une connexion est ouverte par opération : l'index peut être utilisé depuis le
+    thread d'écriture asynchrone et par plusieurs processus (mode WAL).
+
+    Chaque entrée est repérée par (fichier source, position en octets) : deux
+    entrées identiques, ou sans 'id', restent distinctes et ne sont indexées
+    qu'une fois. La position atteinte (segments indexés, fichier actif, octet et
+    empreinte comme log_checkpoint) est gardée dans la table meta :
+      - une rotation renomme la source des entrées du fichier actif (le segment
+        scellé a le même contenu, décompressé) ;
+      - un fichier actif réécrit (compact_prompts, restauration) est réindexé ;
+      - des segments remplacés (restauration) : tout l'index est recréé.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_index_path()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            # Ancien schéma (copie complète des entrées) : l'index est recréé depuis le journal
+            conn.executescript("DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS meta;")
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def sync(self) -> int:
+        """
+        Indexe les entrées du journal absentes de l'index. Retourne le nombre ajouté.
+
+        Seuls les nouveaux segments scellés et la fin du fichier actif sont lus.
+        Les segments sont indexés hors verrou (ils ne changent plus) ; le fichier
+        actif est lu sous le verrou du journal, sans écriture concurrente.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                added = self._sync_segments(conn)
+            with FileLock(log_store.LOCK_FILE), conn:
+                added += self._sync_segments(conn)
+                added += self._sync_active(conn)
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('synced_at', ?)",
+                             (datetime.now().isoformat(),))
+            return added
+        finally:
+            conn.close()
+
+    def rebuild(self) -> int:
+        """Recrée l'index à partir du journal complet."""
+        if self.path.exists():
+            conn = self._connect()
+            try:
+                with conn:
+                    self._clear(conn)
+            finally:
+                conn.close()
+        return self.sync()
+
+    @staticmethod
+    def _clear(conn):
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM meta")
+
+    @staticmethod
+    def _position(conn) -> dict:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'position'").fetchone()
+        return json.loads(row[0]) if row else {"segments": [], "active": None, "offset": 0, "fingerprint": None}
+
+    @staticmethod
+    def _save_position(conn, position: dict):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('position', ?)", (json.dumps(position),))
+
+    def _sync_segments(self, conn) -> int:
+        """Indexe les segments scellés absents de l'index (reprise dans celui qui était le fichier actif)."""
+        position = self._position(conn)
+        segments = [segment["file"] for segment in log_store.read_manifest()["segments"]]
+        done = position["segments"]
+        if segments[:len(done)] != done:
+            # Segments remplacés (restauration) : plus aucune position n'est valable
+            self._clear(conn)
+            position = self._position(conn)
+            done = position["segments"]
+        added = 0
+        for name in segments[len(done):]:
+            path = log_store.SEGMENTS_DIR / name
+            start = 0
+            if position["active"] is not None:
+                # Premier nouveau segment : c'est l'ancien fichier actif, déjà indexé jusqu'à position["offset"]
+                if read_fingerprint(path, position["offset"]) == position["fingerprint"]:
+                    conn.execute("UPDATE entries SET source = ? WHERE source = ?", (name, position["active"]))
+                    start = position["offset"]
+                else:
+                    conn.execute("DELETE FROM entries WHERE source = ?", (position["active"],))
+            added += self._index_file(conn, path, name, start)[1]
+            position.update(segments=done + [name], active=None, offset=0, fingerprint=None)
+            done = position["segments"]
+            self._save_position(conn, position)
+        return added
+
+    def _sync_active(self, conn) -> int:
+        """Sous le verrou du journal : indexe la fin du fichier actif."""
+        position = self._position(conn)
+        active = log_store.find_log_file()
+        start = 0
+        if position["active"] is not None:
+            if (position["active"] == active.name
+                    and read_fingerprint(active, position["offset"]) == position["fingerprint"]):
+                start = position["offset"]
+            else:
+                # Fichier actif réécrit ou remplacé : ses anciennes positions ne sont plus valables
+                conn.execute("DELETE FROM entries WHERE source = ?", (position["active"],))
+        end, added = self._index_file(conn, active, active.name, start) if active.exists() else (0, 0)
+        position.update(active=active.name, offset=end, fingerprint=read_fingerprint(active, end))
+        self._save_position(conn, position)
+        return added
+
+    def _index_file(self, conn, path: Path, source: str, start: int) -> tuple:
+        """Indexe les entrées de `path` à partir de `start`. Retourne (position atteinte, entrées ajoutées)."""
+        reader = LogReader(path, log_store.detect_log_format(path), start_offset=start)
+        offset, batch, added = start, [], 0
+        try:
+            for entry in reader:
+                batch.append(_row(entry, source, offset))
+                offset = reader.offset
+                if len(batch) >= 1000:
+                    added += self._insert(conn, batch)
+                    batch = []
+        except LogDecodeError:
+            # Fin de fichier incomplète (écriture interrompue) : reprise à la dernière entrée complète
+            pass
+        added += self._insert(conn, batch)
+        return offset, added
+
+    @staticmethod
+    def _insert(conn, rows: list) -> int:
+        if not rows:
+            return 0
+        return conn.executemany(
+            "INSERT OR IGNORE INTO entries "
+            "(id, timestamp, agent, model, action, status, file_path, source, byte_offset) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        ).rowcount
+
+    def query(self, agent: str = None, action: str = None, status: str = None, file: str = None,
+              since: str = None, until: str = None, limit: int = None, newest_first: bool = False,
+              rehydrate: bool = True) -> list:
+        """
+        Recherche des entrées par critères (tous optionnels, combinés en ET).
+
+        Args:
+            agent / action / status: Valeur exacte du champ.
+            file: Chemin exact, ou motif GLOB s'il contient * ou ?.
+            since / until: Bornes de timestamp ISO, ou durée relative ("30m", "1h", "2d").
+            limit (int): Nombre max d'entrées retournées.
+            newest_first (bool): Tri du plus récent au plus ancien.
+            rehydrate (bool): Réhydrate les prompts du prompt store.
+
+        Returns:
+            list: Entrées de log (dict), dans l'ordre du journal.
+        """
+        self.sync()
+        where, params = self._where(agent, action, status, file, since, until)
+        sql = f"SELECT source, byte_offset FROM entries{where} ORDER BY seq {'DESC' if newest_first else 'ASC'}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+        # Relecture groupée par fichier, puis remise dans l'ordre de la requête
+        by_source = {}
+        for source, offset in rows:
+            by_source.setdefault(source, []).append(offset)
+        found = {}
+        for source, offsets in by_source.items():
+            for offset, entry in _read_at(_source_path(source), sorted(offsets)):
+                found[(source, offset)] = entry
+        entries = [found[row] for row in rows if row in found]
+        if rehydrate:
+            entries = [rehydrate_prompts(entry) for entry in entries]
+        return entries
+
+    def count(self, group_by: str = None, **criteria):
+        """Nombre d'entrées correspondant aux critères, éventuellement groupé par colonne."""
+        self.sync()
+        where, params = self._where(**criteria)
+        conn = self._connect()
+        try:
+            if group_by is None:
+                return conn.execute(f"SELECT COUNT(*) FROM entries{where}", params).fetchone()[0]
+            if group_by not in ("agent", "model", "action", "status", "file_path"):
+                raise ValueError(f"Colonne de regroupement invalide : '{group_by}'")
+            rows = conn.execute(
+                f"SELECT {group_by}, COUNT(*) FROM entries{where} GROUP BY {group_by} ORDER BY COUNT(*) DESC",
+                params,
+            ).fetchall()
+            return dict(rows)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _where(agent=None, action=None, status=None, file=None, since=None, until=None):
+        clauses, params = [], []
+        for column, value in (("agent", agent), ("action", action), ("status", status)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if file is not None:
+            clauses.append("file_path GLOB ?" if any(c in file for c in "*?[") else "file_path = ?")
+            params.append(file)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(parse_since(since))
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(parse_since(until))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+_index = None
+
+
+def get_index() -> LogIndex:
+    """Index partagé du processus (suit log_store.LOGS_DIR)."""
+    global _index
+    if _index is None or _index.path != get_index_path():
+        _index = LogIndex()
+    return _index
+
+
+def index_entries():
+    """Indexe les entrées qui viennent d'être écrites (log_writer) ; une erreur d'index ne doit jamais bloquer le logging."""
+    try:
+        get_index().sync()
+    except sqlite3.Error as e:
+        print(f" Attention : index SQLite non mis à jour ({e}). Lancez 'python src/utils/log_index.py sync'.")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Index SQLite des logs d'expériences")
+    sub = parser.add_subparsers(dest="command", required=True)
+    query = sub.add_parser("query", help="recherche des entrées")
+    query.add_argument("--agent")
+    query.add_argument("--action")
+    query.add_argument("--status")
+    query.add_argument("--file", help="chemin exact ou motif GLOB")
+    query.add_argument("--since", help="ISO ou durée relative (30m, 1h, 2d)")
+    query.add_argument("--until")
+    query.add_argument("--limit", type=int, default=20)
+    query.add_argument("--newest-first", action="store_true")
+    query.add_argument("--json", action="store_true", help="affiche les entrées complètes")
+    stats = sub.add_parser("stats", help="répartition des entrées indexées")
+    stats.add_argument("--by", default="agent", choices=["agent", "model", "action", "status", "file_path"])
+    sub.add_parser("sync", help="indexe les entrées manquantes")
+    sub.add_parser("rebuild", help="recrée l'index depuis le journal")
+    args = parser.parse_args(argv)
+
+    index = get_index()
+    if args.command == "sync":
+        print(f" {index.sync()} entrées ajoutées à l'index ({index.path})")
+    elif args.command == "rebuild":
+        print(f" Index recréé : {index.rebuild()} entrées ({index.path})")
+    elif args.command == "stats":
+        for value, count in index.count(group_by=args.by).items():
+            print(f"   {str(value):30} : {count}")
+    else:
+        entries = index.query(agent=args.agent, action=args.action, status=args.status, file=args.file,
+                              since=args.since, until=args.until, limit=args.limit,
+                              newest_first=args.newest_first, rehydrate=args.json)
+        for entry in entries:
+            if args.json:
+                print(json.dumps(entry, ensure_ascii=False, indent=2))
+                continue
+            details = entry.get("details", {})
+            file_path = next((details[f] for f in FILE_FIELDS if f in details), "-")
+            print(f" {entry.get('timestamp', '?'):26} {str(entry.get('agent')):14} "
+                  f"{str(entry.get('action')):14} {str(entry.get('status')):8} {file_path}")
+        print(f" {len(entries)} entrée(s)")
+
+
+if __name__ == "__main__":
+    main()
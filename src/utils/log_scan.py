@@ -0,0 +1,275 @@
+"""
+Moteur de parcours unique du journal - Data Officer
+
+Chaque vérification (validate_log, check_auditor_logs, ...) est un "visiteur"
+qui reçoit les entrées une par une et accumule son propre état. Le journal est
+lu une seule fois, quel que soit le nombre de vérifications enregistrées ; les
+rapports sont affichés ensuite, à partir de l'état accumulé.
+
+Avec config.VALIDATION_CHECKPOINTS, l'état de chaque checker est enregistré
+après le parcours (voir log_checkpoint) : le parcours suivant ne lit que les
+nouvelles entrées du fichier actif.
+
+Avec jobs > 1, une relecture complète est répartie sur un pool de processus :
+chaque segment scellé et chaque plage du fichier actif (JSON Lines découpé aux
+limites de lignes) est lu par un processus, puis les états partiels sont
+fusionnés dans l'ordre du journal (LogChecker.merge).
+"""
+
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.utils import config, log_store
+from src.utils.log_checkpoint import current_sources, drop_checkpoint, load_checkpoint, save_checkpoint
+from src.utils.log_store import detect_log_format, find_log_file, iter_log_entries, log_size, log_sources
+from src.utils.log_stream import LogDecodeError, LogReader, line_start
+from src.utils.prompt_store import rehydrate_prompts
+
+
+class LogChecker:
+    """
+    Visiteur de base.
+
+    Sous-classes : visit() accumule l'état entrée par entrée, report() affiche le
+    rapport et retourne True/False comme les fonctions check_*() historiques.
+    """
+
+    def __init__(self):
+        # Exception levée par visit() : le checker arrête de visiter et la signale dans son rapport
+        self.failure = None
+
+    def visit(self, entry: dict):
+        raise NotImplementedError
+
+    def report(self, scan: "LogScan") -> bool:
+        raise NotImplementedError
+
+    def get_state(self) -> dict:
+        """État accumulé, enregistré dans le point de reprise (attributs d'instance par défaut)."""
+        return {key: value for key, value in vars(self).items() if key != "failure"}
+
+    def set_state(self, state: dict):
+        vars(self).update(state)
+
+    def merge(self, other: "LogChecker"):
+        """
+        Ajoute l'état de `other`, qui a visité les entrées suivant celles de self
+        (parcours parallèle par plages). Le résultat doit être identique à un
+        parcours séquentiel : numéros d'entrée décalés, premiers exemples conservés.
+        """
+        raise NotImplementedError
+
+
+def merge_counts(counts: dict, other: dict):
+    """Additionne les compteurs de `other` dans `counts` (ordre de première apparition conservé)."""
+    for key, count in other.items():
+        counts[key] = counts.get(key, 0) + count
+
+
+class LogScan:
+    """Résultat du parcours : état du fichier de logs et éventuelle erreur de lecture."""
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+        # Juste après une rotation, le fichier actif n'existe pas encore : le journal est dans les segments
+        self.total_size = log_size()
+        self.exists = log_file.exists() or self.total_size > 0
+        self.size = log_file.stat().st_size if log_file.exists() else 0
+        self.format = detect_log_format(log_file) if log_file.exists() else config.LOG_FORMAT
+        self.entries = 0  # entrées lues par ce parcours (seulement les nouvelles en reprise)
+        self.resumed = 0  # checkers repris depuis leur point de reprise
+        self.error = None  # json.JSONDecodeError, ValueError... levée pendant la lecture
+
+
+# Plus petite plage du fichier actif confiée à un processus. Le fichier actif
+# tourne à config.MAX_LOG_SIZE_MB (10 Mo) : avec 1 Mio, il est réparti entre
+# tous les processus dès qu'il dépasse quelques Mo.
+MIN_RANGE_BYTES = 1 << 20
+
+
+def scan_log(checkers: list, path=None, resume: bool = True, jobs: int = 1) -> LogScan:
+    """
+    Lit le journal une seule fois et passe chaque entrée à tous les checkers.
+
+    Args:
+        checkers (list): Instances de LogChecker.
+        path: Fichier à lire (par défaut tout le journal, segments compris).
+        resume (bool): Reprend depuis les points de reprise (False = revalidation
+            complète). Ignoré si config.VALIDATION_CHECKPOINTS est désactivé.
+        jobs (int): Nombre de processus pour une relecture complète de tout le
+            journal (1 = dans le processus courant).
+
+    Returns:
+        LogScan: À transmettre à report() de chaque checker.
+    """
+    scan = LogScan(path or find_log_file())
+    if not scan.exists:
+        return scan
+
+    # Points de reprise : seulement pour tout le journal, hors rotation en cours
+    sources = current_sources() if path is None and config.VALIDATION_CHECKPOINTS else None
+    offsets = [load_checkpoint(checker, sources) if resume else None for checker in checkers]
+
+    if path is None and jobs > 1 and None in offsets:
+        # Relecture complète répartie entre les processus : aucun checker n'est repris
+        for checker, offset in zip(checkers, offsets):
+            if offset is not None:
+                checker.set_state(type(checker)().get_state())
+        end = _scan_parallel(checkers, scan, jobs)
+    elif sources is None:
+        # Fichier précis, points de reprise désactivés ou rotation en cours : parcours simple
+        try:
+            for entry in iter_log_entries(path):
+                scan.entries += 1
+                _visit(checkers, entry)
+        except Exception as e:
+            scan.error = e
+        return scan
+    else:
+        scan.resumed = sum(offset is not None for offset in offsets)
+        end = _scan_incremental(checkers, offsets, sources, scan)
+
+    if sources is not None and scan.error is None:
+        for checker in checkers:
+            if checker.failure is None:
+                save_checkpoint(checker, sources, end)
+            else:
+                drop_checkpoint(checker)
+    return scan
+
+
+def _scan_incremental(checkers: list, offsets: list, sources: dict, scan: LogScan) -> int:
+    """Lit les entrées que chaque checker n'a pas encore vues. Retourne la position atteinte dans le fichier actif."""
+    full = [checker for checker, offset in zip(checkers, offsets) if offset is None]
+    reader = None
+    try:
+        if full:
+            # Segments scellés : seulement pour les checkers sans point de reprise valable
+            for segment in sources["segments"]:
+                for entry in iter_log_entries(log_store.SEGMENTS_DIR / segment):
+                    scan.entries += 1
+                    _visit(full, entry)
+        start = 0 if full else min(offsets)
+        reader = LogReader(scan.log_file, scan.format, start_offset=start)
+        for entry in (reader if scan.log_file.exists() else ()):
+            end = reader.offset
+            targets = [checker for checker, offset in zip(checkers, offsets) if offset is None or end > offset]
+            if targets:
+                scan.entries += 1
+                _visit(targets, rehydrate_prompts(entry))
+    except Exception as e:
+        scan.error = e
+        return None
+    return reader.offset
+
+
+# ---- Parcours parallèle par plages -------------------------------------------
+
+# (fichier source, nom de classe) -> classe du checker, pour les processus du pool
+_CHECKER_CLASSES = {}
+
+
+def _checker_spec(checker: LogChecker) -> tuple:
+    # Les modules chargés par chemin (run_all_checks) ne sont pas importables par leur nom
+    return type(checker).visit.__code__.co_filename, type(checker).__name__
+
+
+def _checker_class(filename: str, class_name: str):
+    spec = (filename, class_name)
+    if spec not in _CHECKER_CLASSES:
+        # Processus démarré par "spawn" : le module est rechargé depuis son fichier
+        module_spec = importlib.util.spec_from_file_location(f"_log_checker_{len(_CHECKER_CLASSES)}", filename)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+        _CHECKER_CLASSES[spec] = getattr(module, class_name)
+    return _CHECKER_CLASSES[spec]
+
+
+def plan_ranges(jobs: int) -> list:
+    """
+    Découpe le journal en plages lisibles indépendamment, dans l'ordre du journal.
+
+    Chaque segment scellé forme une plage ; le fichier actif en JSON Lines est
+    coupé en au plus `jobs` plages d'au moins MIN_RANGE_BYTES, aux limites de
+    lignes. Un tableau JSON ne peut pas être coupé sans être lu : une seule plage.
+
+    Returns:
+        list: Tuples (fichier, format, début, fin) ; fin = None jusqu'à la fin du fichier.
+    """
+    active = find_log_file()
+    ranges = [(source, detect_log_format(source), 0, None) for source in log_sources()
+              if source != active and source.stat().st_size]
+    size = active.stat().st_size if active.exists() else 0
+    if size:
+        fmt = detect_log_format(active)
+        pieces = max(1, min(jobs, size // MIN_RANGE_BYTES)) if fmt == log_store.FORMAT_JSONL else 1
+        bounds = sorted({line_start(active, size * k // pieces) for k in range(pieces)})
+        ranges += [(active, fmt, start, end) for start, end in zip(bounds, bounds[1:] + [None])]
+    return ranges
+
+
+def _scan_range(task: tuple) -> tuple:
+    """Processus du pool : lit une plage avec des checkers neufs et retourne leurs états."""
+    logs_dir, specs, path, fmt, start, end = task
+    if Path(logs_dir) != log_store.LOGS_DIR:
+        log_store.set_logs_dir(logs_dir)
+    checkers = [_checker_class(*spec)() for spec in specs]
+    reader = LogReader(path, fmt, start_offset=start, end_offset=end)
+    error = None
+    try:
+        for entry in reader:
+            _visit(checkers, rehydrate_prompts(entry))
+    except Exception as e:
+        error = e
+    return reader.count, reader.offset, [(checker.get_state(), checker.failure) for checker in checkers], error
+
+
+def _scan_parallel(checkers: list, scan: LogScan, jobs: int) -> int:
+    """Lit toutes les plages dans un pool de processus et fusionne les états dans l'ordre du journal."""
+    specs = [_checker_spec(checker) for checker in checkers]
+    for spec, checker in zip(specs, checkers):
+        _CHECKER_CLASSES[spec] = type(checker)  # hérité par les processus "fork"
+    end = 0
+    try:
+        ranges = plan_ranges(jobs)
+        tasks = [(str(log_store.LOGS_DIR), specs, str(path), fmt, start, stop) for path, fmt, start, stop in ranges]
+        read = {}  # entrées déjà lues par fichier, pour numéroter les erreurs
+        with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(tasks)))) as pool:
+            for (path, _, _, _), result in zip(ranges, pool.map(_scan_range, tasks)):
+                count, offset, states, error = result
+                scan.entries += count
+                for checker, (state, failure) in zip(checkers, states):
+                    if checker.failure is None:
+                        part = type(checker)()
+                        part.set_state(state)
+                        checker.merge(part)
+                        checker.failure = failure
+                if path == scan.log_file and count:
+                    end = offset
+                if error is not None:
+                    if isinstance(error, LogDecodeError) and error.entry_index is not None:
+                        error = LogDecodeError(error.msg, error.path, error.offset,
+                                               error.entry_index + read.get(path, 0))
+                    scan.error = error
+                    break
+                read[path] = read.get(path, 0) + count
+    except Exception as e:
+        scan.error = e
+    return end
+
+
+def _visit(checkers: list, entry: dict):
+    for checker in checkers:
+        if checker.failure is not None:
+            continue
+        try:
+            checker.visit(entry)
+        except Exception as e:
+            # Le checker arrête de visiter ; son rapport signalera l'erreur
+            checker.failure = e
+
+
+def run_checker(checker: LogChecker, path=None, resume: bool = True, jobs: int = 1) -> bool:
+    """Parcourt le journal pour un seul checker puis affiche son rapport."""
+    return checker.report(scan_log([checker], path, resume, jobs))
@@ -0,0 +1,474 @@
+"""
+Stockage du journal d'expériences - Data Officer
+
+Deux formats sont supportés pour logs/ :
+  - "json"  : tableau JSON unique (format historique, réécrit à chaque ajout)
+  - "jsonl" : JSON Lines, une entrée par ligne, ajout en O(1) par entrée
+
+Rotation : quand le fichier actif dépasse config.MAX_LOG_SIZE_MB, il est scellé
+(compressé en gzip) dans logs/segments/ et un nouveau fichier actif démarre.
+logs/segments/manifest.json liste les segments scellés dans l'ordre. Les
+écritures ne touchent que le fichier actif.
+
+Plusieurs processus peuvent écrire en même temps : chaque ajout (et chaque
+rotation) se fait sous un verrou de fichier (logs/.experiment_data.lock).
+
+Les lecteurs (validate_log, backup_logs, data_quality) passent par
+iter_log_entries() / load_log_entries() qui parcourent tous les segments l'un
+après l'autre, détectent le format tout seuls et réhydratent les prompts
+externalisés dans logs/prompt_store/.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import config
+from src.utils import prompt_store
+from src.utils.file_lock import FileLock
+from src.utils.log_stream import LogReader
+from src.utils.prompt_store import externalize_prompts, rehydrate_prompts
+
+FORMAT_JSON = "json"
+FORMAT_JSONL = "jsonl"
+
+LOGS_DIR = PROJECT_ROOT / config.LOGS_DIR
+JSON_LOG_FILE = LOGS_DIR / "experiment_data.json"
+JSONL_LOG_FILE = LOGS_DIR / "experiment_data.jsonl"
+SEGMENTS_DIR = LOGS_DIR / "segments"
+MANIFEST_FILE = SEGMENTS_DIR / "manifest.json"
+SEALING_SUFFIX = ".sealing"
+LOCK_FILE = LOGS_DIR / ".experiment_data.lock"
+
+
+def set_logs_dir(path):
+    """
+    Redirige tout le stockage (journal, segments, verrou, prompt store) vers un autre dossier.
+
+    Utile pour les benchmarks et les runs isolés ; par défaut logs/ à la racine du projet.
+    """
+    global LOGS_DIR, JSON_LOG_FILE, JSONL_LOG_FILE, SEGMENTS_DIR, MANIFEST_FILE, LOCK_FILE
+    LOGS_DIR = Path(path)
+    JSON_LOG_FILE = LOGS_DIR / "experiment_data.json"
+    JSONL_LOG_FILE = LOGS_DIR / "experiment_data.jsonl"
+    SEGMENTS_DIR = LOGS_DIR / "segments"
+    MANIFEST_FILE = SEGMENTS_DIR / "manifest.json"
+    LOCK_FILE = LOGS_DIR / ".experiment_data.lock"
+    prompt_store.PROMPT_STORE_DIR = LOGS_DIR / "prompt_store"
+    prompt_store._store = None
+
+
+def get_log_path(fmt: str = None) -> Path:
+    """Chemin du fichier de logs pour un format donné (par défaut config.LOG_FORMAT)."""
+    fmt = fmt or config.LOG_FORMAT
+    if fmt == FORMAT_JSONL:
+        return JSONL_LOG_FILE
+    if fmt == FORMAT_JSON:
+        return JSON_LOG_FILE
+    raise ValueError(f" Format de logs invalide : '{fmt}'. Utilisez 'json' ou 'jsonl'.")
+
+
+def find_log_file() -> Path:
+    """
+    Retourne le fichier de logs à lire.
+
+    Le fichier du format configuré est prioritaire ; sinon on retombe sur
+    l'autre format s'il existe (ex: logs migrés mais config pas encore changée),
+    sauf juste après une rotation (le fichier actif n'est pas encore recréé).
+    """
+    primary = get_log_path()
+    if primary.exists():
+        return primary
+    if any(segment["format"] == config.LOG_FORMAT for segment in read_manifest()["segments"]):
+        return primary
+    for candidate in (JSONL_LOG_FILE, JSON_LOG_FILE):
+        if candidate.exists():
+            return candidate
+    return primary
+
+
+def _open_text(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def detect_log_format(path) -> str:
+    """Détecte le format d'un fichier de logs d'après son premier caractère significatif."""
+    path = Path(path)
+    with _open_text(path) as f:
+        while True:
+            char = f.read(1)
+            if not char:
+                break
+            if char.isspace() or char == "\ufeff":
+                continue
+            if char == "[":
+                return FORMAT_JSON
+            if char == "{":
+                return FORMAT_JSONL
+            break
+    # Fichier vide ou contenu inattendu : on se fie à l'extension
+    return FORMAT_JSONL if ".jsonl" in path.suffixes else FORMAT_JSON
+
+
+def log_sources() -> list:
+    """
+    Fichiers composant le journal, du plus ancien au plus récent.
+
+    Segments scellés (manifest), éventuel fichier en cours de scellement, puis
+    fichier actif.
+    """
+    sources = [SEGMENTS_DIR / segment["file"] for segment in read_manifest()["segments"]]
+    active = find_log_file()
+    sealing = _sealing_path(active)
+    if sealing.exists() and not _is_sealed(sealing):
+        sources.append(sealing)
+    if active.exists():
+        sources.append(active)
+    return sources
+
+
+def log_size() -> int:
+    """Taille totale sur disque du journal (tous segments confondus), en octets."""
+    return sum(source.stat().st_size for source in log_sources() if source.exists())
+
+
+def iter_log_entries(path=None, rehydrate: bool = True):
+    """
+    Itère sur les entrées du journal, quel que soit son format.
+
+    Args:
+        path: Fichier à lire. Par défaut, tous les segments de log_sources()
+            sont parcourus l'un après l'autre (un seul en mémoire à la fois).
+        rehydrate (bool): Remplace les références du prompt store par le texte complet.
+
+    Yields:
+        dict: Une entrée de log.
+
+    Raises:
+        LogDecodeError: Si le contenu n'est pas du JSON valide (position en octets).
+        ValueError: Si un fichier "json" ne contient pas un tableau.
+    """
+    if path is None:
+        for source in log_sources():
+            yield from iter_log_entries(source, rehydrate)
+        return
+
+    path = Path(path)
+    if not path.exists() or path.stat().st_size == 0:
+        return
+
+    entries = _iter_raw_entries(path)
+    if rehydrate:
+        entries = (rehydrate_prompts(entry) for entry in entries)
+    yield from entries
+
+
+def _iter_raw_entries(path: Path):
+    # Lecture en flux : une entrée à la fois, quelle que soit la taille du fichier
+    yield from LogReader(path, detect_log_format(path))
+
+
+def load_log_entries(path=None, rehydrate: bool = True) -> list:
+    """Charge toutes les entrées d'un fichier de logs dans une liste."""
+    return list(iter_log_entries(path, rehydrate))
+
+
+def append_entries(entries: list, fmt: str = None, path=None):
+    """
+    Ajoute des entrées au journal.
+
+    En "jsonl", chaque entrée coûte une seule écriture en fin de fichier, quelle
+    que soit la taille de l'historique. En "json", le tableau est relu puis réécrit.
+    Avec config.LOG_PROMPT_STORE, les prompts longs sont remplacés par une référence.
+
+    L'ajout se fait sous verrou inter-processus : aucune entrée n'est perdue ni
+    coupée quand plusieurs workers écrivent dans le même journal. L'index
+    SQLite n'est pas mis à jour ici (voir log_index) : l'ajout reste une
+    seule écriture.
+    """
+    if config.LOG_PROMPT_STORE:
+        entries = [externalize_prompts(entry) for entry in entries]
+    fmt = fmt or config.LOG_FORMAT
+    path = Path(path) if path else get_log_path(fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with FileLock(LOCK_FILE):
+        _append_locked(entries, fmt, path)
+
+
+def _append_locked(entries: list, fmt: str, path: Path):
+    if _sealing_path(path).exists():
+        # Un scellement a été interrompu (crash) : on le termine avant d'écrire
+        _seal(path)
+    if path.exists() and path.stat().st_size >= config.MAX_LOG_SIZE_MB * 1024 * 1024:
+        rotate_log(path)
+
+    if fmt == FORMAT_JSONL:
+        if (path == JSONL_LOG_FILE and not path.exists() and _has_entries(JSON_LOG_FILE)
+                and not any(segment["format"] == FORMAT_JSONL for segment in read_manifest()["segments"])):
+            # Premier passage en JSONL : on reprend l'historique du tableau existant
+            count = migrate_to_jsonl(JSON_LOG_FILE, path)
+            print(f" Logs migrés vers {path.name} ({count} entrées reprises de {JSON_LOG_FILE.name})")
+        _append_jsonl(entries, path)
+    else:
+        _append_json_array(entries, path)
+
+
+def _has_entries(path: Path) -> bool:
+    return path.exists() and path.stat().st_size > 0
+
+
+def _append_jsonl(entries: list, path: Path):
+    payload = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+    _truncate_torn_tail(path)
+    with open(path, 'ab') as f:
+        f.write(payload.encode('utf-8'))
+
+
+def _truncate_torn_tail(path: Path):
+    """
+    Supprime une dernière ligne incomplète (processus tué en pleine écriture).
+
+    Une entrée n'est valide qu'une fois son "\\n" écrit : la ligne coupée n'a
+    jamais été complète, et la garder corromprait l'entrée écrite juste après.
+    """
+    if not path.exists():
+        return
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        position = end
+        while position > 0:
+            step = min(64 * 1024, position)
+            position -= step
+            f.seek(position)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                position += newline + 1
+                break
+        print(f" Attention : {end - position} octets d'une entrée incomplète retirés de {path.name}")
+        f.truncate(position)
+
+
+def _append_json_array(entries: list, path: Path):
+    data = []
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+                if content: # Vérifie que le fichier n'est pas juste vide
+                    data = json.loads(content)
+        except json.JSONDecodeError:
+            # Fichier corrompu : on le met de côté au lieu d'écraser l'historique
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            corrupt_path = path.with_name(f"{path.name}.corrupt_{timestamp}")
+            os.replace(path, corrupt_path)
+            print(f" Attention : Le fichier de logs {path} était corrompu. "
+                  f"Il a été conservé sous {corrupt_path.name} et une nouvelle liste a été créée.")
+            data = []
+
+    data.extend(entries)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+def read_manifest() -> dict:
+    """Contenu de logs/segments/manifest.json (liste vide si aucune rotation)."""
+    if not MANIFEST_FILE.exists():
+        return {"version": 1, "segments": []}
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest: dict):
+    tmp_path = MANIFEST_FILE.with_name(MANIFEST_FILE.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+
+def _sealing_path(path: Path) -> Path:
+    return path.with_name(path.name + SEALING_SUFFIX)
+
+
+def _first_entry_id(path: Path):
+    for entry in _iter_raw_entries(path):
+        return entry.get("id") if isinstance(entry, dict) else None
+    return None
+
+
+def _is_sealed(sealing: Path) -> bool:
+    # Crash entre la mise à jour du manifest et la suppression du fichier : déjà scellé
+    segments = read_manifest()["segments"]
+    if not segments or sealing.stat().st_size != segments[-1].get("raw_size"):
+        return False
+    return _first_entry_id(sealing) == segments[-1].get("first_id")
+
+
+def rotate_log(path=None) -> Path:
+    """
+    Scelle le fichier actif dans logs/segments/ ; la prochaine écriture repart d'un fichier vide.
+
+    Doit être appelée sous le verrou LOCK_FILE (c'est le cas depuis append_entries).
+
+    Returns:
+        Path: Le segment créé (None si le fichier actif est vide).
+    """
+    path = Path(path) if path else get_log_path()
+    if not path.exists() or path.stat().st_size == 0:
+        return None
+    # Le renommage est atomique : aucune écriture ne peut atterrir dans un fichier en cours de scellement
+    os.replace(path, _sealing_path(path))
+    return _seal(path)
+
+
+def _seal(path: Path) -> Path:
+    sealing = _sealing_path(path)
+    if _is_sealed(sealing):
+        os.remove(sealing)
+        return SEGMENTS_DIR / read_manifest()["segments"][-1]["file"]
+
+    SEGMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest()
+    number = len(manifest["segments"]) + 1
+    segment = SEGMENTS_DIR / f"{path.stem}.{number:06d}{path.suffix}.gz"
+
+    entries = 0
+    first_id = first_timestamp = last_timestamp = None
+    for entry in _iter_raw_entries(sealing):
+        if entries == 0:
+            first_id = entry.get("id")
+            first_timestamp = entry.get("timestamp")
+        last_timestamp = entry.get("timestamp")
+        entries += 1
+
+    tmp_segment = segment.with_name(segment.name + ".tmp")
+    with open(sealing, 'rb') as src, gzip.open(tmp_segment, 'wb', compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(tmp_segment, segment)
+
+    manifest["segments"].append({
+        "file": segment.name,
+        "format": detect_log_format(sealing),
+        "entries": entries,
+        "first_id": first_id,
+        "first_timestamp": first_timestamp,
+        "last_timestamp": last_timestamp,
+        "raw_size": sealing.stat().st_size,
+        "compressed_size": segment.stat().st_size,
+        "sealed_at": datetime.now().isoformat(),
+    })
+    _write_manifest(manifest)
+    os.remove(sealing)
+    return segment
+
+
+def export_log(destination, rehydrate: bool = False) -> int:
+    """
+    Écrit tout le journal (tous segments) dans un seul fichier JSON Lines.
+
+    Les entrées sont lues et écrites une par une : la mémoire utilisée ne dépend
+    pas de la taille du journal.
+
+    Returns:
+        int: Nombre d'entrées exportées.
+    """
+    destination = Path(destination)
+    tmp_path = destination.with_name(destination.name + ".tmp")
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for entry in iter_log_entries(rehydrate=rehydrate):
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            count += 1
+    os.replace(tmp_path, destination)
+    return count
+
+
+def migrate_to_jsonl(source=None, destination=None, overwrite: bool = False) -> int:
+    """
+    Convertit (une seule fois) un journal au format tableau JSON en JSON Lines.
+
+    Le fichier source n'est pas modifié. La destination est écrite dans un
+    fichier temporaire puis renommée, pour ne jamais laisser un JSONL partiel.
+
+    Returns:
+        int: Nombre d'entrées migrées.
+    """
+    source = Path(source) if source else JSON_LOG_FILE
+    destination = Path(destination) if destination else JSONL_LOG_FILE
+
+    if destination.exists() and destination.stat().st_size > 0 and not overwrite:
+        raise FileExistsError(f"{destination} existe déjà (utilisez overwrite=True pour l'écraser)")
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(destination.name + ".tmp")
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for entry in iter_log_entries(source, rehydrate=False):
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            count += 1
+    os.replace(tmp_path, destination)
+    return count
+
+
+def compact_prompts(path=None) -> int:
+    """
+    Réécrit le fichier actif du journal en déplaçant ses prompts dans le prompt store.
+
+    Lecture, réécriture et remplacement se font sous le verrou LOCK_FILE, comme
+    append_entries() : aucun ajout concurrent ne peut se perdre entre la lecture
+    et le remplacement. Les segments scellés ne sont pas compactés : ils sont
+    immuables (les sauvegardes, l'index et les points de contrôle se réfèrent à
+    leurs octets) ; seules les entrées écrites depuis la dernière rotation le sont.
+
+    Returns:
+        int: Nombre d'entrées réécrites.
+    """
+    path = Path(path) if path else find_log_file()
+    with FileLock(LOCK_FILE):
+        if not path.exists():
+            return 0
+        fmt = detect_log_format(path)
+        entries = (externalize_prompts(entry) for entry in iter_log_entries(path, rehydrate=False))
+        tmp_path = path.with_name(path.name + ".tmp")
+        count = 0
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            if fmt == FORMAT_JSONL:
+                for entry in entries:
+                    out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    count += 1
+            else:
+                data = list(entries)
+                json.dump(data, out, indent=4, ensure_ascii=False)
+                count = len(data)
+        os.replace(tmp_path, path)
+    return count
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "migrate":
+        migrated = migrate_to_jsonl(overwrite="--force" in sys.argv)
+        print(f" {migrated} entrées migrées vers {JSONL_LOG_FILE}")
+        print(" Pensez à passer LOG_FORMAT = \"jsonl\" dans src/utils/config.py")
+    elif command == "compact":
+        compacted = compact_prompts()
+        print(f" {compacted} entrées compactées (prompts déplacés dans logs/prompt_store/)")
+        print(" Pensez à passer LOG_PROMPT_STORE = True dans src/utils/config.py")
+    else:
+        print("Usage: python src/utils/log_store.py [migrate [--force] | compact]")
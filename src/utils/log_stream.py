@@ -0,0 +1,247 @@
+"""
+Lecture en flux du journal d'expériences - Data Officer
+
+Les entrées sont lues une par une, sans jamais charger le fichier complet :
+  - "jsonl" : une ligne à la fois
+  - "json"  : le tableau est découpé à la volée (JSONDecoder.raw_decode sur un
+              tampon de taille bornée), un élément à la fois
+
+La mémoire utilisée dépend de la taille d'une entrée, pas de celle du journal.
+Les erreurs indiquent la position en octets dans le fichier (LogDecodeError).
+"""
+
+import codecs
+import gzip
+import json
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 20  # 1 Mio lu à la fois
+MAX_ENTRY_BYTES = 256 << 20  # au-delà, l'entrée est considérée comme corrompue
+
+_WHITESPACE = " \t\n\r\ufeff"
+
+
+class LogDecodeError(json.JSONDecodeError):
+    """
+    Erreur de décodage du journal, avec la position en octets dans le fichier.
+
+    Attributes:
+        path (Path): Fichier lu.
+        offset (int): Position de l'erreur en octets (contenu décompressé pour un .gz).
+        entry_index (int): Numéro de l'entrée fautive dans le fichier (à partir de 0).
+    """
+
+    def __init__(self, msg: str, path, offset: int, entry_index: int = None):
+        self.path = Path(path)
+        self.offset = offset
+        self.entry_index = entry_index
+        where = f"{self.path.name}, octet {offset}"
+        if entry_index is not None:
+            where += f" (entrée #{entry_index})"
+        ValueError.__init__(self, f"{msg}: {where}")
+        # Attributs de json.JSONDecodeError (pos exprimé en octets)
+        self.msg = msg
+        self.doc = ""
+        self.pos = offset
+        self.lineno = None
+        self.colno = None
+
+    def __reduce__(self):
+        return self.__class__, (self.msg, self.path, self.offset, self.entry_index)
+
+
+def open_binary(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def line_start(path, offset: int) -> int:
+    """Début de la première ligne qui commence à `offset` ou après (découpage d'un JSON Lines en plages)."""
+    if offset <= 0:
+        return 0
+    with open_binary(Path(path)) as f:
+        f.seek(offset - 1)
+        return offset - 1 + len(f.readline())
+
+
+class LogReader:
+    """
+    Itérateur sur les entrées d'un fichier de logs (tableau JSON ou JSON Lines).
+
+    Args:
+        path (Path): Fichier à lire (.gz accepté).
+        fmt (str): "json" ou "jsonl" (voir log_store.detect_log_format).
+        start_offset (int): Reprend la lecture juste après une entrée déjà lue
+            (valeur de `offset` d'une lecture précédente). 0 = début du fichier.
+        start_index (int): Numéro de la première entrée lue (messages d'erreur).
+        end_offset (int): JSON Lines seulement : s'arrête à la première ligne qui
+            commence à cette position ou après (lecture d'une plage, voir line_start).
+
+    Attributes:
+        offset (int): Position en octets juste après la dernière entrée lue.
+        count (int): Nombre d'entrées lues.
+    """
+
+    def __init__(self, path, fmt: str, start_offset: int = 0, start_index: int = 0,
+                 end_offset: int = None, chunk_size: int = CHUNK_SIZE,
+                 max_entry_bytes: int = MAX_ENTRY_BYTES):
+        self.path = Path(path)
+        self.fmt = fmt
+        self.start_offset = start_offset
+        self.start_index = start_index
+        self.end_offset = end_offset
+        self.chunk_size = chunk_size
+        self.max_entry_bytes = max_entry_bytes
+        self.count = 0
+        self._offset = start_offset
+        # Tableau JSON : fin de la dernière entrée dans le tampon, convertie en octets à la demande
+        self._entry_end = None
+        self._buf = ""
+        self._mark_pos = 0
+        self._mark_bytes = start_offset
+
+    @property
+    def offset(self) -> int:
+        if self._entry_end is not None:
+            self._offset = self._byte_offset(self._entry_end)
+            self._entry_end = None
+        return self._offset
+
+    def __iter__(self):
+        if self.fmt == "jsonl":
+            return self._iter_lines()
+        if self.end_offset is not None:
+            raise ValueError("end_offset n'est possible qu'en JSON Lines")
+        return self._iter_array()
+
+    def _error(self, msg: str, offset: int):
+        return LogDecodeError(msg, self.path, offset, self.start_index + self.count)
+
+    # ---- JSON Lines ---------------------------------------------------------
+
+    def _iter_lines(self):
+        offset = self.start_offset
+        with open_binary(self.path) as f:
+            if offset:
+                f.seek(offset)
+            for raw in f:
+                line_start = offset
+                if self.end_offset is not None and line_start >= self.end_offset:
+                    break
+                offset += len(raw)
+                if not raw.strip():
+                    continue
+                try:
+                    text = raw.decode("utf-8")
+                    entry = json.loads(text)
+                except UnicodeDecodeError as e:
+                    raise self._error(f"UTF-8 invalide ({e.reason})", line_start + e.start) from None
+                except json.JSONDecodeError as e:
+                    position = line_start + len(text[:e.pos].encode("utf-8"))
+                    raise self._error(e.msg, position) from None
+                self.count += 1
+                self._offset = offset
+                yield entry
+
+    # ---- Tableau JSON -------------------------------------------------------
+
+    def _byte_offset(self, pos: int) -> int:
+        """Position en octets du caractère `pos` du tampon (pos >= dernière position convertie)."""
+        self._mark_bytes += len(self._buf[self._mark_pos:pos].encode("utf-8"))
+        self._mark_pos = pos
+        return self._mark_bytes
+
+    def _peek_offset(self, pos: int) -> int:
+        return self._mark_bytes + len(self._buf[self._mark_pos:pos].encode("utf-8"))
+
+    def _fill(self, size: int = None) -> bool:
+        """Retire la partie consommée du tampon et y ajoute un bloc. False en fin de fichier."""
+        if self._eof:
+            return False
+        if self._pos:
+            # Fige l'offset de la dernière entrée avant de décaler le tampon
+            self._offset = self.offset
+            self._byte_offset(self._pos)
+            self._buf = self._buf[self._pos:]
+            self._mark_pos = 0
+            self._pos = 0
+        chunk = self._file.read(size or self.chunk_size)
+        try:
+            text = self._utf8.decode(chunk, final=not chunk)
+        except UnicodeDecodeError as e:
+            raise self._error(f"UTF-8 invalide ({e.reason})", self._peek_offset(len(self._buf))) from None
+        self._eof = not chunk
+        self._buf += text
+        return bool(chunk)
+
+    def _iter_array(self):
+        decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._pos = 0
+        self._eof = False
+        # start -> '[' ; first -> valeur ou ']' ; sep -> ',' ou ']' ; value -> valeur ; end -> fin
+        state = "sep" if self.start_offset else "start"
+
+        with open_binary(self.path) as self._file:
+            if self.start_offset:
+                self._file.seek(self.start_offset)
+
+            while True:
+                # Saute les blancs (et le BOM éventuel)
+                while True:
+                    while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                        self._pos += 1
+                    if self._pos < len(self._buf) or not self._fill():
+                        break
+
+                if self._pos >= len(self._buf):
+                    if state in ("start", "end"):
+                        return
+                    raise self._error("Fin de fichier inattendue : tableau non fermé",
+                                      self._peek_offset(self._pos))
+
+                char = self._buf[self._pos]
+                if state == "start":
+                    if char != "[":
+                        raise ValueError(f"{self.path.name} doit contenir un tableau (list) JSON")
+                    self._pos += 1
+                    state = "first"
+                elif state == "end":
+                    raise self._error("Données après la fin du tableau", self._peek_offset(self._pos))
+                elif char == "]" and state in ("first", "sep"):
+                    self._pos += 1
+                    state = "end"
+                elif state == "sep":
+                    if char != ",":
+                        raise self._error("Expecting ',' delimiter", self._peek_offset(self._pos))
+                    self._pos += 1
+                    state = "value"
+                else:
+                    entry = self._decode_value(decoder)
+                    self.count += 1
+                    state = "sep"
+                    yield entry
+
+    def _decode_value(self, decoder):
+        """Décode la valeur qui commence à self._pos, en lisant la suite du fichier si elle est coupée."""
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Erreur en fin de tampon ou chaîne non terminée : la valeur est peut-être
+                # seulement coupée par la lecture par blocs
+                truncated = e.pos >= len(self._buf) - 8 or e.msg.startswith("Unterminated string")
+                if not truncated or self._eof:
+                    raise self._error(e.msg, self._peek_offset(e.pos)) from None
+            else:
+                # Un nombre en fin de tampon peut continuer dans le bloc suivant
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    self._entry_end = end
+                    return value
+            if len(self._buf) - self._pos > self.max_entry_bytes:
+                raise self._error(f"Entrée de plus de {self.max_entry_bytes} octets",
+                                  self._peek_offset(self._pos))
+            # Entrée plus grande qu'un bloc : lecture de taille croissante (pas de re-décodage quadratique)
+            self._fill(max(self.chunk_size, len(self._buf) - self._pos))
@@ -0,0 +1,229 @@
+"""
+Écrivain de logs asynchrone - Data Officer
+
+Les agents déposent leurs entrées dans une file bornée ; un thread de fond la
+vide et écrit les entrées par lots via log_store.append_entries(). Les appels à
+log_experiment() ne bloquent donc plus le pipeline sur des E/S disque. Avec
+config.LOG_INDEX, le même thread met à jour l'index SQLite après chaque lot.
+"""
+
+import atexit
+import queue
+import signal
+import threading
+import time
+
+from src.utils import config
+from src.utils.log_store import append_entries
+
+_STOP = object()
+
+
+def write_and_index(entries: list):
+    """Écrit un lot dans le journal puis, avec config.LOG_INDEX, l'ajoute à l'index SQLite."""
+    append_entries(entries)
+    if config.LOG_INDEX:
+        from src.utils.log_index import index_entries
+        index_entries()
+
+
+class BackgroundLogWriter:
+    """
+    File d'entrées bornée vidée par un thread qui écrit par lots.
+
+    Args:
+        flush_interval (float): Délai max (s) avant l'écriture d'un lot incomplet.
+        batch_size (int): Nombre max d'entrées écrites en une fois.
+        max_queue_size (int): Taille de la file ; au-delà, submit() bloque (backpressure).
+        write_batch (callable): Fonction d'écriture d'une liste d'entrées.
+    """
+
+    def __init__(self, flush_interval: float = None, batch_size: int = None,
+                 max_queue_size: int = None, write_batch=write_and_index):
+        self.flush_interval = flush_interval if flush_interval is not None else config.LOG_FLUSH_INTERVAL
+        self.batch_size = batch_size or config.LOG_BATCH_SIZE
+        self.write_batch = write_batch
+        self._queue = queue.Queue(maxsize=max_queue_size or config.LOG_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+        # Posé par un gestionnaire de signal : ni verrou ni attente, le thread le voit à son prochain réveil
+        self._stop_requested = False
+
+    def start(self):
+        """Démarre le thread d'écriture (idempotent)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, entry: dict, timeout: float = None):
+        """
+        Met une entrée en file d'attente.
+
+        Si la file est pleine, l'appelant attend (backpressure). Si l'attente
+        dépasse `timeout`, l'entrée est écrite directement pour ne jamais la perdre.
+        """
+        if self._closed or self._stop_requested:
+            self.write_batch([entry])
+            return
+        self.start()
+        try:
+            self._queue.put(entry, timeout=timeout)
+        except queue.Full:
+            self.write_batch([entry])
+
+    def flush(self, timeout: float = None) -> bool:
+        """Attend que toutes les entrées en file soient écrites. Retourne False si timeout."""
+        if self._thread is None or not self._thread.is_alive():
+            self._drain_in_caller()
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            # Réveil régulier : le thread peut s'arrêter sur request_stop() sans vider la file
+            while self._queue.unfinished_tasks and self._thread.is_alive():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(0.1 if remaining is None else min(remaining, 0.1))
+        if self._queue.unfinished_tasks:
+            self._drain_in_caller()
+        return True
+
+    def close(self, timeout: float = None):
+        """Écrit les entrées restantes puis arrête le thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            if not self._stop_requested:
+                self._queue.put(_STOP)
+            thread.join(timeout)
+        self._drain_in_caller()
+
+    def request_stop(self):
+        """
+        Demande l'arrêt du thread sans prendre de verrou ni attendre : utilisable
+        dans un gestionnaire de signal, même arrivé pendant start() ou submit().
+        Les entrées restantes sont écrites par close() (atexit) ou flush().
+        """
+        self._stop_requested = True
+
+    def pending(self) -> int:
+        """Nombre d'entrées pas encore écrites."""
+        return self._queue.unfinished_tasks
+
+    def _run(self):
+        while True:
+            if self._stop_requested:
+                return
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if first is _STOP:
+                self._queue.task_done()
+                return
+
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list):
+        try:
+            self.write_batch(batch)
+        except Exception as e:
+            # Une seconde tentative avant d'abandonner : on ne perd pas le lot en silence
+            print(f" Attention : écriture de {len(batch)} logs échouée ({e}), nouvelle tentative...")
+            try:
+                self.write_batch(batch)
+            except Exception as e2:
+                print(f" ERREUR : {len(batch)} logs n'ont pas pu être écrits : {e2}")
+
+    def _drain_in_caller(self):
+        # Thread arrêté (ou jamais démarré) : on vide la file dans le thread appelant
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+            self._queue.task_done()
+        if batch:
+            self._write(batch)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> BackgroundLogWriter:
+    """Retourne l'écrivain partagé du processus, créé et démarré au premier appel."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundLogWriter().start()
+            atexit.register(_writer.close)
+            _install_signal_handlers()
+    return _writer
+
+
+def flush_logs(timeout: float = None) -> bool:
+    """Force l'écriture des logs en attente (sans effet si le mode asynchrone n'est pas utilisé)."""
+    if _writer is None:
+        return True
+    return _writer.flush(timeout)
+
+
+def _install_signal_handlers():
+    # signal.signal() n'est autorisé que dans le thread principal
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for name in ("SIGTERM", "SIGHUP", "SIGBREAK"):
+        signum = getattr(signal, name, None)
+        if signum is None:
+            continue
+        previous = signal.getsignal(signum)
+        try:
+            signal.signal(signum, _make_handler(previous))
+        except (ValueError, OSError):
+            pass
+
+
+def _make_handler(previous):
+    def handler(signum, frame):
+        # Aucun verrou ni attente ici : le signal peut interrompre start() ou submit() qui tiennent les leurs
+        if _writer is not None:
+            _writer.request_stop()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_IGN:
+            return
+        else:
+            # Terminaison par défaut : SystemExit déroule la pile (verrous relâchés), puis
+            # atexit appelle close() qui écrit les entrées restantes
+            raise SystemExit(128 + signum)
+    return handler
@@ -1,11 +1,12 @@
-import json
-import os
 import uuid
 from datetime import datetime
 from enum import Enum
 
-# Chemin du fichier de logs
-LOG_FILE = os.path.join("logs", "experiment_data.json")
+from src.utils import config
+from src.utils.log_store import append_entries
+from src.utils.log_writer import get_writer
+
+# Le fichier de logs (JSON ou JSONL, segments) est géré par log_store : voir log_store.find_log_file()
 
 class ActionType(str, Enum):
     """
@@ -56,9 +57,6 @@ def log_experiment(agent_name: str, model_used: str, action: ActionType, details
             )
 
     # --- 3. PRÉPARATION DE L'ENTRÉE ---
-    # Création du dossier logs s'il n'existe pas
-    os.makedirs("logs", exist_ok=True)
-    
     entry = {
         "id": str(uuid.uuid4()),  # ID unique pour éviter les doublons lors de la fusion des données
         "timestamp": datetime.now().isoformat(),
@@ -69,21 +67,11 @@ def log_experiment(agent_name: str, model_used: str, action: ActionType, details
         "status": status
     }
 
-    # --- 4. LECTURE & ÉCRITURE ROBUSTE ---
-    data = []
-    if os.path.exists(LOG_FILE):
-        try:
-            with open(LOG_FILE, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content: # Vérifie que le fichier n'est pas juste vide
-                    data = json.loads(content)
-        except json.JSONDecodeError:
-            # Si le fichier est corrompu, on repart à zéro (ou on pourrait sauvegarder un backup)
-            print(f" Attention : Le fichier de logs {LOG_FILE} était corrompu. Une nouvelle liste a été créée.")
-            data = []
-
-    data.append(entry)
-    
-    # Écriture
-    with open(LOG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+    # --- 4. ÉCRITURE ---
+    # Le format ("json" ou "jsonl") est choisi par config.LOG_FORMAT.
+    # En mode asynchrone, l'entrée est écrite par lot par le thread de fond
+    # (vidé à la sortie de l'interpréteur ou via flush_logs()).
+    if config.LOG_ASYNC:
+        get_writer().submit(entry)
+    else:
+        append_entries([entry])
@@ -0,0 +1,229 @@
+"""
+Stockage adressé par contenu des prompts loggés - Data Officer
+
+Les prompts se répètent énormément (auditor_prompt.txt, fixer_prompt.txt, gabarit
+de génération de tests du JudgeAgent...). Au lieu de recopier le texte dans chaque
+entrée, on le découpe en blocs de paragraphes ("\\n\\n"), chaque bloc est stocké
+une seule fois (compressé) et l'entrée ne garde qu'une référence :
+
+    "input_prompt": {"$prompt": "<hash>"}
+
+La référence pointe vers un "arbre" (liste JSON des hash des blocs). Les
+frontières de blocs dépendent du contenu des paragraphes (et pas de leur position),
+donc un même gabarit donne les mêmes blocs quel que soit le code inséré autour.
+Les lecteurs (log_store.iter_log_entries) réhydratent le texte complet.
+
+Disposition dans logs/prompt_store/ :
+  - objects.pack  : blobs zlib ajoutés les uns à la suite des autres
+  - index.jsonl   : {"h": hash, "o": offset, "n": taille} par blob
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+from src.utils import config
+from src.utils.file_lock import FileLock
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+PROMPT_STORE_DIR = PROJECT_ROOT / config.LOGS_DIR / "prompt_store"
+
+REF_KEY = "$prompt"
+CHUNK_SEPARATOR = "\n\n"
+CHUNK_GROUP = 4  # ~4 paragraphes par bloc en moyenne
+DIGEST_CHARS = 32  # sha256 tronqué à 128 bits
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:DIGEST_CHARS]
+
+
+def split_chunks(text: str) -> list:
+    """
+    Découpe un texte en blocs de paragraphes ; CHUNK_SEPARATOR.join(blocs) == text.
+
+    Un bloc se termine après un paragraphe dont le hash est multiple de CHUNK_GROUP.
+    """
+    chunks = []
+    current = []
+    for paragraph in text.split(CHUNK_SEPARATOR):
+        current.append(paragraph)
+        if hashlib.md5(paragraph.encode("utf-8")).digest()[0] % CHUNK_GROUP == 0:
+            chunks.append(CHUNK_SEPARATOR.join(current))
+            current = []
+    if current:
+        chunks.append(CHUNK_SEPARATOR.join(current))
+    return chunks
+
+
+class PromptStore:
+    """
+    Magasin de blobs compressés adressés par leur sha256 (tronqué).
+
+    Args:
+        root (Path): Dossier du magasin (par défaut logs/prompt_store).
+        cache_size (int): Nombre de blobs décompressés gardés en mémoire.
+    """
+
+    def __init__(self, root=None, cache_size: int = 4096):
+        self.root = Path(root) if root else PROMPT_STORE_DIR
+        self.pack_path = self.root / "objects.pack"
+        self.index_path = self.root / "index.jsonl"
+        self.lock_path = self.root / ".lock"
+        self._index = None
+        self._index_size = 0
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    # --- Écriture ---
+
+    def put(self, text: str) -> str:
+        """Stocke un texte (découpé en blocs) et retourne la référence de son arbre."""
+        blobs = [chunk.encode("utf-8") for chunk in split_chunks(text)]
+        chunk_hashes = [_digest(data) for data in blobs]
+        tree = json.dumps(chunk_hashes, separators=(",", ":")).encode("utf-8")
+        tree_hash = _digest(tree)
+        self._put_blobs(list(zip(chunk_hashes, blobs)) + [(tree_hash, tree)])
+        return tree_hash
+
+    def _put_blobs(self, blobs: list):
+        with self._lock:
+            if all(digest in self._load_index() for digest, _ in blobs):
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            with FileLock(self.lock_path):
+                self._append_missing(blobs)
+
+    def _append_missing(self, blobs: list):
+        # Sous verrou : on relit la fin de l'index, un autre processus a pu ajouter ces blobs
+        index = self._load_index(refresh=True)
+        missing = {}
+        for digest, data in blobs:
+            if digest not in index and digest not in missing:
+                missing[digest] = zlib.compress(data, 6)
+        if not missing:
+            return
+
+        # Les blobs sont écrits avant leurs lignes d'index : une référence indexée est toujours lisible
+        records = []
+        with open(self.pack_path, "ab") as pack:
+            offset = pack.seek(0, os.SEEK_END)
+            for digest, compressed in missing.items():
+                records.append((digest, offset, len(compressed)))
+                offset += len(compressed)
+            pack.write(b"".join(missing.values()))
+        lines = "".join(json.dumps({"h": d, "o": o, "n": n}) + "\n" for d, o, n in records).encode("utf-8")
+        with open(self.index_path, "ab") as index_file:
+            index_file.write(lines)
+        self._index_size += len(lines)
+        for digest, offset, size in records:
+            index[digest] = (offset, size)
+
+    # --- Lecture ---
+
+    def get(self, ref: str) -> str:
+        """Reconstruit le texte complet à partir de la référence d'un arbre."""
+        chunk_hashes = json.loads(self._get_blob(ref))
+        return CHUNK_SEPARATOR.join(self._get_blob(h).decode("utf-8") for h in chunk_hashes)
+
+    def contains(self, ref: str) -> bool:
+        with self._lock:
+            return ref in self._load_index()
+
+    def _get_blob(self, digest: str) -> bytes:
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+            location = self._load_index().get(digest)
+            if location is None:
+                # Un autre processus a pu ajouter des blobs depuis notre lecture de l'index
+                location = self._load_index(refresh=True).get(digest)
+            if location is None:
+                raise KeyError(f"Blob {digest} introuvable dans {self.root}")
+            offset, size = location
+            with open(self.pack_path, "rb") as pack:
+                pack.seek(offset)
+                data = zlib.decompress(pack.read(size))
+            self._cache[digest] = data
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return data
+
+    def _load_index(self, refresh: bool = False) -> dict:
+        if self._index is None:
+            self._index = {}
+            self._index_size = 0
+            refresh = True
+        if refresh and self.index_path.exists():
+            # Lecture incrémentale : seules les lignes ajoutées depuis la dernière fois
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_size)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # ligne en cours d'écriture par un autre processus
+                    record = json.loads(line)
+                    self._index[record["h"]] = (record["o"], record["n"])
+                    self._index_size += len(line)
+        return self._index
+
+
+_store = None
+
+
+def get_store() -> PromptStore:
+    """Magasin partagé du processus (logs/prompt_store)."""
+    global _store
+    if _store is None:
+        _store = PromptStore()
+    return _store
+
+
+def is_prompt_ref(value) -> bool:
+    return isinstance(value, dict) and REF_KEY in value
+
+
+def externalize_prompts(entry: dict, store: PromptStore = None) -> dict:
+    """
+    Retourne une copie de l'entrée où les prompts longs sont remplacés par une référence.
+
+    Seuls les champs de config.PROMPT_STORE_FIELDS d'au moins
+    config.PROMPT_STORE_MIN_CHARS caractères sont externalisés.
+    """
+    details = entry.get("details")
+    if not isinstance(details, dict):
+        return entry
+    store = store or get_store()
+    new_details = None
+    for field in config.PROMPT_STORE_FIELDS:
+        value = details.get(field)
+        if isinstance(value, str) and len(value) >= config.PROMPT_STORE_MIN_CHARS:
+            if new_details is None:
+                new_details = dict(details)
+            new_details[field] = {REF_KEY: store.put(value)}
+    if new_details is None:
+        return entry
+    return {**entry, "details": new_details}
+
+
+def rehydrate_prompts(entry: dict, store: PromptStore = None) -> dict:
+    """
+    Remplace (sur place) les références par le texte complet.
+
+    Une référence introuvable est laissée telle quelle pour que validate_log la signale.
+    """
+    details = entry.get("details") if isinstance(entry, dict) else None
+    if not isinstance(details, dict):
+        return entry
+    for field, value in details.items():
+        if is_prompt_ref(value):
+            try:
+                details[field] = (store or get_store()).get(value[REF_KEY])
+            except (KeyError, OSError, ValueError, zlib.error):
+                pass
+    return entry
@@ -3,158 +3,187 @@ Validateur principal des logs - Data Officer
 """
 
 import json
-import os
-from datetime import datetime
+import sys
 from pathlib import Path
 
-def validate_log():
-    """Valide le fichier de logs experiment_data.json"""
-    
-    logs_path = Path(__file__).parent.parent.parent / "logs" / "experiment_data.json"
-    
-    print("=" * 60)
-    print(" VALIDATION DES LOGS - Data Officer")
-    print("=" * 60)
-    
-    # 1. Vérifier l'existence
-    if not logs_path.exists():
-        print(" ERREUR: Fichier experiment_data.json introuvable")
-        print(f"   Chemin: {logs_path}")
-        return False
-    
-    if logs_path.stat().st_size == 0:
-        print(" ERREUR: Fichier vide")
-        return False
-    
-    try:
-        # 2. Charger le JSON
-        with open(logs_path, 'r', encoding='utf-8') as f:
-            logs_data = json.load(f)
-        
-        print(f" Fichier trouvé: {logs_path}")
-        print(f" Format JSON valide")
-        
-        # 3. Vérifier que c'est une liste
-        if not isinstance(logs_data, list):
-            print(" ERREUR: Doit être un tableau (list) JSON")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.log_scan import LogChecker, merge_counts, run_checker
+from src.utils.prompt_store import is_prompt_ref
+
+class ValidateLogChecker(LogChecker):
+    """Validation du format des entrées (visiteur du parcours unique, cf. log_scan)"""
+
+    required_fields = ['agent', 'model', 'action', 'timestamp', 'details', 'status']
+    required_details = ['input_prompt', 'output_response']
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        # Seuls les premiers messages sont affichés : on garde ceux-là et le total
+        self.errors = []
+        self.errors_count = 0
+        self.warnings = []
+        self.warnings_count = 0
+        self.agents = {}
+        self.actions = {}
+        self.statuses = {}
+
+    def _error(self, i, message):
+        self.errors_count += 1
+        if len(self.errors) < 5:
+            self.errors.append((i, message))
+
+    def _warning(self, i, message):
+        self.warnings_count += 1
+        if len(self.warnings) < 3:
+            self.warnings.append((i, message))
+
+    def visit(self, entry):
+        i = self.count
+        self.count += 1
+
+        # Champs obligatoires
+        for field in self.required_fields:
+            if field not in entry:
+                self._error(i, f"'{field}' manquant")
+
+        # Détails obligatoires
+        if 'details' in entry:
+            for detail in self.required_details:
+                if detail not in entry['details']:
+                    self._error(i, f"Détail '{detail}' manquant")
+                elif is_prompt_ref(entry['details'][detail]):
+                    self._error(i, f"Détail '{detail}' introuvable dans logs/prompt_store")
+
+        # Vérifications de qualité
+        if 'details' in entry:
+            details = entry['details']
+
+            # Longueur des prompts
+            if 'input_prompt' in details:
+                prompt_len = len(str(details['input_prompt']))
+                if prompt_len < 10:
+                    self._warning(i, f"Prompt très court ({prompt_len} chars)")
+
+            # Longueur des réponses
+            if 'output_response' in details:
+                response_len = len(str(details['output_response']))
+                if response_len < 10:
+                    self._warning(i, f"Réponse très courte ({response_len} chars)")
+
+        # Statistiques
+        agent = entry.get('agent_name', 'UNKNOWN')
+        action = entry.get('action', 'UNKNOWN')
+        status = entry.get('status', 'UNKNOWN')
+
+        self.agents[agent] = self.agents.get(agent, 0) + 1
+        self.actions[action] = self.actions.get(action, 0) + 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def merge(self, other):
+        # Numéros d'entrée de l'autre plage décalés du nombre d'entrées déjà vues
+        self.errors += [(i + self.count, message) for i, message in other.errors]
+        del self.errors[5:]
+        self.errors_count += other.errors_count
+        self.warnings += [(i + self.count, message) for i, message in other.warnings]
+        del self.warnings[3:]
+        self.warnings_count += other.warnings_count
+        merge_counts(self.agents, other.agents)
+        merge_counts(self.actions, other.actions)
+        merge_counts(self.statuses, other.statuses)
+        self.count += other.count
+
+    def report(self, scan):
+        logs_path = scan.log_file
+
+        print("=" * 60)
+        print(" VALIDATION DES LOGS - Data Officer")
+        print("=" * 60)
+
+        # 1. Vérifier l'existence
+        if not scan.exists:
+            print(f" ERREUR: Fichier {logs_path.name} introuvable")
+            print(f"   Chemin: {logs_path}")
+            return False
+
+        if scan.total_size == 0:
+            print(" ERREUR: Fichier vide")
+            return False
+
+        # 2. Le JSON (tableau ou une entrée par ligne) a été lu par le parcours
+        if isinstance(scan.error, json.JSONDecodeError):
+            print(f" ERREUR JSON: {scan.error}")
             return False
-        
-        print(f" Nombre d'entrées: {len(logs_data)}")
-        
-        # 4. Vérifier chaque entrée
-        required_fields = ['agent', 'model', 'action', 'timestamp', 'details', 'status']
-        required_details = ['input_prompt', 'output_response']
-        
-        errors = []
-        warnings = []
-        
-        for i, entry in enumerate(logs_data):
-            # Champs obligatoires
-            for field in required_fields:
-                if field not in entry:
-                    errors.append(f"Entrée #{i}: '{field}' manquant")
-            
-            # Détails obligatoires
-            if 'details' in entry:
-                for detail in required_details:
-                    if detail not in entry['details']:
-                        errors.append(f"Entrée #{i}: Détail '{detail}' manquant")
-            
-            # Vérifications de qualité
-            if 'details' in entry:
-                details = entry['details']
-                
-                # Longueur des prompts
-                if 'input_prompt' in details:
-                    prompt_len = len(str(details['input_prompt']))
-                    if prompt_len < 10:
-                        warnings.append(f"Entrée #{i}: Prompt très court ({prompt_len} chars)")
-                
-                # Longueur des réponses
-                if 'output_response' in details:
-                    response_len = len(str(details['output_response']))
-                    if response_len < 10:
-                        warnings.append(f"Entrée #{i}: Réponse très courte ({response_len} chars)")
-        
-        # 5. Afficher les résultats
-        if errors:
+        if scan.error is not None or self.failure is not None:
+            print(f" ERREUR: {scan.error or self.failure}")
+            return False
+
+        print(f" Fichier trouvé: {logs_path}")
+        print(f" Format {scan.format.upper()} valide")
+        print(f" Nombre d'entrées: {self.count}")
+
+        # 3. Afficher les résultats
+        if self.errors:
             print("\n ERREURS CRITIQUES:")
-            for error in errors[:5]:
-                print(f"   - {error}")
-            if len(errors) > 5:
-                print(f"   ... et {len(errors) - 5} erreurs supplémentaires")
+            for i, error in self.errors:
+                print(f"   - Entrée #{i}: {error}")
+            if self.errors_count > 5:
+                print(f"   ... et {self.errors_count - 5} erreurs supplémentaires")
         else:
             print("\n Aucune erreur critique")
-        
-        if warnings:
+
+        if self.warnings:
             print("\n AVERTISSEMENTS:")
-            for warning in warnings[:3]:
-                print(f"   - {warning}")
-            if len(warnings) > 3:
-                print(f"   ... et {len(warnings) - 3} avertissements supplémentaires")
-        
-        # 6. Statistiques
-        if logs_data:
+            for i, warning in self.warnings:
+                print(f"   - Entrée #{i}: {warning}")
+            if self.warnings_count > 3:
+                print(f"   ... et {self.warnings_count - 3} avertissements supplémentaires")
+
+        # 4. Statistiques
+        if self.count:
             print("\n STATISTIQUES:")
-            
-            agents = {}
-            actions = {}
-            statuses = {}
-            
-            for entry in logs_data:
-                agent = entry.get('agent_name', 'UNKNOWN')
-                action = entry.get('action', 'UNKNOWN')
-                status = entry.get('status', 'UNKNOWN')
-                
-                agents[agent] = agents.get(agent, 0) + 1
-                actions[action] = actions.get(action, 0) + 1
-                statuses[status] = statuses.get(status, 0) + 1
-            
+
             print("   Agents:")
-            for agent, count in agents.items():
+            for agent, count in self.agents.items():
                 print(f"     - {agent}: {count}")
-            
+
             print("\n   Actions:")
-            for action, count in actions.items():
+            for action, count in self.actions.items():
                 print(f"     - {action}: {count}")
-        
+
         print("\n" + "=" * 60)
-        
-        if not errors:
+
+        if not self.errors:
             print(" VALIDATION RÉUSSIE - Fichier de logs conforme")
             return True
         else:
             print(" VALIDATION ÉCHOUÉE - Corrections nécessaires")
             return False
-            
-    except json.JSONDecodeError as e:
-        print(f" ERREUR JSON: {e}")
-        return False
-    except Exception as e:
-        print(f" ERREUR: {e}")
-        return False
+
+def validate_log(full: bool = False):
+    """
+    Valide le fichier de logs experiment_data.json (tableau JSON ou JSON Lines)
+
+    Seules les entrées ajoutées depuis la dernière validation sont lues
+    (voir log_checkpoint) ; full=True force la revalidation de tout le journal.
+    """
+    return run_checker(ValidateLogChecker(), resume=not full)
 
 def backup_logs():
-    """Crée une sauvegarde des logs"""
-    logs_path = Path(__file__).parent.parent.parent / "logs" / "experiment_data.json"
-    
-    if logs_path.exists():
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = logs_path.parent / f"experiment_data_backup_{timestamp}.json"
-        
-        import shutil
-        shutil.copy2(logs_path, backup_path)
-        print(f" Sauvegarde créée: {backup_path.name}")
-        return backup_path
-    
-    return None
+    """Crée une sauvegarde incrémentale des logs (voir backup_logs.backup_experiment_data)"""
+    from src.utils.backup_logs import backup_experiment_data
+
+    return backup_experiment_data()
 
 if __name__ == "__main__":
     # Sauvegarde avant validation
     backup_logs()
     
-    # Validation
-    is_valid = validate_log()
+    # Validation (--full : ignore le point de reprise)
+    is_valid = validate_log(full="--full" in sys.argv)
     
     if not is_valid:
         print("\n ACTION REQUISE: Corriger les erreurs!")
@@ -0,0 +1,28 @@
+"""
+Configuration pytest commune : racine du projet dans sys.path (imports `src.`)
+et dossier de logs isolé par test.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils import config, log_store
+
+
+@pytest.fixture
+def logs_dir(tmp_path, monkeypatch):
+    """Journal dans un dossier temporaire, écriture synchrone, sans index."""
+    monkeypatch.setattr(config, "LOG_ASYNC", False)
+    monkeypatch.setattr(config, "LOG_INDEX", False)
+    monkeypatch.setattr(config, "LOG_PROMPT_STORE", False)
+    monkeypatch.setattr(config, "LOG_FORMAT", "jsonl")
+    previous = log_store.LOGS_DIR
+    log_store.set_logs_dir(tmp_path / "logs")
+    yield tmp_path / "logs"
+    log_store.set_logs_dir(previous)
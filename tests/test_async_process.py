@@ -0,0 +1,19 @@
+import asyncio
+import time
+
+from src.tools.async_process import run_process
+
+
+def test_leftover_process_does_not_block_the_output():
+    # `sleep` reste en arrière-plan avec les tubes du shell ouverts
+    start = time.monotonic()
+    returncode, stdout, _, timed_out = asyncio.run(run_process(["sh", "-c", "sleep 60 & echo done"], timeout=30))
+    assert (returncode, stdout, timed_out) == (0, "done\n", False)
+    assert time.monotonic() - start < 20
+
+
+def test_timeout_kills_the_group():
+    start = time.monotonic()
+    _, stdout, _, timed_out = asyncio.run(run_process(["sh", "-c", "echo start; sleep 60"], timeout=0.5))
+    assert timed_out and stdout == "start\n"
+    assert time.monotonic() - start < 20
@@ -0,0 +1,75 @@
+import hashlib
+import threading
+import time
+
+from src.utils import backup_logs, log_store
+from src.utils.file_lock import FileLock
+
+
+def _entry(index: int) -> dict:
+    return {"id": f"id-{index}", "timestamp": f"2024-01-01T00:00:{index:02d}", "agent": "Judge",
+            "action": "DEBUG", "status": "SUCCESS", "details": {"input_prompt": f"prompt {index}" * 20}}
+
+
+def _digests() -> dict:
+    return {path.relative_to(log_store.LOGS_DIR).as_posix(): hashlib.sha256(path.read_bytes()).hexdigest()
+            for path in backup_logs._journal_files()}
+
+
+def _restore(path) -> bool:
+    number = [backup.name for backup in backup_logs.list_backups()].index(path.name) + 1
+    return backup_logs.restore_backup(number)
+
+
+def test_backup_restore_round_trip(logs_dir, monkeypatch):
+    monkeypatch.setattr(backup_logs, "CHUNK_SIZE", 256)
+    log_store.append_entries([_entry(index) for index in range(5)])
+    first, first_digests = backup_logs.backup_experiment_data(), _digests()
+    with FileLock(log_store.LOCK_FILE):
+        log_store.rotate_log(log_store.JSONL_LOG_FILE)
+    log_store.append_entries([_entry(index) for index in range(5, 8)])
+    second, second_digests = backup_logs.backup_experiment_data(), _digests()
+    assert any(name.startswith("segments/") for name in second_digests)
+
+    assert _restore(first) and _digests() == first_digests
+    assert _restore(second) and _digests() == second_digests
+
+
+def test_file_rewritten_in_the_middle_is_backed_up(logs_dir, monkeypatch):
+    monkeypatch.setattr(backup_logs, "CHUNK_SIZE", 64)
+    log_store.append_entries([_entry(index) for index in range(4)])
+    backup_logs.backup_experiment_data()
+
+    # Même début, même bloc de jonction, un bloc du milieu modifié, puis un ajout
+    data = bytearray(log_store.JSONL_LOG_FILE.read_bytes())
+    middle = len(data) // 2
+    data[middle:middle + 6] = b"XXXXXX"
+    log_store.JSONL_LOG_FILE.write_bytes(bytes(data) + b'{"id": "id-9"}\n')
+    snapshot, expected = backup_logs.backup_experiment_data(), _digests()
+
+    log_store.JSONL_LOG_FILE.unlink()
+    assert _restore(snapshot) and _digests() == expected
+
+
+def test_legacy_restore_waits_for_the_log_lock(logs_dir, monkeypatch):
+    log_store.append_entries([_entry(0)])
+    # Sans la sauvegarde préalable (elle prend aussi le verrou) : seul le remplacement du journal attend
+    monkeypatch.setattr(backup_logs, "backup_experiment_data", lambda: None)
+    legacy = backup_logs.get_backup_dir() / "experiment_data_20240101_000000.jsonl"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text('{"id": "legacy"}\n', encoding="utf-8")
+    lock = FileLock(log_store.LOCK_FILE).acquire()
+    done = threading.Event()
+    backups = backup_logs.list_backups()
+    number = backups.index(legacy) + 1
+    restorer = threading.Thread(target=lambda: (backup_logs.restore_backup(number), done.set()), daemon=True)
+    try:
+        restorer.start()
+        time.sleep(0.3)
+        assert not done.is_set()
+        assert [entry["id"] for entry in log_store.load_log_entries()] == ["id-0"]
+    finally:
+        lock.release()
+    restorer.join(10)
+    assert done.is_set()
+    assert [entry["id"] for entry in log_store.load_log_entries()] == ["legacy"]
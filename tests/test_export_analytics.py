@@ -0,0 +1,84 @@
+import json
+
+import pandas as pd
+
+from src.data_quality import export_analytics as export
+from src.utils import log_store
+from src.utils.file_lock import FileLock
+
+
+def _entry(index: int, **details) -> dict:
+    return {"id": f"id-{index}", "timestamp": f"2024-01-01T00:00:{index:02d}", "agent": "Auditor",
+            "action": "CODE_ANALYSIS", "status": "SUCCESS", "details": details}
+
+
+def _legacy(index: int) -> dict:
+    # Format de generate_test_logs : ni 'id' ni 'agent'
+    return {"timestamp": f"2024-01-01T00:00:{index:02d}", "agent_name": f"Agent{index}",
+            "model_used": "m", "action": "CODE_ANALYSIS", "status": "SUCCESS", "details": {}}
+
+
+def test_mistyped_details_become_null(logs_dir):
+    log_store.append_entries([
+        _entry(0, pylint_score="N/A", issues_detected=2.5, tests_generated="yes", pytest_passed="maybe"),
+        _entry(1, pylint_score="7.5", issues_detected=3.0, tests_generated=False, pytest_passed=True),
+        _entry(2, pylint_score=True, issues_count="4", tests_generated=1),
+    ])
+    assert export.export_analytics() == 3
+
+    frame = export.load_analytics()
+    assert frame["pylint_score"].tolist()[1] == 7.5
+    assert frame["pylint_score"].isna().tolist() == [True, False, True]
+    assert frame["issues_detected"].tolist()[1] == 3
+    assert frame["issues_detected"].isna().tolist() == [True, False, True]
+    assert frame["issues_count"].tolist()[2] == 4
+    assert frame["tests_generated"].tolist() == [True, False, True]
+    assert frame["pytest_passed"].isna().tolist() == [True, False, True]
+    assert str(frame["issues_detected"].dtype) == "Int64"
+
+
+def test_incremental_export_resumes_at_the_saved_offset(logs_dir, monkeypatch):
+    log_store.append_entries([_entry(index) for index in range(3)])
+    assert export.export_analytics() == 3
+    log_store.append_entries([_entry(index) for index in range(3, 5)])
+
+    # La reprise ne relit pas les entrées déjà exportées
+    starts = []
+    reader_class = export.LogReader
+
+    def reader(path, fmt, start_offset=0, **options):
+        starts.append(start_offset)
+        return reader_class(path, fmt, start_offset=start_offset, **options)
+
+    monkeypatch.setattr(export, "LogReader", reader)
+    assert export.export_analytics() == 2
+    state = json.loads((export.get_analytics_dir() / "state.json").read_text(encoding="utf-8"))
+    assert starts[0] > 0 and state["offset"] == log_store.JSONL_LOG_FILE.stat().st_size
+    frame = export.load_analytics()
+    assert frame["seq"].tolist() == list(range(5))
+    assert frame["id"].tolist() == [f"id-{index}" for index in range(5)]
+
+
+def test_rewritten_log_without_ids_is_reexported(logs_dir):
+    log_store.append_entries([_legacy(index) for index in range(3)])
+    assert export.export_analytics() == 3
+
+    # Même nombre d'entrées, aucune 'id' : seul le contenu permet de voir la réécriture
+    log_store.JSONL_LOG_FILE.unlink()
+    log_store.append_entries([_legacy(index) for index in range(10, 14)])
+    assert export.export_analytics() == 4
+    assert export.load_analytics()["agent"].tolist() == [f"Agent{index}" for index in range(10, 14)]
+
+
+def test_incremental_export_follows_rotation(logs_dir):
+    log_store.append_entries([_entry(index) for index in range(2)])
+    assert export.export_analytics() == 2
+    log_store.append_entries([_entry(2)])
+    with FileLock(log_store.LOCK_FILE):
+        log_store.rotate_log(log_store.JSONL_LOG_FILE)
+    log_store.append_entries([_entry(3)])
+
+    assert export.export_analytics() == 2
+    frame = export.load_analytics()
+    assert frame["id"].tolist() == [f"id-{index}" for index in range(4)]
+    assert pd.api.types.is_datetime64_dtype(frame["timestamp"])
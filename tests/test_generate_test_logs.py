@@ -0,0 +1,12 @@
+from src.utils import log_store
+from src.utils.generate_test_logs import generate_test_logs, get_synthetic_dir
+
+
+def test_default_output_leaves_the_real_log_alone(logs_dir):
+    log_store.append_entries([{"id": "real", "agent": "Auditor", "details": {}}])
+    before = log_store.JSONL_LOG_FILE.read_bytes()
+
+    path = generate_test_logs(5, "jsonl", seed=1)
+    assert path == get_synthetic_dir() / "experiment_data.jsonl"
+    assert len(log_store.load_log_entries(path)) == 5
+    assert log_store.JSONL_LOG_FILE.read_bytes() == before
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+from src.tools import governor
+
+
+def _wait_queued(gov: governor.Governor, count: int):
+    deadline = time.monotonic() + 5
+    while gov.stats()["test"]["queued"] < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_threads_get_their_slot_in_request_order():
+    gov = governor.Governor({"test": 1}, {"test": 0})
+    order, threads = [], []
+
+    def job(index):
+        with gov.slot("test"):
+            order.append(index)
+
+    with gov.slot("test"):
+        # Chaque demande entre dans la file avant la suivante
+        for index in range(5):
+            threads.append(threading.Thread(target=job, args=(index,)))
+            threads[-1].start()
+            _wait_queued(gov, index + 1)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == list(range(5))
+    stats = gov.stats()["test"]
+    assert (stats["running"], stats["queued"], stats["max_queued"], stats["waited"]) == (0, 0, 5, 5)
+
+
+def test_cancelled_request_leaves_the_queue():
+    gov = governor.Governor({"test": 2}, {"test": 0})
+    order = []
+
+    async def job(index):
+        async with gov.slot_async("test"):
+            order.append(index)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        async with gov.slot_async("test", 2):
+            tasks = [asyncio.ensure_future(job(index)) for index in range(4)]
+            await asyncio.sleep(0.05)
+            assert gov.stats()["test"]["queued"] == 4
+            tasks[1].cancel()
+            await asyncio.sleep(0.05)
+            assert gov.stats()["test"]["queued"] == 3
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(main())
+    assert order == [0, 2, 3]
+    assert gov.stats()["test"]["running"] == 0
+
+
+def test_low_memory_runs_one_at_a_time():
+    gov = governor.Governor({"test": 3}, {"test": 100}, memory=lambda: 50)
+    running, peak, lock = 0, 0, threading.Lock()
+
+    def job():
+        nonlocal running, peak
+        with gov.slot("test"):
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+    threads = [threading.Thread(target=job) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert peak == 1
+
+
+def test_request_larger_than_the_limit_is_capped():
+    gov = governor.Governor({"test": 2}, {"test": 0})
+    with gov.slot("test", 10) as granted:
+        assert granted == 2 and gov.stats()["test"]["running"] == 2
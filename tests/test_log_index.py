@@ -0,0 +1,82 @@
+import sqlite3
+
+from src.utils import config, log_store
+from src.utils.file_lock import FileLock
+from src.utils.log_index import LogIndex
+from src.utils.log_writer import BackgroundLogWriter
+
+
+def _entry(index: int, prompt: str = "prompt", status: str = "SUCCESS") -> dict:
+    return {"id": f"id-{index}", "timestamp": f"2024-01-01T00:00:{index:02d}", "agent": "Auditor",
+            "action": "CODE_ANALYSIS", "status": status,
+            "details": {"input_prompt": prompt, "output_response": "ok"}}
+
+
+def _legacy(index: int) -> dict:
+    # Format de generate_test_logs : pas d'id
+    return {"timestamp": f"2024-01-01T00:00:{index:02d}", "agent_name": "Fixer", "model_used": "m",
+            "action": "FIX", "status": "SUCCESS", "details": {}}
+
+
+def test_entries_without_id_are_indexed_once(logs_dir):
+    log_store.append_entries([_legacy(index) for index in range(3)])
+    index = LogIndex()
+    assert index.sync() == 3
+    assert index.sync() == 0
+    assert index.rebuild() == 3
+    log_store.append_entries([_legacy(3), _legacy(3)])  # deux entrées identiques restent deux entrées
+    index.sync()
+    assert index.count() == 5
+    assert index.count(group_by="agent") == {"Fixer": 5}
+
+
+def test_index_stores_pointers_not_entries(logs_dir):
+    log_store.append_entries([_entry(0, "un long prompt " * 50), _entry(1, status="FAILURE")])
+    index = LogIndex()
+    index.sync()
+    conn = sqlite3.connect(index.path)
+    try:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+    finally:
+        conn.close()
+    assert "entry" not in columns and {"source", "byte_offset"} <= set(columns)
+    assert index.query(status="FAILURE") == [_entry(1, status="FAILURE")]
+    assert [entry["id"] for entry in index.query(newest_first=True)] == ["id-1", "id-0"]
+
+
+def test_index_follows_rotation_and_rewrites(logs_dir, monkeypatch):
+    monkeypatch.setattr(config, "LOG_INDEX", True)
+    log_store.append_entries([_entry(0, "x" * 1000), _entry(1)])
+    with FileLock(log_store.LOCK_FILE):
+        log_store.rotate_log(log_store.JSONL_LOG_FILE)
+    log_store.append_entries([_entry(2, "x" * 1000), _entry(3, status="FAILURE")])
+    index = LogIndex()
+    assert index.count() == 4
+    assert [entry["id"] for entry in index.query()] == ["id-0", "id-1", "id-2", "id-3"]
+
+    # compact_prompts réécrit le fichier actif : ses positions sont recalculées
+    log_store.compact_prompts()
+    index.sync()
+    assert index.count() == 4
+    assert index.query(status="FAILURE") == [_entry(3, status="FAILURE")]
+    assert [entry["details"]["input_prompt"] for entry in index.query()][2] == "x" * 1000
+
+
+def test_append_leaves_indexing_to_the_writer_and_queries(logs_dir, monkeypatch):
+    monkeypatch.setattr(config, "LOG_INDEX", True)
+    index = LogIndex()
+    log_store.append_entries([_entry(0)])
+    assert not index.path.exists()  # l'ajout synchrone reste une seule écriture
+
+    # Une recherche indexe d'abord ce qui manque
+    assert [entry["id"] for entry in index.query()] == ["id-0"]
+
+    # L'écrivain de fond indexe chaque lot après l'avoir écrit
+    writer = BackgroundLogWriter(flush_interval=0.05).start()
+    try:
+        writer.submit(_entry(1))
+        writer.flush(5)
+    finally:
+        writer.close(5)
+    assert index.sync() == 0
+    assert index.count() == 2
@@ -0,0 +1,36 @@
+from src.utils import log_store
+from src.utils.log_scan import LogChecker, MIN_RANGE_BYTES, merge_counts, plan_ranges, scan_log
+
+
+class _CountingChecker(LogChecker):
+    def __init__(self):
+        super().__init__()
+        self.ids = []
+        self.agents = {}
+
+    def visit(self, entry):
+        self.ids.append(entry["id"])
+        self.agents[entry["agent"]] = self.agents.get(entry["agent"], 0) + 1
+
+    def merge(self, other):
+        self.ids += other.ids
+        merge_counts(self.agents, other.agents)
+
+    def report(self, scan):
+        return scan.error is None
+
+
+def test_active_file_under_the_rotation_size_is_split(logs_dir):
+    padding = "x" * 1000
+    entries = [{"id": f"id-{index}", "agent": f"A{index % 3}", "details": {"input_prompt": padding}}
+               for index in range(3 * MIN_RANGE_BYTES // 1000)]
+    log_store.append_entries(entries)
+
+    ranges = plan_ranges(4)
+    assert len(ranges) == 3
+    sequential, parallel = _CountingChecker(), _CountingChecker()
+    scan_log([sequential], resume=False)
+    scan = scan_log([parallel], resume=False, jobs=4)
+    assert scan.error is None and scan.entries == len(entries)
+    assert parallel.ids == sequential.ids == [entry["id"] for entry in entries]
+    assert parallel.agents == sequential.agents
@@ -0,0 +1,49 @@
+from src.data_quality import export_analytics as export
+from src.data_quality import log_statistics
+from src.utils import config, log_store
+
+
+def _entry(index: int, status: str = "SUCCESS") -> dict:
+    return {"id": f"id-{index}", "timestamp": f"2024-01-01T00:00:{index:02d}", "agent": "Fixer",
+            "action": "FIX", "status": status,
+            "details": {"file_fixed": "sandbox/a.py", "input_prompt": "prompt " * 5, "output_response": "ok " * 5}}
+
+
+def test_statistics_export_only_when_behind_the_log(logs_dir, monkeypatch):
+    exports = []
+
+    def counting_export(*args, **kwargs):
+        exports.append(1)
+        return export.export_analytics(*args, **kwargs)
+
+    monkeypatch.setattr(log_statistics, "export_analytics", counting_export)
+    log_store.append_entries([_entry(0), _entry(1, "FAILURE")])
+    assert log_statistics.compute_log_statistics()["entries"] == 2
+    assert len(exports) == 1
+
+    # Export à jour : les fichiers colonnaires sont lus tels quels
+    assert export.export_is_current()
+    assert log_statistics.compute_log_statistics()["entries"] == 2
+    assert len(exports) == 1
+
+    log_store.append_entries([_entry(2)])
+    assert not export.export_is_current()
+    stats = log_statistics.compute_log_statistics()
+    assert stats["entries"] == 3 and len(exports) == 2
+    assert stats["failures_by_agent"].loc["Fixer", "failures"] == 1
+
+    # Rafraîchissement explicite, ou aucun même en retard
+    log_statistics.compute_log_statistics(refresh=True)
+    assert len(exports) == 3
+    log_store.append_entries([_entry(3)])
+    assert log_statistics.compute_log_statistics(refresh=False)["entries"] == 3
+
+
+def test_export_is_current_with_a_json_array_log(logs_dir, monkeypatch):
+    monkeypatch.setattr(config, "LOG_FORMAT", "json")
+    log_store.append_entries([_entry(0)])
+    assert not export.export_is_current()
+    export.export_analytics()
+    assert export.export_is_current()
+    log_store.append_entries([_entry(1)])
+    assert not export.export_is_current()
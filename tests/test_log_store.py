@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+
+from src.utils import log_store
+from src.utils.file_lock import FileLock
+
+
+def _entry(index: int, prompt: str = "prompt") -> dict:
+    return {"id": f"id-{index}", "timestamp": f"2024-01-01T00:00:{index:02d}", "agent": "Auditor",
+            "action": "CODE_ANALYSIS", "status": "SUCCESS",
+            "details": {"input_prompt": prompt, "output_response": "ok"}}
+
+
+def test_compact_prompts_round_trip(logs_dir):
+    prompt = "Paragraphe.\n\n" * 100
+    log_store.append_entries([_entry(index, prompt) for index in range(3)])
+    assert log_store.compact_prompts() == 3
+
+    raw = [json.loads(line) for line in log_store.JSONL_LOG_FILE.read_text(encoding="utf-8").splitlines()]
+    assert all(isinstance(entry["details"]["input_prompt"], dict) for entry in raw)
+    assert [entry["details"]["input_prompt"] for entry in log_store.load_log_entries()] == [prompt] * 3
+
+
+def test_compact_prompts_waits_for_the_append_lock(logs_dir):
+    log_store.append_entries([_entry(0, "x" * 1000)])
+    lock = FileLock(log_store.LOCK_FILE).acquire()
+    done = threading.Event()
+    compactor = threading.Thread(target=lambda: (log_store.compact_prompts(), done.set()), daemon=True)
+    try:
+        compactor.start()
+        time.sleep(0.2)
+        assert not done.is_set()
+        # Ajout concurrent (ce que fait append_entries sous le verrou) : il ne doit pas être perdu
+        log_store._append_locked([_entry(1)], "jsonl", log_store.JSONL_LOG_FILE)
+    finally:
+        lock.release()
+    compactor.join(5)
+    assert done.is_set()
+    assert [entry["id"] for entry in log_store.load_log_entries()] == ["id-0", "id-1"]
+
+
+def test_compact_prompts_leaves_sealed_segments_untouched(logs_dir):
+    log_store.append_entries([_entry(0, "y" * 1000)])
+    with FileLock(log_store.LOCK_FILE):
+        segment = log_store.rotate_log(log_store.JSONL_LOG_FILE)
+    before = segment.read_bytes()
+    log_store.append_entries([_entry(1, "y" * 1000)])
+    assert log_store.compact_prompts() == 1
+    assert segment.read_bytes() == before
+    assert [entry["id"] for entry in log_store.load_log_entries()] == ["id-0", "id-1"]
+
+
+def test_interrupted_sealing_is_finished_by_the_next_append(logs_dir):
+    log_store.append_entries([_entry(index) for index in range(2)])
+    # Crash juste après le renommage : le fichier en cours de scellement n'est pas encore un segment
+    sealing = log_store._sealing_path(log_store.JSONL_LOG_FILE)
+    log_store.JSONL_LOG_FILE.rename(sealing)
+
+    log_store.append_entries([_entry(2)])
+    segments = log_store.read_manifest()["segments"]
+    assert [(segment["entries"], segment["first_id"]) for segment in segments] == [(2, "id-0")]
+    assert not sealing.exists()
+    assert [entry["id"] for entry in log_store.load_log_entries()] == ["id-0", "id-1", "id-2"]
+
+
+def test_sealing_already_in_the_manifest_is_not_sealed_twice(logs_dir):
+    log_store.append_entries([_entry(index) for index in range(2)])
+    raw = log_store.JSONL_LOG_FILE.read_bytes()
+    with FileLock(log_store.LOCK_FILE):
+        log_store.rotate_log(log_store.JSONL_LOG_FILE)
+    # Crash entre l'écriture du manifest et la suppression du fichier scellé
+    sealing = log_store._sealing_path(log_store.JSONL_LOG_FILE)
+    sealing.write_bytes(raw)
+    assert log_store._is_sealed(sealing)
+
+    log_store.append_entries([_entry(2)])
+    assert len(log_store.read_manifest()["segments"]) == 1
+    assert not sealing.exists()
+    assert [entry["id"] for entry in log_store.load_log_entries()] == ["id-0", "id-1", "id-2"]
+
+
+def test_other_content_under_the_sealing_name_is_sealed(logs_dir):
+    log_store.append_entries([_entry(0)])
+    with FileLock(log_store.LOCK_FILE):
+        log_store.rotate_log(log_store.JSONL_LOG_FILE)
+    # Même taille que le dernier segment, mais pas la même première entrée : pas encore scellé
+    sealing = log_store._sealing_path(log_store.JSONL_LOG_FILE)
+    sealing.write_text(json.dumps(_entry(1)) + "\n", encoding="utf-8")
+    assert sealing.stat().st_size == log_store.read_manifest()["segments"][-1]["raw_size"]
+    assert not log_store._is_sealed(sealing)
+
+    log_store.append_entries([_entry(2)])
+    assert [segment["first_id"] for segment in log_store.read_manifest()["segments"]] == ["id-0", "id-1"]
+    assert [entry["id"] for entry in log_store.load_log_entries()] == ["id-0", "id-1", "id-2"]
+
+
+def test_torn_last_line_is_dropped_before_appending(logs_dir, capsys):
+    log_store.append_entries([_entry(0)])
+    # Processus tué en pleine écriture : dernière ligne sans son "\n"
+    with open(log_store.JSONL_LOG_FILE, "ab") as f:
+        f.write(json.dumps(_entry(1)).encode("utf-8")[:40])
+
+    log_store.append_entries([_entry(2)])
+    assert "octets d'une entrée incomplète retirés" in capsys.readouterr().out
+    assert [entry["id"] for entry in log_store.load_log_entries()] == ["id-0", "id-2"]
+
+
+def test_torn_only_line_leaves_an_empty_file(logs_dir):
+    log_store.JSONL_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    log_store.JSONL_LOG_FILE.write_bytes(b'{"id": "id-0", "timest')
+    log_store._truncate_torn_tail(log_store.JSONL_LOG_FILE)
+    assert log_store.JSONL_LOG_FILE.read_bytes() == b""
+
+    # Fichier complet : rien n'est retiré
+    log_store.append_entries([_entry(1)])
+    before = log_store.JSONL_LOG_FILE.read_bytes()
+    log_store._truncate_torn_tail(log_store.JSONL_LOG_FILE)
+    assert log_store.JSONL_LOG_FILE.read_bytes() == before
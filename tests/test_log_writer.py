@@ -0,0 +1,49 @@
+import signal
+import threading
+
+import pytest
+
+from src.utils import log_writer
+from src.utils.log_writer import BackgroundLogWriter
+
+
+def test_entries_written_in_batches_then_flushed():
+    written = []
+    writer = BackgroundLogWriter(flush_interval=0.05, batch_size=4, write_batch=written.extend).start()
+    for index in range(10):
+        writer.submit({"id": index})
+    assert writer.flush(timeout=5)
+    writer.close(timeout=5)
+    assert [entry["id"] for entry in written] == list(range(10))
+
+
+def test_signal_handler_does_not_deadlock_while_writer_lock_held(monkeypatch):
+    written = []
+    writer = BackgroundLogWriter(flush_interval=0.05, write_batch=written.extend).start()
+    writer.submit({"id": 1})
+    monkeypatch.setattr(log_writer, "_writer", writer)
+    handler = log_writer._make_handler(signal.SIG_IGN)
+
+    # Signal reçu pendant start() / close() : le verrou de l'écrivain est déjà pris
+    with writer._lock:
+        thread = threading.Thread(target=handler, args=(signal.SIGTERM, None), daemon=True)
+        thread.start()
+        thread.join(2)
+        assert not thread.is_alive()
+
+    writer.submit({"id": 2})  # après la demande d'arrêt : écrite directement
+    writer.close(timeout=5)
+    assert sorted(entry["id"] for entry in written) == [1, 2]
+
+
+def test_default_disposition_exits_and_leaves_flush_to_atexit(monkeypatch):
+    written = []
+    writer = BackgroundLogWriter(flush_interval=0.05, write_batch=written.extend).start()
+    monkeypatch.setattr(log_writer, "_writer", writer)
+    handler = log_writer._make_handler(signal.SIG_DFL)
+    writer.submit({"id": 1})
+    with pytest.raises(SystemExit) as exit_info:
+        handler(signal.SIGTERM, None)
+    assert exit_info.value.code == 128 + signal.SIGTERM
+    writer.close(timeout=5)  # ce que fait atexit
+    assert [entry["id"] for entry in written] == [1]
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.tools import pylint_tool
+from src.utils import config
+
+
+@pytest.fixture
+def no_history(monkeypatch):
+    """Historique de pylint ni lu ni écrit (il vit dans le dossier personnel)."""
+    monkeypatch.setattr(pylint_tool, "_previous_note", lambda module: None)
+    monkeypatch.setattr(pylint_tool, "_record_note", lambda module, note: None)
+
+
+def _report(path, module: str, previous: str = "") -> str:
+    rating = "Your code has been rated at 3.33/10" + previous
+    return (f"************* Module {module}\n"
+            f"{path}:1:0: C0103: Module name \"{path.stem}\" doesn't conform to snake_case naming style (invalid-name)\n"
+            f"{path}:3:0: W0611: Unused import os (unused-import)\n"
+            f"\n{'-' * len(rating)}\n{rating}\n\n")
+
+
+def test_cached_report_is_rebuilt_for_another_file(no_history, tmp_path):
+    first, second = tmp_path / "First.py", tmp_path / "sub" / "Other.py"
+    messages = [pylint_tool.PylintMessage(str(first), 1, 0, "invalid-name", "C0103", "convention",
+                                          f'Module name "{first.stem}" doesn\'t conform to snake_case naming style'),
+                pylint_tool.PylintMessage(str(first), 3, 0, "unused-import", "W0611", "warning", "Unused import os")]
+    report = _report(first, "First", " (previous run: 5.00/10, -1.67)")
+    entry = pylint_tool._to_cache_entry(report, first, "First", 10 / 3, messages)
+
+    # Aucune trace du premier fichier dans l'entrée, ni de l'historique
+    assert str(first) not in entry["output"] and "First" not in str(entry)
+    assert "previous run" not in entry["output"]
+
+    output, rebuilt = pylint_tool._from_cache_entry(entry, second, "sub.Other")
+    assert output == _report(second, "sub.Other")
+    assert [message.path for message in rebuilt] == [str(second)] * 2
+    assert rebuilt[0].message == 'Module name "Other" doesn\'t conform to snake_case naming style'
+    assert [(message.line, message.symbol) for message in rebuilt] == [(1, "invalid-name"), (3, "unused-import")]
+    assert pylint_tool._parse_score(output) == 3.33
+
+
+def test_report_without_score_is_not_cached(tmp_path):
+    path = tmp_path / "broken.py"
+    assert pylint_tool._to_cache_entry(f"{path}:1:0: E0001: syntax-error\n", path, "broken", 0.0) is None
+
+
+def test_in_process_failure_falls_back_once(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(config, "PYLINT_IN_PROCESS", True)
+    monkeypatch.setattr(pylint_tool, "_in_process_available", True)
+    monkeypatch.setattr(pylint_tool, "_fallback_reported", False)
+
+    def refused(path):
+        raise SystemExit(32)
+
+    monkeypatch.setattr(pylint_tool, "_run_in_process", refused)
+    monkeypatch.setattr(pylint_tool, "_run_subprocess", lambda path: ("report", []))
+    assert pylint_tool._lint(tmp_path / "a.py") == ("report", [])
+    assert pylint_tool._lint(tmp_path / "b.py") == ("report", [])
+    assert capsys.readouterr().out.count("repli sur la commande pylint") == 1
+
+    # Une erreur inattendue n'est plus masquée par le repli
+    def broken(path):
+        raise TypeError("bug")
+
+    monkeypatch.setattr(pylint_tool, "_run_in_process", broken)
+    with pytest.raises(TypeError):
+        pylint_tool._lint(tmp_path / "c.py")
+
+
+def test_cancelled_in_process_run_does_not_block_later_calls(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "PYLINT_IN_PROCESS", True)
+    monkeypatch.setattr(pylint_tool, "_in_process_available", True)
+    started, release = threading.Event(), threading.Event()
+
+    def stuck(path):
+        with pylint_tool._lint_lock:
+            started.set()
+            release.wait(10)
+            return "in process", []
+
+    monkeypatch.setattr(pylint_tool, "_run_in_process", stuck)
+    monkeypatch.setattr(pylint_tool, "_run_subprocess", lambda path: ("command", []))
+
+    async def cancel_then_lint():
+        task = asyncio.ensure_future(pylint_tool._lint_async(tmp_path / "a.py"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 10)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # L'analyse abandonnée garde _lint_lock : l'appel suivant n'attend pas derrière elle
+        try:
+            return pylint_tool._lint(tmp_path / "b.py")
+        finally:
+            release.set()
+
+    assert asyncio.run(cancel_then_lint()) == ("command", [])
+    for _ in range(100):
+        if not pylint_tool._abandoned_runs:
+            break
+        time.sleep(0.05)
+    assert pylint_tool._in_process_ready()
+    assert pylint_tool._lint(tmp_path / "c.py") == ("in process", [])
+
+
+def test_failing_evaluation_falls_back_to_per_file_runs(monkeypatch, capsys, tmp_path):
+    stats = {"fatal": 0, "error": 0, "warning": 1, "refactor": 0, "convention": 0, "statement": 4, "info": 0}
+    assert pylint_tool._file_report("mod", [], stats, "10.0 - warning")[1] == 9.0
+    with pytest.raises(pylint_tool._RatingError):
+        pylint_tool._file_report("mod", [], stats, "10.0 - inconnu")
+
+    # Une formule "evaluation" invalide ne fait plus échouer tout le lot
+    def bad_rating(files, jobs):
+        return pylint_tool._file_report("mod", [], stats, "1 / 0")
+
+    files = [tmp_path / "a.py", tmp_path / "b.py"]
+    for file in files:
+        file.write_text("x = 1\n")
+    monkeypatch.setattr(config, "PYLINT_IN_PROCESS", True)
+    monkeypatch.setattr(pylint_tool, "_in_process_available", True)
+    monkeypatch.setattr(pylint_tool, "_fallback_reported", False)
+    monkeypatch.setattr(pylint_tool, "_run_batch_in_process", bad_rating)
+    monkeypatch.setattr(pylint_tool, "run_pylint", lambda file: {"output": file, "score": None, "messages": []})
+    results = pylint_tool.run_pylint_batch(files, jobs=2)
+    assert sorted(results) == sorted(str(file) for file in files)
+    assert "repli sur la commande pylint" in capsys.readouterr().out
+
+
+def test_astroid_caches_still_have_the_expected_shape():
+    # _forget_user_modules trie ces caches internes d'astroid : ce test signale leur disparition
+    from astroid import MANAGER
+
+    assert isinstance(MANAGER.astroid_cache, dict)
+    assert isinstance(MANAGER._mod_file_cache, dict)
+
+
+def test_forget_user_modules_clears_everything_without_the_private_cache(monkeypatch):
+    import astroid
+
+    class Manager:
+        astroid_cache = {"installed": object()}
+        cleared = False
+
+        def clear_cache(self):
+            self.cleared = True
+
+    manager = Manager()
+    monkeypatch.setattr(astroid, "MANAGER", manager)
+    pylint_tool._forget_user_modules()
+    assert manager.cleared
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from src.tools import governor, pytest_tool
+from src.utils import config
+
+
+@pytest.fixture
+def tools(monkeypatch):
+    """Gouverneur et pool du processus neufs, sans cache de résultats."""
+    monkeypatch.setattr(config, "PYTEST_CACHE", False)
+    monkeypatch.setattr(governor, "_governor", None)
+    monkeypatch.setattr(pytest_tool, "_pool", None)
+    yield
+    if pytest_tool._pool is not None:
+        pytest_tool._pool.close()
+
+
+def _write_test(directory, index: int, passing: bool = True):
+    path = directory / f"test_case_{index}.py"
+    path.write_text(f"def test_value():\n    assert {index} == {index if passing else -1}\n", encoding="utf-8")
+    return path
+
+
+def test_pool_grows_up_to_one_worker_per_test_slot(tools, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "GOVERNOR_ENABLED", True)
+    monkeypatch.setattr(config, "GOVERNOR_TEST_SLOTS", 3)
+    monkeypatch.setattr(config, "PYTEST_WARM_POOL", True)
+    monkeypatch.setattr(config, "PYTEST_POOL_SIZE", 1)
+    monkeypatch.setattr(governor, "available_memory_mb", lambda: None)
+    pool = pytest_tool.warm_pytest_pool()
+    # Un seul modèle démarré d'avance, jusqu'à trois à la demande
+    assert len(pool._workers) == 1 and pool.limit == governor.get_governor().limit("test") == 3
+
+    # Trois exécutions simultanées : chacune a sa place et son modèle, aucune n'attend
+    paths = [_write_test(tmp_path, index) for index in range(3)]
+    results = [None] * 3
+
+    def run(index):
+        results[index] = pytest_tool.run_pytest(str(paths[index]))
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    assert all(result["passed"] for result in results)
+    assert governor.governor_stats()["test"]["waited"] == 0
+    assert len(pool._workers) == 3
+
+
+JUNIT_REPORT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="4">
+<testcase classname="pkg.test_sample" file="pkg/test_sample.py" line="3" name="test_ok" time="0.010" />
+<testcase classname="pkg.test_sample.TestGroup" file="pkg/test_sample.py" line="8" name="test_bad[1]" time="1.500">
+<failure message="assert 1 == 2">pkg/test_sample.py:12: in helper
+    check()
+pkg/test_sample.py:10: AssertionError</failure></testcase>
+<testcase classname="pkg.test_sample" file="pkg/test_sample.py" line="14" name="test_skip" time="0">
+<skipped message="not today" /></testcase>
+<testcase classname="" name="pkg.test_broken" time="0.001">
+<error message="collection failure">pkg/test_broken.py:1: in &lt;module&gt;
+    import missing
+E   ModuleNotFoundError: No module named 'missing'</error></testcase>
+</testsuite></testsuites>
+"""
+
+
+def test_junit_report_is_read_per_test(tmp_path):
+    report = tmp_path / "report.xml"
+    report.write_text(JUNIT_REPORT, encoding="utf-8")
+    tests = pytest_tool._read_junit(str(report))
+
+    assert [(test.nodeid, test.outcome) for test in tests] == [
+        ("pkg/test_sample.py::test_ok", "passed"),
+        ("pkg/test_sample.py::TestGroup::test_bad[1]", "failed"),
+        ("pkg/test_sample.py::test_skip", "skipped"),
+        ("pkg.test_broken", "error"),
+    ]
+    assert tests[1].duration == 1.5 and tests[1].message == "assert 1 == 2"
+    assert tests[1].location == "pkg/test_sample.py:10"
+    assert tests[3].message == "collection failure: ModuleNotFoundError: No module named 'missing'"
+    assert pytest_tool.failed_tests(tests) == [tests[1], tests[3]]
+    assert pytest_tool.slowest_tests(tests, 1) == [tests[1]]
+
+
+def test_missing_or_truncated_junit_report_gives_no_tests(tmp_path):
+    report = tmp_path / "report.xml"
+    assert pytest_tool._read_junit(str(report)) == []
+    report.write_text(JUNIT_REPORT[:200], encoding="utf-8")
+    assert pytest_tool._read_junit(str(report)) == []
+
+
+def test_subprocess_run_does_not_wait_for_leftover_processes(tools, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PYTEST_WARM_POOL", False)
+    path = tmp_path / "test_leftover.py"
+    # Lancé à la sortie de pytest (capture terminée) : le processus hérite des tubes et survit à pytest
+    path.write_text("import atexit, subprocess\n\ndef test_spawn():\n"
+                    "    atexit.register(subprocess.Popen, ['sleep', '60'])\n", encoding="utf-8")
+    start = time.monotonic()
+    result = pytest_tool.run_pytest(str(path), timeout=30)
+    assert result["passed"] and not result["timed_out"]
+    assert [test.nodeid for test in result["tests"]] == ["test_leftover.py::test_spawn"]
+    assert time.monotonic() - start < 20
+
+
+def test_bounded_output_keeps_head_and_tail():
+    output = pytest_tool._BoundedOutput(40)
+    for index in range(100):
+        output.write(f"{index:03d}\n")
+    value = output.getvalue()
+    assert value.startswith("000\n001\n") and value.endswith("098\n099\n")
+    assert output.dropped == 400 - 40
+    assert f"[... {output.dropped} caractères omis ...]" in value
+
+
+@pytest.mark.parametrize("warm", [True, False])
+def test_max_failures_stops_early_with_bounded_output(tools, tmp_path, monkeypatch, warm):
+    monkeypatch.setattr(config, "PYTEST_WARM_POOL", warm)
+    path = tmp_path / "test_many.py"
+    path.write_text("".join(f"def test_{index}():\n    assert {index} == -1, 'x' * 2000\n\n" for index in range(20)),
+                    encoding="utf-8")
+    result = pytest_tool.run_pytest(str(path), max_failures=2, output_limit=1000)
+    assert not result["passed"] and not result["timed_out"]
+    assert [test.nodeid for test in result["tests"]] == ["test_many.py::test_0", "test_many.py::test_1"]
+    # Deux flux bornés à 1000 caractères chacun, plus la marque du milieu omis
+    assert len(result["output"]) < 2 * 1000 + 100
+    assert "caractères omis" in result["output"] and "stopping after 2 failures" in result["output"]